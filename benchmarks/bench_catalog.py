@@ -0,0 +1,85 @@
+"""Startup cost of the datapoint catalog, parsed vs precompiled.
+
+Run from the repository root with ``python -m benchmarks.bench_catalog``.
+
+A synthetic vito.xml the size of vcontrold's own (some 60 device types and
+a few thousand commands, most restricted to some devices) is written to a
+temporary directory. "parse" removes the precompiled file before every load,
+"cached" hashes the files and reads the precompiled index of one device.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import tempfile
+import timeit
+
+from custom_components.viessmann.catalog import UNITS_FILE, load_catalog
+
+DEVICES = 60
+COMMANDS = 3000
+# Every command exists on this many devices.
+DEVICES_PER_COMMAND = 8
+ROUNDS = 5
+
+
+def write_catalog(directory: Path) -> Path:
+    """Write the synthetic vito.xml and vcontrold.xml, returning vito.xml."""
+    devices = [f"{0x2000 + i:04X}" for i in range(DEVICES)]
+    lines = ['<?xml version="1.0"?>', "<vito>", "<devices>"]
+    lines += [f'<device ID="{d}" name="Device{d}" protocol="P300"/>' for d in devices]
+    lines += ["</devices>", "<commands>"]
+    for i in range(COMMANDS):
+        unit = "BA" if i % 10 == 0 else "UT"
+        lines.append(f'<command name="getValue{i}" protocmd="getaddr">')
+        lines.append(f"<description>Value {i} of the heater</description>")
+        for j in range(DEVICES_PER_COMMAND):
+            device = devices[(i + j * 7) % DEVICES]
+            lines.append(
+                f'<device ID="{device}"><addr>{i:04X}</addr><len>2</len>'
+                f"<unit>{unit}</unit><error>05 05</error></device>"
+            )
+        lines.append("</command>")
+    lines += ["</commands>", "</vito>"]
+    path = directory / "vito.xml"
+    path.write_text("\n".join(lines))
+    (directory / UNITS_FILE).write_text(
+        '<?xml version="1.0"?><vcontrold><units>'
+        '<unit name="Temperatur"><abbrev>UT</abbrev><calculation>V/10</calculation>'
+        "<type>short</type><entity>Grad Celsius</entity></unit>"
+        '<unit name="BetriebsArt"><abbrev>BA</abbrev><type>enum</type>'
+        + "".join(f'<enum bytes="{i:02X}" text="Mode{i}"/>' for i in range(8))
+        + "</unit></units></vcontrold>"
+    )
+    return path
+
+
+def main() -> None:
+    """Run the benchmark and print a short report."""
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        path = write_catalog(directory)
+        cache_dir = directory / "cache"
+        catalog = load_catalog(path, "2000", cache_dir)
+        (cache_file,) = cache_dir.iterdir()
+        print(
+            f"vito.xml {path.stat().st_size / 1024:.0f} KiB, {DEVICES} devices, "
+            f"{COMMANDS} commands; {len(catalog.commands)} of device 2000, "
+            f"precompiled {cache_file.stat().st_size / 1024:.1f} KiB"
+        )
+
+        def parse() -> None:
+            for cached in cache_dir.iterdir():
+                cached.unlink()
+            load_catalog(path, "2000", cache_dir)
+
+        def cached() -> None:
+            load_catalog(path, "2000", cache_dir)
+
+        for name, run in (("parse", parse), ("cached", cached)):
+            run()
+            seconds = min(timeit.repeat(run, number=ROUNDS, repeat=3)) / ROUNDS
+            print(f"{name:>6}: {seconds * 1e3:8.2f} ms per startup")
+
+
+if __name__ == "__main__":
+    main()
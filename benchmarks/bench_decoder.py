@@ -0,0 +1,106 @@
+"""Decode throughput per datapoint type, per-message lambdas vs compiled decoders.
+
+Run from the repository root with ``python -m benchmarks.bench_decoder``.
+
+"before" replays the per-entity code of the platforms prior to the decoder
+compiler, including the UTF-8 decoding the MQTT client did for every
+subscription. "after" is the compiled payload decoder followed by the
+compiled state converter of the same description.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+import re
+import timeit
+
+from custom_components.viessmann.const import (
+    BINARY_SENSORS,
+    DATETIMES,
+    ENTITY_DESCRIPTIONS,
+    NUMBERS,
+    SELECTS,
+    SENSORS,
+)
+from custom_components.viessmann.decoder import (
+    compile_payload_decoders,
+    compile_state_converter,
+)
+
+ROUNDS = 100_000
+
+
+def _by_key(table, key):
+    return next(d for d in table if d.key == key)
+
+
+def before_sensor(description):
+    def decode(payload: bytes):
+        value = description.value_fn(payload.decode("utf-8"))
+        if description.valueMap is not None:
+            value = description.valueMap.get(value)
+        return value
+
+    return decode
+
+
+def before_binary(description):
+    return lambda payload: bool(float(payload.decode("utf-8")))
+
+
+def before_number(description):
+    return lambda payload: description.value_fn(float(payload.decode("utf-8")))
+
+
+def before_select(description):
+    def decode(payload: bytes):
+        value = payload.decode("utf-8")
+        if description.value_fn:
+            value = description.value_fn(value)
+        return description.valueMapCurrentValue.get(value)
+
+    return decode
+
+
+def before_datetime(description):
+    pattern = r"^\d{4,4}-\d\d-\d\dT\d\d:\d\d:\d\d\+\d{4,4}$"
+
+    def decode(payload: bytes):
+        value = payload.decode("utf-8")
+        return datetime.fromisoformat(value) if re.match(pattern, value) else None
+
+    return decode
+
+
+CASES = [
+    ("sensor", _by_key(SENSORS, "getTempA"), b"12.3", before_sensor),
+    ("binary_sensor", _by_key(BINARY_SENSORS, "getPumpeStatusM1"), b"1", before_binary),
+    ("number", _by_key(NUMBERS, "getTempRaumNorSollM1"), b"21.0", before_number),
+    ("select numeric", _by_key(SELECTS, "getBetriebProg"), b"2", before_select),
+    ("select text", _by_key(SELECTS, "getBetriebArtM1"), b"H+WW", before_select),
+    ("datetime", DATETIMES[0], b"2024-01-01T10:00:00+0100", before_datetime),
+]
+
+
+def main() -> None:
+    """Run the benchmark and print a short report."""
+    decoders = compile_payload_decoders(ENTITY_DESCRIPTIONS)
+    for name, description, payload, before in CASES:
+        decode_before = before(description)
+        decode = decoders[description.mqttTopicCurrentValue or description.key]
+        convert = compile_state_converter(description)
+        assert decode_before(payload) == convert(decode(payload)), name
+
+        t_before = min(
+            timeit.repeat(lambda: decode_before(payload), number=ROUNDS, repeat=5)
+        )
+        t_after = min(
+            timeit.repeat(lambda: convert(decode(payload)), number=ROUNDS, repeat=5)
+        )
+        print(
+            f"{name:>15}: before {ROUNDS / t_before / 1e6:5.2f} M msg/s, "
+            f"after {ROUNDS / t_after / 1e6:5.2f} M msg/s ({t_before / t_after:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Compare per-entity MQTT subscriptions with the wildcard dispatcher.
+
+Run from the repository root with ``python -m benchmarks.bench_dispatcher``.
+
+The subscription bookkeeping and message routing of Home Assistant's MQTT
+client are modelled with its own ``Subscription``, matcher and
+``ReceiveMessage`` types, so both variants pay the same per-subscription cost
+the real client does. The broker round trip is not part of the measurement;
+the number of SUBSCRIBE topics shows what the broker has to match against.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from functools import lru_cache
+import timeit
+
+from homeassistant.components.mqtt.client import (
+    Subscription,
+    _is_simple_match,
+    _matcher_for_topic,
+)
+from homeassistant.components.mqtt.models import ReceiveMessage
+from homeassistant.core import HassJob
+from homeassistant.util import dt as dt_util
+
+from custom_components.viessmann.const import (
+    BINARY_SENSORS,
+    DATETIMES,
+    NUMBERS,
+    SELECTS,
+    SENSORS,
+)
+from custom_components.viessmann.dispatcher import ViessmannDispatcher
+
+ROOT = "vcontrold"
+ROUNDS = 200
+
+
+class ClientModel:
+    """Subscription tracking and routing as done by the HA MQTT client."""
+
+    def __init__(self) -> None:
+        """Initialize an empty client."""
+        self.simple: dict[str, list[Subscription]] = {}
+        self.wildcard: list[Subscription] = []
+        self.broker_topics: set[str] = set()
+        self.matching = lru_cache(None)(self._matching)
+
+    def subscribe(
+        self, topic: str, msg_callback: Callable, encoding: str | None = "utf-8"
+    ) -> None:
+        """Track a subscription like MQTT.async_subscribe."""
+        subscription = Subscription(
+            topic, _matcher_for_topic(topic), HassJob(msg_callback), 1, encoding
+        )
+        if _is_simple_match(topic):
+            self.simple.setdefault(topic, []).append(subscription)
+        else:
+            self.wildcard.append(subscription)
+        self.matching.cache_clear()
+        self.broker_topics.add(topic)
+
+    def _matching(self, topic: str) -> list[Subscription]:
+        subscriptions = list(self.simple.get(topic, ()))
+        subscriptions.extend(sub for sub in self.wildcard if sub.matcher(topic))
+        return subscriptions
+
+    def handle(self, topic: str, payload: bytes, timestamp) -> None:
+        """Route one incoming message like MQTT._mqtt_handle_message."""
+        for subscription in self.matching(topic):
+            subscription.job.target(
+                ReceiveMessage(
+                    topic,
+                    payload.decode(subscription.encoding)
+                    if subscription.encoding
+                    else payload,
+                    1,
+                    False,
+                    subscription.topic,
+                    timestamp,
+                )
+            )
+
+
+def entity_topics() -> list[str]:
+    """Return the state topic of every entity, one entry per entity."""
+    topics = [f"{ROOT}/{d.key}" for d in (*SENSORS, *BINARY_SENSORS, *DATETIMES)]
+    topics += [f"{ROOT}/{d.mqttTopicCurrentValue}" for d in (*NUMBERS, *SELECTS)]
+    return topics
+
+
+def setup_before(topics: list[str]) -> ClientModel:
+    """One MQTT subscription per entity."""
+    client = ClientModel()
+    for topic in topics:
+        client.subscribe(topic, lambda msg: None)
+    return client
+
+
+def setup_after(topics: list[str]) -> ClientModel:
+    """One wildcard subscription, entities registered at the dispatcher."""
+    client = ClientModel()
+    dispatcher = ViessmannDispatcher(None)
+    client.subscribe(f"{ROOT}/#", dispatcher.async_message_received)
+    for topic in topics:
+        dispatcher.async_register(topic, lambda msg: None)
+    return client
+
+
+def main() -> None:
+    """Run the benchmark and print a short report."""
+    topics = entity_topics()
+    cycle = [(topic, b"21.5") for topic in dict.fromkeys(topics)]
+    timestamp = dt_util.utcnow()
+
+    print(f"{len(topics)} entities, {len(cycle)} distinct topics per poll cycle")
+    for name, setup in (("per-entity", setup_before), ("dispatcher", setup_after)):
+        setup_time = min(timeit.repeat(lambda: setup(topics), number=20, repeat=5)) / 20
+        client = setup(topics)
+
+        def run_cycle(client=client) -> None:
+            for topic, payload in cycle:
+                client.handle(topic, payload, timestamp)
+
+        run_cycle()
+        cycle_time = min(timeit.repeat(run_cycle, number=ROUNDS, repeat=5)) / ROUNDS
+        print(
+            f"{name:>10}: {len(client.broker_topics):3d} SUBSCRIBE topics, "
+            f"subscribe {setup_time * 1e6:8.1f} us, "
+            f"routing {cycle_time / len(cycle) * 1e6:6.2f} us/message"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Per-message cost and memory per root with many vcontrold roots.
+
+Run from the repository root with ``python -m benchmarks.bench_scaling``.
+
+Every root gets a coordinator with one listener per entity on the shared
+dispatcher and decoder cache. All roots then publish a full poll cycle,
+interleaved as if the bridges published at once. Routing, decoding and the
+value store update are measured; entity state writes are left out.
+"""
+from __future__ import annotations
+
+import timeit
+import tracemalloc
+
+from homeassistant.components.mqtt.models import ReceiveMessage
+from homeassistant.util import dt as dt_util
+
+from custom_components.viessmann.const import ENTITY_DESCRIPTIONS
+from custom_components.viessmann.coordinator import ViessmannCoordinator
+from custom_components.viessmann.dispatcher import ViessmannDispatcher
+from custom_components.viessmann.topics import state_key
+
+PAYLOADS = {
+    "getBetriebArtM1": b"H+WW",
+    "getUmschaltventil": b"Heizen",
+    "getSystemTime": b"2024-01-01T10:00:00+0100",
+}
+
+
+def setup(roots: int) -> tuple[ViessmannDispatcher, list[ViessmannCoordinator]]:
+    """Create the shared dispatcher and one coordinator per root."""
+    dispatcher = ViessmannDispatcher(None)
+    coordinators = []
+    for index in range(roots):
+        coordinator = ViessmannCoordinator(None, f"site{index}/vcontrold", dispatcher)
+        for description in ENTITY_DESCRIPTIONS:
+            coordinator.async_add_listener(
+                coordinator.topics.state_topic(description), lambda datapoint: None
+            )
+        coordinators.append(coordinator)
+    return dispatcher, coordinators
+
+
+def messages(coordinators: list[ViessmannCoordinator]) -> list[ReceiveMessage]:
+    """Return one poll cycle of all roots, interleaved by datapoint."""
+    timestamp = dt_util.utcnow()
+    keys = dict.fromkeys(state_key(d) for d in ENTITY_DESCRIPTIONS)
+    return [
+        ReceiveMessage(
+            f"{coordinator.mqtt_root}/{key}",
+            PAYLOADS.get(key, b"21.5"),
+            1,
+            False,
+            f"{coordinator.mqtt_root}/#",
+            timestamp,
+        )
+        for key in keys
+        for coordinator in coordinators
+    ]
+
+
+def main() -> None:
+    """Run the benchmark and print a short report."""
+    for roots in (1, 10, 50, 100):
+        tracemalloc.start()
+        dispatcher, coordinators = setup(roots)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        cycle = messages(coordinators)
+        route = dispatcher.async_message_received
+
+        def run_cycle() -> None:
+            for message in cycle:
+                route(message)
+
+        run_cycle()
+        seconds = min(timeit.repeat(run_cycle, number=10, repeat=5)) / 10
+        print(
+            f"{roots:3d} roots: {len(cycle):5d} messages/cycle, "
+            f"{seconds / len(cycle) * 1e6:5.2f} us/message, "
+            f"{size / roots / 1024:6.1f} KiB/root"
+        )
+
+
+if __name__ == "__main__":
+    main()
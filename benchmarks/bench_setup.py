@@ -0,0 +1,76 @@
+"""Setup time and memory per config entry, deep-copied vs shared descriptions.
+
+Run from the repository root with ``python -m benchmarks.bench_setup``.
+
+"before" deep-copies every description table and writes the entry's topics
+into the copies, as the platforms did. "after" builds the per-entry topic
+index over the frozen, shared descriptions. Entity objects are the same in
+both variants and are left out.
+"""
+from __future__ import annotations
+
+import copy
+import timeit
+import tracemalloc
+
+from custom_components.viessmann.const import (
+    BINARY_SENSORS,
+    DATETIMES,
+    NUMBERS,
+    SELECTS,
+    SENSORS,
+)
+from custom_components.viessmann.topics import ViessmannTopics
+
+
+def setup_before(mqtt_root: str) -> list:
+    """Deep-copy all tables and resolve the topics into the copies."""
+    descriptions = []
+    for table in (SENSORS, BINARY_SENSORS, DATETIMES):
+        for description in copy.deepcopy(table):
+            # The tables used to be mutable; bypass the frozen dataclass.
+            object.__setattr__(
+                description, "mqttTopicCurrentValue", f"{mqtt_root}/{description.key}"
+            )
+            descriptions.append(description)
+    for table in (NUMBERS, SELECTS):
+        for description in copy.deepcopy(table):
+            for field in ("mqttTopicCommand", "mqttTopicCurrentValue"):
+                topic = f"{mqtt_root}/{getattr(description, field)}"
+                object.__setattr__(description, field, topic)
+            descriptions.append(description)
+    return descriptions
+
+
+def setup_after(mqtt_root: str) -> ViessmannTopics:
+    """Build the topic index of one entry."""
+    return ViessmannTopics(mqtt_root)
+
+
+def measure(setup, entries: int) -> tuple[float, int]:
+    """Return seconds and bytes retained to set up a number of entries."""
+    roots = [f"vcontrold{i}" for i in range(entries)]
+    seconds = min(
+        timeit.repeat(lambda: [setup(root) for root in roots], number=3, repeat=3)
+    ) / 3
+    tracemalloc.start()
+    retained = [setup(root) for root in roots]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del retained
+    return seconds, size
+
+
+def main() -> None:
+    """Run the benchmark and print a short report."""
+    for entries in (1, 10, 100):
+        for name, setup in (("deepcopy", setup_before), ("shared", setup_after)):
+            seconds, size = measure(setup, entries)
+            print(
+                f"{entries:3d} entries {name:>8}: {seconds * 1e3:8.2f} ms, "
+                f"{size / 1024:8.1f} KiB ({size / entries / 1024:6.1f} KiB/entry)"
+            )
+
+
+if __name__ == "__main__":
+    main()
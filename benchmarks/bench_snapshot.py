@@ -0,0 +1,94 @@
+"""Compare one message per datapoint with one JSON snapshot per poll cycle.
+
+Run from the repository root with ``python -m benchmarks.bench_snapshot``.
+
+Both variants go through the client model of ``bench_dispatcher`` and the
+real coordinator, with one no-op listener per entity. A cycle in which every
+value changed is the worst case for the snapshot; in a typical cycle only a
+few values change and the snapshot skips the rest.
+"""
+from __future__ import annotations
+
+import json
+import timeit
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.viessmann.const import SNAPSHOT_TOPIC
+from custom_components.viessmann.coordinator import ViessmannCoordinator
+from custom_components.viessmann.dispatcher import ViessmannDispatcher
+
+from .bench_dispatcher import ROOT, ROUNDS, ClientModel, entity_topics
+
+# Share of the values changing in a typical poll cycle.
+TYPICAL_CHANGED = 0.1
+
+
+def setup(topics: list[str]) -> ClientModel:
+    """Wildcard subscription feeding a coordinator with a listener per entity."""
+    client = ClientModel()
+    dispatcher = ViessmannDispatcher(None)
+    client.subscribe(f"{ROOT}/#", dispatcher.async_message_received, None)
+    coordinator = ViessmannCoordinator(None, ROOT, dispatcher)
+    coordinator.message_stats.track(SNAPSHOT_TOPIC)
+    coordinator._unsub_snapshot = dispatcher.async_register(  # noqa: SLF001
+        f"{ROOT}/{SNAPSHOT_TOPIC}",
+        coordinator._async_snapshot_received,  # noqa: SLF001
+    )
+    for topic in topics:
+        coordinator.async_add_listener(topic, lambda datapoint: None)
+    return client
+
+
+def cycles(keys: list[str], changed: int) -> list[dict[str, float]]:
+    """Return two alternating poll cycles differing in changed values."""
+    first = {key: 20.0 for key in keys}
+    second = dict(first)
+    for key in keys[:changed]:
+        second[key] = 21.0
+    return [first, second]
+
+
+def main() -> None:
+    """Run the benchmark and print a short report."""
+    topics = entity_topics()
+    keys = [topic.removeprefix(f"{ROOT}/") for topic in dict.fromkeys(topics)]
+    timestamp = dt_util.utcnow()
+    print(f"{len(topics)} entities, {len(keys)} datapoints per poll cycle")
+
+    for label, changed in (
+        ("all changed", len(keys)),
+        ("typical", max(1, int(len(keys) * TYPICAL_CHANGED))),
+    ):
+        values = cycles(keys, changed)
+        per_topic = [
+            [(f"{ROOT}/{key}", str(value).encode()) for key, value in cycle.items()]
+            for cycle in values
+        ]
+        snapshots = [json.dumps(cycle).encode() for cycle in values]
+        client = setup(topics)
+
+        def run_per_topic(client=client, per_topic=per_topic) -> None:
+            for cycle in per_topic:
+                for topic, payload in cycle:
+                    client.handle(topic, payload, timestamp)
+
+        def run_snapshot(client=client, snapshots=snapshots) -> None:
+            for payload in snapshots:
+                client.handle(f"{ROOT}/{SNAPSHOT_TOPIC}", payload, timestamp)
+
+        results = []
+        for run in (run_per_topic, run_snapshot):
+            run()
+            results.append(
+                min(timeit.repeat(run, number=ROUNDS, repeat=5)) / ROUNDS / 2
+            )
+        print(
+            f"{label:>11} ({changed:2d} changed): "
+            f"per-topic {results[0] * 1e6:7.1f} us/cycle in {len(keys)} messages, "
+            f"snapshot {results[1] * 1e6:7.1f} us/cycle in 1 message"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,194 @@
 """The Viessmann integration."""
 from __future__ import annotations
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+import logging
+
 from homeassistant.components import mqtt
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_PORT,
+    CONF_USERNAME,
+    Platform,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryError, ConfigEntryNotReady
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.util import slugify
+
+from .burner import ViessmannBurnerCycles
+from .cache import ViessmannValueCache
+from .catalog import CatalogError, async_load_catalog, catalog_descriptions
+from .const import (
+    CONF_CACHE_MAX_AGE,
+    CONF_CATALOG,
+    CONF_COMMAND_DEBOUNCE,
+    CONF_COMMAND_RETRIES,
+    CONF_COMMAND_TIMEOUT,
+    CONF_CURVE_HALF_LIFE,
+    CONF_DEVICE_ID,
+    CONF_DISCOVERY,
+    CONF_DISCOVERY_WINDOW,
+    CONF_EXPIRE_FACTOR,
+    CONF_LONG_TERM,
+    CONF_POLL_BUDGET,
+    CONF_POLL_TOPIC,
+    CONF_ROLLING_WINDOW,
+    CONF_STATUS_TOPIC,
+    CONF_TIMESERIES,
+    DEFAULT_CACHE_MAX_AGE,
+    DEFAULT_COMMAND_DEBOUNCE,
+    DEFAULT_COMMAND_RETRIES,
+    DEFAULT_COMMAND_TIMEOUT,
+    DEFAULT_CURVE_HALF_LIFE,
+    DEFAULT_DISCOVERY,
+    DEFAULT_DISCOVERY_WINDOW,
+    DEFAULT_EXPIRE_FACTOR,
+    DEFAULT_LONG_TERM,
+    DEFAULT_POLL_BUDGET,
+    DEFAULT_POLL_TOPIC,
+    DEFAULT_ROLLING_WINDOW,
+    DEFAULT_STATUS_TOPIC,
+    DEFAULT_TIMESERIES,
+    DEFAULT_VCONTROLD_PORT,
+    DOMAIN,
+    MQTT_ROOT_TOPIC,
+    PLATFORMS,
+)
+from .coordinator import ViessmannCoordinator
+from .dispatcher import async_get_dispatcher
+from .heating_curve import ViessmannHeatingCurve
+from .timeseries import remove_timeseries, timeseries_directory
+from .transport import VcontroldError, ViessmannTransport
+from .websocket import async_setup_websocket
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate an entry created by an older version of the config flow."""
+    if entry.version == 1:
+        # The first flow gave every entry the unique id "vcontrold", whatever
+        # its root. The unique id is the root now, so migrate the ids of the
+        # device and the entities derived from it as well.
+        mqtt_root = entry.data[MQTT_ROOT_TOPIC].strip().rstrip("/")
+        if entry.unique_id is not None and entry.unique_id != mqtt_root:
+            await _async_migrate_unique_ids(hass, entry, entry.unique_id, mqtt_root)
+        data = {**entry.data, MQTT_ROOT_TOPIC: mqtt_root}
+        if CONF_USERNAME in data:
+            # The placeholder host and credentials the first flow asked for
+            # would now set up a vcontrold transport to that host.
+            for key in (CONF_HOST, CONF_USERNAME, CONF_PASSWORD):
+                data.pop(key, None)
+        hass.config_entries.async_update_entry(
+            entry,
+            data=data,
+            unique_id=mqtt_root,
+            version=2,
+        )
+        _LOGGER.debug("Migrated entry %s to version 2", entry.title)
+    return True
+
+
+async def _async_migrate_unique_ids(
+    hass: HomeAssistant, entry: ConfigEntry, old_id: str, new_id: str
+) -> None:
+    """Move the device and entity unique ids from old_id to new_id."""
+    device_registry = dr.async_get(hass)
+    if device := device_registry.async_get_device(identifiers={(DOMAIN, old_id)}):
+        device_registry.async_update_device(
+            device.id, new_identifiers={(DOMAIN, new_id)}
+        )
+    old_prefix = f"{slugify(old_id)}_"
+    new_prefix = f"{slugify(new_id)}_"
 
-from .const import DOMAIN, PLATFORMS
+    @callback
+    def _async_migrate_entity(entity: er.RegistryEntry) -> dict[str, str] | None:
+        """Return the new unique id of an entity."""
+        if not entity.unique_id.startswith(old_prefix):
+            return None
+        return {"new_unique_id": new_prefix + entity.unique_id[len(old_prefix) :]}
+
+    await er.async_migrate_entries(hass, entry.entry_id, _async_migrate_entity)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Viessmann from a config entry."""
 
     hass.data.setdefault(DOMAIN, {})
-    # TODO 1. Create API instance
-    # TODO 2. Validate the API connection (and authentication)
-    # TODO 3. Store an API object for your platforms to access
-    # hass.data[DOMAIN][entry.entry_id] = MyApi(...)
-    
+
+    transport = None
+    if (host := entry.data.get(CONF_HOST)) is not None:
+        transport = ViessmannTransport(
+            host, entry.data.get(CONF_PORT, DEFAULT_VCONTROLD_PORT)
+        )
+
     # Make sure MQTT is available and the entry is loaded
 
-    if not hass.config_entries.async_entries(mqtt.DOMAIN):
+    elif not hass.config_entries.async_entries(mqtt.DOMAIN):
         _LOGGER.error("MQTT integration is not available 1 {}".format(mqtt.DOMAIN))
         return False
 
+    extra_descriptions = ()
+    if catalog_path := entry.options.get(CONF_CATALOG):
+        try:
+            catalog = await async_load_catalog(
+                hass, catalog_path, entry.options.get(CONF_DEVICE_ID) or None
+            )
+        except CatalogError as err:
+            raise ConfigEntryError(str(err)) from err
+        extra_descriptions = catalog_descriptions(catalog)
+
+    # One wildcard subscription and value store per vcontrold root, all
+    # roots share the dispatcher.
+    coordinator = ViessmannCoordinator(
+        hass,
+        entry.data[MQTT_ROOT_TOPIC],
+        async_get_dispatcher(hass),
+        command_debounce=entry.options.get(
+            CONF_COMMAND_DEBOUNCE, DEFAULT_COMMAND_DEBOUNCE
+        ),
+        command_timeout=entry.options.get(
+            CONF_COMMAND_TIMEOUT, DEFAULT_COMMAND_TIMEOUT
+        ),
+        command_retries=entry.options.get(
+            CONF_COMMAND_RETRIES, DEFAULT_COMMAND_RETRIES
+        ),
+        transport=transport,
+        poll_topic=entry.options.get(CONF_POLL_TOPIC, DEFAULT_POLL_TOPIC),
+        poll_budget=entry.options.get(CONF_POLL_BUDGET, DEFAULT_POLL_BUDGET),
+        cache=ViessmannValueCache(hass, entry.entry_id),
+        cache_max_age=entry.options.get(CONF_CACHE_MAX_AGE, DEFAULT_CACHE_MAX_AGE),
+        discovery_window=entry.options.get(
+            CONF_DISCOVERY_WINDOW, DEFAULT_DISCOVERY_WINDOW
+        )
+        if entry.options.get(CONF_DISCOVERY, DEFAULT_DISCOVERY)
+        else None,
+        extra_descriptions=extra_descriptions,
+        status_topic=entry.options.get(CONF_STATUS_TOPIC, DEFAULT_STATUS_TOPIC),
+        expire_factor=entry.options.get(CONF_EXPIRE_FACTOR, DEFAULT_EXPIRE_FACTOR),
+        rolling_window=entry.options.get(
+            CONF_ROLLING_WINDOW, DEFAULT_ROLLING_WINDOW
+        ),
+        long_term=entry.options.get(CONF_LONG_TERM, DEFAULT_LONG_TERM),
+        burner=ViessmannBurnerCycles(hass, entry.entry_id),
+        heating_curve=ViessmannHeatingCurve(
+            hass,
+            entry.entry_id,
+            entry.options.get(CONF_CURVE_HALF_LIFE, DEFAULT_CURVE_HALF_LIFE) * 86400,
+        ),
+        timeseries=entry.options.get(CONF_TIMESERIES, DEFAULT_TIMESERIES),
+    )
+    try:
+        await coordinator.async_setup()
+    except VcontroldError as err:
+        raise ConfigEntryNotReady(str(err)) from err
+    hass.data[DOMAIN][entry.entry_id] = coordinator
+    async_setup_websocket(hass)
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
 
@@ -32,6 +196,22 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator.async_shutdown()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the stored data of a removed config entry."""
+    await ViessmannValueCache(hass, entry.entry_id).async_remove()
+    await ViessmannBurnerCycles(hass, entry.entry_id).async_remove()
+    await ViessmannHeatingCurve(hass, entry.entry_id, 0).async_remove()
+    await hass.async_add_executor_job(
+        remove_timeseries, timeseries_directory(hass, entry.data[MQTT_ROOT_TOPIC])
+    )
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry after its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
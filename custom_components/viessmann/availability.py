@@ -0,0 +1,174 @@
+"""Datapoint availability for the Viessmann integration."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+import logging
+import math
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+_LOGGER = logging.getLogger(__name__)
+
+# Resolution of the timer wheel; expired datapoints are noticed at most
+# this late.
+WHEEL_TICK = timedelta(seconds=10)
+
+# Bridge status payloads, compared in lower case.
+BRIDGE_ONLINE = {"online", "1", "true", "connected"}
+BRIDGE_OFFLINE = {"offline", "0", "false", "disconnected", "lost"}
+
+# Returns the seconds within which the next value of a datapoint is due.
+ExpectedInterval = Callable[[str], float]
+# Returns when a datapoint was last received.
+LastSeen = Callable[[str], datetime | None]
+
+
+class ViessmannAvailability:
+    """Decide which datapoints are available.
+
+    A datapoint is available while the bridge is online, Home Assistant is
+    connected to the broker and its last value is not older than the
+    expected interval. Deadlines sit in a timer wheel driven by one coarse
+    timer. Received values only update their timestamp in the coordinator;
+    when a slot comes up, a datapoint received since is moved to its next
+    slot and one that was not is marked unavailable. Losing the bridge or
+    the broker makes every datapoint unavailable in one pass. Datapoints are
+    only tracked once they have been received.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, expected: ExpectedInterval, last_seen: LastSeen
+    ) -> None:
+        """Initialize availability with the expected interval of datapoints."""
+        self.hass = hass
+        self.expected = expected
+        self.last_seen = last_seen
+        self.bridge_online = True
+        self.connected = True
+        self.unavailable: set[str] = set()
+        self._wheel: dict[int, list[str]] = {}
+        self._slot: int | None = None
+        self._listeners: dict[str, tuple[Callable[[], None], ...]] = {}
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    @property
+    def online(self) -> bool:
+        """Return True if values can arrive at all."""
+        return self.bridge_online and self.connected
+
+    def is_available(self, key: str) -> bool:
+        """Return True if a datapoint is available."""
+        return self.bridge_online and self.connected and key not in self.unavailable
+
+    @callback
+    def async_start(self) -> None:
+        """Start the shared timer."""
+        self._unsub_timer = async_track_time_interval(
+            self.hass, self._async_tick, WHEEL_TICK
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the shared timer and forget all datapoints."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._wheel.clear()
+        self._listeners.clear()
+
+    @callback
+    def async_add_listener(
+        self, key: str, availability_callback: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Call availability_callback when the availability of key changes."""
+        self._listeners[key] = self._listeners.get(key, ()) + (availability_callback,)
+
+        @callback
+        def async_remove() -> None:
+            """Remove the listener."""
+            self._listeners[key] = tuple(
+                cb
+                for cb in self._listeners.get(key, ())
+                if cb is not availability_callback
+            )
+
+        return async_remove
+
+    @callback
+    def async_track(self, key: str, timestamp: datetime) -> None:
+        """Start tracking a datapoint received at timestamp."""
+        self._insert(key, timestamp.timestamp())
+
+    @callback
+    def async_seen(self, key: str, timestamp: datetime) -> None:
+        """Make an unavailable datapoint available again."""
+        self.unavailable.discard(key)
+        self._insert(key, timestamp.timestamp())
+        self._async_notify((key,))
+
+    @callback
+    def async_set_bridge(self, online: bool) -> None:
+        """Record a birth or last will message of the bridge."""
+        if online != self.bridge_online:
+            _LOGGER.info("vcontrold bridge is %s", "online" if online else "offline")
+            self.bridge_online = online
+            self._async_notify(self._listeners)
+
+    @callback
+    def async_set_connected(self, connected: bool) -> None:
+        """Record the connection state of the MQTT client."""
+        if connected != self.connected:
+            self.connected = connected
+            self._async_notify(self._listeners)
+
+    def _insert(self, key: str, seen: float) -> None:
+        """Put a datapoint into the slot of its deadline."""
+        if (expected := self.expected(key)) <= 0:
+            return
+        slot = math.ceil((seen + expected) / WHEEL_TICK.total_seconds())
+        if self._slot is not None and slot <= self._slot:
+            slot = self._slot + 1
+        self._wheel.setdefault(slot, []).append(key)
+
+    @callback
+    def _async_tick(self, now: datetime) -> None:
+        """Expire the datapoints of all slots passed since the last tick."""
+        timestamp = now.timestamp()
+        slot = math.floor(timestamp / WHEEL_TICK.total_seconds())
+        if self._slot is None:
+            first = min(self._wheel, default=slot)
+        else:
+            first = self._slot + 1
+        self._slot = slot
+        if slot - first > len(self._wheel):
+            # After a long gap, visit the occupied slots only.
+            due = sorted(s for s in self._wheel if s <= slot)
+        else:
+            due = range(first, slot + 1)
+        last_seen = self.last_seen
+        expired = []
+        for due_slot in due:
+            for key in self._wheel.pop(due_slot, ()):
+                if key in self.unavailable:
+                    continue
+                if (seen := last_seen(key)) is None:
+                    continue
+                last = seen.timestamp()
+                if last + self.expected(key) > timestamp:
+                    self._insert(key, last)
+                else:
+                    self.unavailable.add(key)
+                    expired.append(key)
+        if expired:
+            _LOGGER.debug("No values within the expected interval: %s", expired)
+            self._async_notify(expired)
+
+    @callback
+    def _async_notify(self, keys: Iterable[str]) -> None:
+        """Call the listeners of keys, each once."""
+        listeners = self._listeners
+        for key in list(keys):
+            for availability_callback in listeners.get(key, ()):
+                availability_callback()
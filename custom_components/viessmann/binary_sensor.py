@@ -1,25 +1,24 @@
 """The Viessmannmqtt component for controlling the Viessmann wallbox via home assistant / MQTT"""
 from __future__ import annotations
 
-import copy
 import logging
 
-from homeassistant.components import mqtt
 from homeassistant.components.binary_sensor import DOMAIN, BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import slugify
 
-from .common import ViessmannBaseEntity
-
 # Import global values.
+from .common import ViessmannBaseEntity, async_add_viessmann_entities
 from .const import (
     BINARY_SENSORS,
+    DOMAIN as VIESSMANN_DOMAIN,
     MQTT_ROOT_TOPIC,
     ViessmannBinarySensorEntityDescription,
 )
+from .coordinator import ViessmannCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,35 +29,36 @@ async def async_setup_entry(
     """Set up sensors for Viessmann."""
     integrationUniqueID = config.unique_id
     mqttRoot = config.data[MQTT_ROOT_TOPIC]
+    coordinator = hass.data[VIESSMANN_DOMAIN][config.entry_id]
 
     sensorList = []
     # Create all global sensors.
-    global_sensors = copy.deepcopy(BINARY_SENSORS)
-    for description in global_sensors:
-        description.mqttTopicCurrentValue = f"{mqttRoot}/{description.key}"
-        _LOGGER.debug("mqttTopic: %s", description.mqttTopicCurrentValue)
+    for description in BINARY_SENSORS:
         sensorList.append(
             ViessmannBinarySensor(
                 uniqueID=integrationUniqueID,
                 description=description,
                 device_friendly_name=integrationUniqueID,
                 mqtt_root=mqttRoot,
+                coordinator=coordinator,
             )
         )
 
-    async_add_entities(sensorList)
+    async_add_viessmann_entities(coordinator, sensorList, async_add_entities)
 
 
 class ViessmannBinarySensor(ViessmannBaseEntity, BinarySensorEntity):
     """Representation of an Viessmann sensor that is updated via MQTT."""
 
     entity_description: ViessmannBinarySensorEntityDescription
+    _state_attr = "_attr_is_on"
 
     def __init__(
         self,
         uniqueID: str | None,
         device_friendly_name: str,
         mqtt_root: str,
+        coordinator: ViessmannCoordinator,
         description: ViessmannBinarySensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
@@ -67,27 +67,10 @@ class ViessmannBinarySensor(ViessmannBaseEntity, BinarySensorEntity):
         super().__init__(
             device_friendly_name=device_friendly_name,
             mqtt_root=mqtt_root,
+            coordinator=coordinator,
         )
 
         self.entity_description = description
         self._attr_unique_id = slugify(f"{uniqueID}-{description.name}")
-        self.entity_id = f"{DOMAIN}.{uniqueID}_{description.name}".lower()
+        self.entity_id = f"{DOMAIN}.{slugify(uniqueID)}_{description.name}".lower()
         self._attr_name = description.name
-
-    async def async_added_to_hass(self):
-        """Subscribe to MQTT events."""
-
-        @callback
-        def message_received(message):
-            """Handle new MQTT messages."""
-            self._attr_is_on = bool(float(message.payload))
-
-            # Update entity state with value published on MQTT.
-            self.async_write_ha_state()
-
-        await mqtt.async_subscribe(
-            self.hass,
-            self.entity_description.mqttTopicCurrentValue,
-            message_received,
-            1,
-        )
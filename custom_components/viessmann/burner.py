@@ -0,0 +1,208 @@
+"""Burner cycle analytics for the Viessmann integration."""
+from __future__ import annotations
+
+from array import array
+import logging
+from time import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Seconds changed analytics may wait before they are written.
+BURNER_SAVE_DELAY = 300
+
+# Datapoint keys of the burner start counter, stage and modulation.
+BURNER_STARTS = "getBrennerStarts"
+BURNER_STAGE = "getBrennerStufe"
+BURNER_POWER = "getLeistungIst"
+BURNER_DATAPOINTS = (BURNER_STARTS, BURNER_STAGE, BURNER_POWER)
+
+# The sliding window is one hour in buckets of five minutes.
+BUCKET_SECONDS = 300
+WINDOW_BUCKETS = 12
+# Modulation histogram bins of 10 %.
+MODULATION_BINS = 10
+# Fields of a bucket: starts, completed cycles, their seconds on, seconds on
+# times modulation, then seconds on per modulation bin.
+_STARTS = 0
+_CYCLES = 1
+_ON_TIME = 2
+_MODULATION = 3
+_BINS = 4
+_FIELDS = _BINS + MODULATION_BINS
+
+
+class ViessmannBurnerCycles:
+    """Detect burner cycles and keep metrics over the last hour.
+
+    The burner is on while its modulation or stage is above zero. Starts
+    come from the start counter once it has been read, else from detected
+    cycle starts. The window is a fixed ring of five-minute buckets in one
+    array, so memory stays constant however often the burner cycles; time
+    on is credited to the bucket of the update that ends it. The total
+    burner hours and the window survive restarts. Metrics are read at the
+    current time unless given one.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the analytics of a config entry."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.burner"
+        )
+        self._dirty = False
+        self._buckets = array("d", bytes(8 * WINDOW_BUCKETS * _FIELDS))
+        # Running number of the newest bucket.
+        self._bucket: int | None = None
+        self.burner_seconds = 0.0
+        self.cycle_start: float | None = None
+        self._since: float | None = None
+        self._power: float | None = None
+        self._stage: float | None = None
+        self._counter: float | None = None
+
+    async def async_load(self) -> None:
+        """Restore the burner hours and the window."""
+        stored = await self._store.async_load() or {}
+        self.burner_seconds = stored.get("burner_seconds", 0.0)
+        buckets = stored.get("buckets")
+        if buckets is not None and len(buckets) == len(self._buckets):
+            self._buckets = array("d", buckets)
+            self._bucket = stored.get("bucket")
+
+    async def async_remove(self) -> None:
+        """Delete the stored analytics."""
+        await self._store.async_remove()
+
+    @callback
+    def async_received(self, key: str, datapoint: Any) -> None:
+        """Follow a new value of a burner datapoint."""
+        if (value := datapoint.value).__class__ is not float:
+            return
+        timestamp = datapoint.timestamp.timestamp()
+        self._advance(timestamp)
+        self._accumulate(timestamp)
+        bucket = self._offset()
+        if key == BURNER_STARTS:
+            if self._counter is not None and value > self._counter:
+                self._buckets[bucket + _STARTS] += value - self._counter
+            self._counter = value
+            return
+        if key == BURNER_POWER:
+            self._power = value
+        else:
+            self._stage = value
+        on = (self._power or 0.0) > 0 or (self._stage or 0.0) > 0
+        if on and self.cycle_start is None:
+            self.cycle_start = self._since = timestamp
+            if self._counter is None:
+                self._buckets[bucket + _STARTS] += 1
+        elif not on and self.cycle_start is not None:
+            self._buckets[bucket + _CYCLES] += 1
+            self._buckets[bucket + _ON_TIME] += timestamp - self.cycle_start
+            self.cycle_start = self._since = None
+
+    def starts_per_hour(self, now: float | None = None) -> int:
+        """Return the burner starts within the last hour."""
+        now = time() if now is None else now
+        return int(self._sum(now, _STARTS))
+
+    def mean_on_time(self, now: float | None = None) -> float | None:
+        """Return the mean seconds on of the cycles ended within the hour."""
+        now = time() if now is None else now
+        if not (cycles := self._sum(now, _CYCLES)):
+            return None
+        return self._sum(now, _ON_TIME) / cycles
+
+    def mean_modulation(self, now: float | None = None) -> float | None:
+        """Return the mean modulation while on within the hour."""
+        now = time() if now is None else now
+        self._accumulate(now)
+        on_time = sum(self._sum(now, _BINS + i) for i in range(MODULATION_BINS))
+        if not on_time:
+            return None
+        return self._sum(now, _MODULATION) / on_time
+
+    def modulation_histogram(self, now: float | None = None) -> dict[str, float]:
+        """Return the share of time on per modulation bin within the hour."""
+        now = time() if now is None else now
+        self._accumulate(now)
+        seconds = [self._sum(now, _BINS + i) for i in range(MODULATION_BINS)]
+        on_time = sum(seconds) or 1.0
+        width = 100 // MODULATION_BINS
+        return {
+            f"{i * width}-{(i + 1) * width} %": round(bin_seconds / on_time, 3)
+            for i, bin_seconds in enumerate(seconds)
+        }
+
+    def burner_hours(self, now: float | None = None) -> float:
+        """Return the total hours the burner was on."""
+        now = time() if now is None else now
+        self._accumulate(now)
+        return self.burner_seconds / 3600
+
+    def _offset(self) -> int:
+        """Return the offset of the newest bucket in the array."""
+        assert self._bucket is not None
+        return (self._bucket % WINDOW_BUCKETS) * _FIELDS
+
+    def _advance(self, timestamp: float) -> None:
+        """Start the bucket of timestamp, clearing those passed without data."""
+        number = int(timestamp // BUCKET_SECONDS)
+        if self._bucket is not None and number <= self._bucket:
+            return
+        buckets = self._buckets
+        first = number - WINDOW_BUCKETS + 1
+        if self._bucket is not None:
+            first = max(first, self._bucket + 1)
+        for cleared in range(first, number + 1):
+            offset = (cleared % WINDOW_BUCKETS) * _FIELDS
+            buckets[offset : offset + _FIELDS] = array("d", bytes(8 * _FIELDS))
+        self._bucket = number
+
+    def _accumulate(self, timestamp: float) -> None:
+        """Credit the time on since the last update."""
+        if self._since is None or timestamp <= self._since:
+            return
+        self._advance(timestamp)
+        seconds = timestamp - self._since
+        self._since = timestamp
+        self.burner_seconds += seconds
+        power = self._power if self._power is not None else self._stage or 0.0
+        offset = self._offset()
+        buckets = self._buckets
+        buckets[offset + _MODULATION] += power * seconds
+        modulation_bin = int(power * MODULATION_BINS // 100)
+        modulation_bin = min(max(modulation_bin, 0), MODULATION_BINS - 1)
+        buckets[offset + _BINS + modulation_bin] += seconds
+        self._async_schedule_save()
+
+    def _sum(self, now: float, field: int) -> float:
+        """Return the sum of a field over the window."""
+        self._advance(now)
+        buckets = self._buckets
+        return sum(
+            buckets[bucket * _FIELDS + field] for bucket in range(WINDOW_BUCKETS)
+        )
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save the analytics within the save delay."""
+        if self._dirty:
+            return
+        self._dirty = True
+
+        def _data_to_save() -> dict[str, Any]:
+            self._dirty = False
+            return {
+                "burner_seconds": self.burner_seconds,
+                "bucket": self._bucket,
+                "buckets": list(self._buckets),
+            }
+
+        self._store.async_delay_save(_data_to_save, BURNER_SAVE_DELAY)
@@ -0,0 +1,69 @@
+"""Persistent cold-start cache of decoded values for the Viessmann integration."""
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Seconds a changed value may wait before the cache is written.
+CACHE_SAVE_DELAY = 120
+
+
+class ViessmannValueCache:
+    """Persist the last decoded value of every datapoint across restarts.
+
+    Saving is lazy: the first change after a save schedules the next one,
+    and the values are collected when the store actually writes. Home
+    Assistant writes pending saves when it stops.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the cache of a config entry."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.values"
+        )
+        self._dirty = False
+
+    async def async_load(self) -> dict[str, tuple[Any, datetime]]:
+        """Return the cached values and their timestamps by datapoint key."""
+        stored = await self._store.async_load() or {}
+        cached = {}
+        for key, (value, timestamp) in stored.get("values", {}).items():
+            if (parsed := dt_util.parse_datetime(timestamp)) is not None:
+                cached[key] = (value, parsed)
+        _LOGGER.debug("Loaded %s cached values", len(cached))
+        return cached
+
+    @callback
+    def async_schedule_save(self, data_func) -> None:
+        """Save the values returned by data_func within the save delay.
+
+        data_func returns (value, timestamp) pairs by datapoint key.
+        """
+        if self._dirty:
+            return
+        self._dirty = True
+
+        def _data_to_save() -> dict[str, Any]:
+            self._dirty = False
+            return {
+                "values": {
+                    key: [value, timestamp.isoformat()]
+                    for key, (value, timestamp) in data_func().items()
+                }
+            }
+
+        self._store.async_delay_save(_data_to_save, CACHE_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Delete the cache."""
+        await self._store.async_remove()
@@ -0,0 +1,312 @@
+"""Datapoint catalog built from vcontrold's command definitions."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any
+from xml.etree import ElementTree
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import PERCENTAGE, UnitOfTemperature, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.json import save_json
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.util.json import JSON_DECODE_EXCEPTIONS, json_loads
+
+from .const import DOMAIN, ENTITY_DESCRIPTIONS, ViessmannSensorEntityDescription
+from .topics import state_key
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bumped whenever the compiled format or its derivation changes.
+CATALOG_VERSION = 1
+# vcontrold's unit definitions, expected next to an XML command catalog.
+UNITS_FILE = "vcontrold.xml"
+
+KIND_NUMBER = "number"
+KIND_ENUM = "enum"
+# vcontrold unit types read as plain numbers.
+NUMERIC_TYPES = {"char", "uchar", "short", "ushort", "int", "uint"}
+
+# vcontrold unit entities and the units and device classes they map to.
+UNIT_ENTITIES: dict[str, tuple[str, SensorDeviceClass | None]] = {
+    "Grad Celsius": (UnitOfTemperature.CELSIUS, SensorDeviceClass.TEMPERATURE),
+    "°C": (UnitOfTemperature.CELSIUS, SensorDeviceClass.TEMPERATURE),
+    "%": (PERCENTAGE, None),
+    "Prozent": (PERCENTAGE, None),
+    "Stunden": (UnitOfTime.HOURS, SensorDeviceClass.DURATION),
+    "Sekunden": (UnitOfTime.SECONDS, SensorDeviceClass.DURATION),
+}
+
+
+class CatalogError(HomeAssistantError):
+    """Error reading a datapoint catalog."""
+
+
+@dataclass(frozen=True)
+class CatalogCommand:
+    """A get command of the catalog readable by the selected device."""
+
+    name: str
+    description: str
+    kind: str
+    # vcontrold unit entity of numbers, enum texts of enums.
+    unit: str | None
+    options: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class ViessmannCatalog:
+    """The get commands of one device type."""
+
+    device_id: str | None
+    device_name: str | None
+    commands: tuple[CatalogCommand, ...]
+
+
+def _xml_root(content: bytes, path: Path) -> ElementTree.Element:
+    """Parse an XML file of the local vcontrold configuration."""
+    try:
+        # The catalog is a local file of the user's own configuration.
+        return ElementTree.fromstring(content)  # nosec B314
+    except ElementTree.ParseError as err:
+        raise CatalogError(f"Invalid catalog {path}: {err}") from err
+
+
+def _text(element: ElementTree.Element, tag: str) -> str | None:
+    """Return the stripped text of a child element, if any."""
+    if (child := element.find(tag)) is None or child.text is None:
+        return None
+    return child.text.strip()
+
+
+def parse_xml_catalog(vito: bytes, units: bytes | None, path: Path) -> dict[str, Any]:
+    """Return the devices, units and commands of vcontrold's XML files.
+
+    The result has the layout of a JSON export. A command applies to all
+    devices unless it has `<device ID>` children, which may override its
+    unit and description for that device.
+    """
+    roots = [_xml_root(vito, path)]
+    if units is not None:
+        roots.append(_xml_root(units, path.with_name(UNITS_FILE)))
+    catalog: dict[str, Any] = {"devices": [], "units": [], "commands": []}
+    for root in roots:
+        for device in root.iterfind("./devices/device"):
+            catalog["devices"].append(
+                {"ID": device.get("ID"), "name": device.get("name")}
+            )
+        for unit in root.iter("unit"):
+            if (abbrev := _text(unit, "abbrev")) is None:
+                # A command's unit reference, not a definition.
+                continue
+            catalog["units"].append(
+                {
+                    "abbrev": abbrev,
+                    "type": _text(unit, "type"),
+                    "entity": _text(unit, "entity"),
+                    "enum": [
+                        text
+                        for enum in unit.iterfind("enum")
+                        if (text := enum.get("text"))
+                    ],
+                }
+            )
+        for command in root.iter("command"):
+            if (name := command.get("name")) is None:
+                continue
+            devices = {
+                device.get("ID"): {
+                    "unit": _text(device, "unit"),
+                    "description": _text(device, "description"),
+                }
+                for device in command.iterfind("device")
+            }
+            catalog["commands"].append(
+                {
+                    "name": name,
+                    "unit": _text(command, "unit"),
+                    "description": _text(command, "description"),
+                    "devices": devices,
+                }
+            )
+    return catalog
+
+
+def compile_catalog(catalog: dict[str, Any], device_id: str | None) -> ViessmannCatalog:
+    """Select the get commands of a device and resolve their units.
+
+    Without a device ID, the catalog must describe a single device.
+    """
+    devices = {device["ID"]: device.get("name") for device in catalog.get("devices", ())}
+    if device_id is None and len(devices) == 1:
+        device_id = next(iter(devices))
+    elif device_id is not None and device_id not in devices:
+        raise CatalogError(f"Device {device_id} is not in the catalog")
+    elif device_id is None and devices:
+        raise CatalogError(
+            f"The catalog describes {len(devices)} devices, choose one of "
+            + ", ".join(sorted(devices))
+        )
+    units = {unit["abbrev"]: unit for unit in catalog.get("units", ())}
+    commands = []
+    for command in catalog.get("commands", ()):
+        name = command["name"]
+        if not name.startswith("get"):
+            continue
+        command_devices = command.get("devices") or {}
+        if command_devices and device_id not in command_devices:
+            continue
+        override = command_devices.get(device_id) or {}
+        abbrev = override.get("unit") or command.get("unit")
+        if (unit := units.get(abbrev)) is None:
+            continue
+        description = override.get("description") or command.get("description") or ""
+        if unit.get("type") == "enum" and unit.get("enum"):
+            commands.append(
+                CatalogCommand(name, description, KIND_ENUM, None, tuple(unit["enum"]))
+            )
+        elif unit.get("type") in NUMERIC_TYPES:
+            commands.append(
+                CatalogCommand(name, description, KIND_NUMBER, unit.get("entity"))
+            )
+    return ViessmannCatalog(device_id, devices.get(device_id), tuple(commands))
+
+
+def _as_json(catalog: ViessmannCatalog) -> dict[str, Any]:
+    """Return the compact form of a compiled catalog."""
+    return {
+        "version": CATALOG_VERSION,
+        "device_id": catalog.device_id,
+        "device_name": catalog.device_name,
+        "commands": [
+            [
+                command.name,
+                command.description,
+                command.kind,
+                command.unit,
+                command.options,
+            ]
+            for command in catalog.commands
+        ],
+    }
+
+
+def _from_json(data: dict[str, Any]) -> ViessmannCatalog:
+    """Return a compiled catalog from its compact form."""
+    return ViessmannCatalog(
+        data["device_id"],
+        data["device_name"],
+        tuple(
+            CatalogCommand(name, description, kind, unit, tuple(options))
+            for name, description, kind, unit, options in data["commands"]
+        ),
+    )
+
+
+def load_catalog(path: Path, device_id: str | None, cache_dir: Path) -> ViessmannCatalog:
+    """Return the compiled catalog of vcontrold's XML files or a JSON export.
+
+    The compiled catalog is cached in cache_dir, keyed by a hash of the
+    source files and the device, so it is only parsed again after a change.
+    """
+    try:
+        content = path.read_bytes()
+        units_path = path.with_name(UNITS_FILE)
+        units = None
+        if path.suffix != ".json" and units_path != path and units_path.exists():
+            units = units_path.read_bytes()
+    except OSError as err:
+        raise CatalogError(f"Cannot read catalog {path}: {err}") from err
+
+    digest = hashlib.sha256(content)
+    digest.update(units or b"")
+    digest.update(f"{device_id}/{CATALOG_VERSION}".encode())
+    cache_path = cache_dir / f"{DOMAIN}.catalog.{digest.hexdigest()[:16]}.json"
+    try:
+        return _from_json(json_loads(cache_path.read_bytes()))
+    except FileNotFoundError:
+        pass
+    except (OSError, KeyError, TypeError, ValueError, *JSON_DECODE_EXCEPTIONS) as err:
+        _LOGGER.warning("Ignoring invalid catalog cache %s: %s", cache_path, err)
+
+    if path.suffix == ".json":
+        try:
+            raw = json_loads(content)
+        except JSON_DECODE_EXCEPTIONS as err:
+            raise CatalogError(f"Invalid catalog {path}: {err}") from err
+        if not isinstance(raw, dict):
+            raise CatalogError(f"Invalid catalog {path}")
+    else:
+        raw = parse_xml_catalog(content, units, path)
+    catalog = compile_catalog(raw, device_id)
+    _LOGGER.debug(
+        "Compiled %s commands of device %s from %s",
+        len(catalog.commands),
+        catalog.device_id,
+        path,
+    )
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        save_json(str(cache_path), _as_json(catalog))
+    except (OSError, HomeAssistantError) as err:
+        _LOGGER.warning("Cannot cache catalog in %s: %s", cache_path, err)
+    return catalog
+
+
+async def async_load_catalog(
+    hass: HomeAssistant, path: str, device_id: str | None
+) -> ViessmannCatalog:
+    """Load a catalog given relative to the configuration directory."""
+    return await hass.async_add_executor_job(
+        load_catalog,
+        Path(hass.config.path(path)),
+        device_id,
+        Path(hass.config.path(STORAGE_DIR)),
+    )
+
+
+def catalog_descriptions(
+    catalog: ViessmannCatalog,
+) -> tuple[ViessmannSensorEntityDescription, ...]:
+    """Return sensor descriptions of the catalog's datapoints.
+
+    Datapoints the integration describes itself are left out. Writable
+    datapoints become sensors too, since the catalog has no value ranges
+    to build numbers or selects from.
+    """
+    described = {state_key(description) for description in ENTITY_DESCRIPTIONS}
+    descriptions = []
+    for command in catalog.commands:
+        if command.name in described:
+            continue
+        common: dict[str, Any] = {
+            "key": command.name,
+            "name": command.name.removeprefix("get"),
+            "entity_category": EntityCategory.DIAGNOSTIC,
+            "entity_registry_enabled_default": False,
+        }
+        if command.kind == KIND_ENUM:
+            descriptions.append(
+                ViessmannSensorEntityDescription(
+                    **common,
+                    device_class=SensorDeviceClass.ENUM,
+                    options=list(command.options),
+                    value_fn=None,
+                )
+            )
+            continue
+        unit, device_class = UNIT_ENTITIES.get(command.unit or "", (None, None))
+        descriptions.append(
+            ViessmannSensorEntityDescription(
+                **common,
+                device_class=device_class,
+                native_unit_of_measurement=unit,
+                state_class=SensorStateClass.MEASUREMENT,
+            )
+        )
+    return tuple(descriptions)
@@ -0,0 +1,174 @@
+"""Climate entity of the Viessmann heating circuit M1."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.components.climate import (
+    DOMAIN,
+    PRESET_ECO,
+    PRESET_NONE,
+    ClimateEntity,
+    ClimateEntityFeature,
+    HVACAction,
+    HVACMode,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import slugify
+
+from .common import (
+    ViessmannCompositeEntity,
+    async_add_viessmann_entities,
+    description_by_key,
+    viessmann_device_info,
+)
+from .const import BINARY_SENSORS, DOMAIN as VIESSMANN_DOMAIN, NUMBERS, SELECTS, SENSORS
+from .coordinator import ViessmannCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+PRESET_PARTY = "party"
+
+# Operating modes of M1 in which the circuit does not heat.
+OFF_MODES = {"ABSCHALT", "WW"}
+# Operating modes sent for the HVAC modes; off keeps hot water running.
+HVAC_MODE_COMMANDS = {HVACMode.HEAT: "H+WW", HVACMode.OFF: "WW"}
+
+
+# The descriptions the climate entity combines, by name. The operating mode
+# comes first, it is the one discovery waits for.
+SOURCES = {
+    "mode": description_by_key(SELECTS, "getBetriebArtM1"),
+    "party": description_by_key(SELECTS, "getBetriebPartyM1"),
+    "eco": description_by_key(SELECTS, "getBetriebSparM1"),
+    "normal": description_by_key(NUMBERS, "getTempRaumNorSollM1"),
+    "reduced": description_by_key(NUMBERS, "getTempRaumRedSollM1"),
+    "party_temperature": description_by_key(NUMBERS, "getTempPartyM1"),
+    "flow": description_by_key(SENSORS, "getTempVListM1"),
+    "flow_target": description_by_key(SENSORS, "getTempVLsollM1"),
+    "pump": description_by_key(BINARY_SENSORS, "getPumpeStatusM1"),
+}
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, config: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up the climate entity of heating circuit M1."""
+    coordinator = hass.data[VIESSMANN_DOMAIN][config.entry_id]
+    async_add_viessmann_entities(
+        coordinator,
+        [ViessmannClimate(unique_id=config.unique_id, coordinator=coordinator)],
+        async_add_entities,
+    )
+
+
+class ViessmannClimate(ViessmannCompositeEntity, ClimateEntity):
+    """Heating circuit M1 with its operating mode, presets and setpoints.
+
+    The target temperature is the room setpoint in effect: the party
+    setpoint during party mode, the reduced one in reduced or eco mode and
+    the normal one otherwise. Setting it changes that setpoint.
+    """
+
+    _attr_hvac_modes = [HVACMode.HEAT, HVACMode.OFF]
+    _attr_preset_modes = [PRESET_NONE, PRESET_ECO, PRESET_PARTY]
+    _attr_supported_features = (
+        ClimateEntityFeature.TARGET_TEMPERATURE
+        | ClimateEntityFeature.PRESET_MODE
+        | ClimateEntityFeature.TURN_ON
+        | ClimateEntityFeature.TURN_OFF
+    )
+    _attr_temperature_unit = UnitOfTemperature.CELSIUS
+    _attr_icon = "mdi:radiator"
+    _enable_turn_on_off_backwards_compatibility = False
+    _sources = SOURCES
+
+    def __init__(
+        self, unique_id: str | None, coordinator: ViessmannCoordinator
+    ) -> None:
+        """Initialize the climate entity."""
+        super().__init__(coordinator)
+        normal = SOURCES["normal"]
+        self._attr_min_temp = normal.native_min_value
+        self._attr_max_temp = normal.native_max_value
+        self._attr_target_temperature_step = normal.native_step
+        self._attr_device_info = viessmann_device_info(unique_id)
+        self._attr_unique_id = slugify(f"{unique_id}-M1")
+        self.entity_id = f"{DOMAIN}.{slugify(unique_id)}_m1"
+        self._attr_name = "M1"
+
+    @property
+    def _setpoint(self) -> str:
+        """Return the name of the setpoint in effect."""
+        values = self._values
+        if values.get("party") == "ON":
+            return "party_temperature"
+        if values.get("eco") == "ON" or values.get("mode") == "RED":
+            return "reduced"
+        return "normal"
+
+    @property
+    def hvac_mode(self) -> HVACMode | None:
+        """Return the HVAC mode of the operating mode."""
+        if (mode := self._values.get("mode")) is None:
+            return None
+        return HVACMode.OFF if mode in OFF_MODES else HVACMode.HEAT
+
+    @property
+    def hvac_action(self) -> HVACAction | None:
+        """Return heating while the circuit pump runs."""
+        if self.hvac_mode == HVACMode.OFF:
+            return HVACAction.OFF
+        if (pump := self._values.get("pump")) is None:
+            return None
+        return HVACAction.HEATING if pump else HVACAction.IDLE
+
+    @property
+    def preset_mode(self) -> str | None:
+        """Return party, eco or no preset."""
+        values = self._values
+        if values.get("party") == "ON":
+            return PRESET_PARTY
+        if values.get("eco") == "ON":
+            return PRESET_ECO
+        return PRESET_NONE
+
+    @property
+    def target_temperature(self) -> float | None:
+        """Return the room setpoint in effect."""
+        return self._values.get(self._setpoint)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the operating mode and flow temperatures of the circuit."""
+        values = self._values
+        return {
+            "operating_mode": values.get("mode"),
+            "flow_temperature": values.get("flow"),
+            "flow_target_temperature": values.get("flow_target"),
+        }
+
+    async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
+        """Switch the operating mode."""
+        await self.async_send_command("mode", HVAC_MODE_COMMANDS[hvac_mode])
+
+    async def async_set_preset_mode(self, preset_mode: str) -> None:
+        """Switch party and eco mode."""
+        party = SOURCES["party"].valueMapCommand
+        eco = SOURCES["eco"].valueMapCommand
+        await self.async_send_command(
+            "party", party["ON" if preset_mode == PRESET_PARTY else "OFF"]
+        )
+        await self.async_send_command(
+            "eco", eco["ON" if preset_mode == PRESET_ECO else "OFF"]
+        )
+
+    async def async_set_temperature(self, **kwargs: Any) -> None:
+        """Change the room setpoint in effect."""
+        if (temperature := kwargs.get(ATTR_TEMPERATURE)) is None:
+            return
+        name = self._setpoint
+        await self.async_send_command(name, SOURCES[name].ivalue_fn(temperature))
@@ -0,0 +1,281 @@
+"""Coalescing outbound command queue for the Viessmann integration."""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+
+from .stats import ViessmannHistogram
+
+_LOGGER = logging.getLogger(__name__)
+
+# Round-trip latency buckets in seconds. vcontrold only reports a value when
+# it polls the datapoint, so latencies of minutes are expected.
+LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300, 600)
+
+# Sends a payload to a full command topic, over MQTT or a direct transport.
+PublishCallback = Callable[[str, str], Awaitable[None]]
+
+
+async def _async_log_failure(topic: str, publish: Awaitable[None]) -> None:
+    """Await a publish running as a task of its own, logging its failure."""
+    try:
+        await publish
+    except HomeAssistantError as err:
+        _LOGGER.error("Sending a command to %s failed: %s", topic, err)
+
+
+@dataclass
+class ViessmannCommandStats:
+    """Counters of requested and actually published commands."""
+
+    requested: int = 0
+    published: int = 0
+    coalesced: int = 0
+    skipped_unchanged: int = 0
+
+    @property
+    def saved(self) -> int:
+        """Return the number of publishes saved by the queue."""
+        return self.coalesced + self.skipped_unchanged
+
+
+@dataclass
+class ViessmannTrackerStats:
+    """Counters of tracked command round trips."""
+
+    tracked: int = 0
+    confirmed: int = 0
+    retried: int = 0
+    timed_out: int = 0
+
+
+@dataclass
+class _PendingCommand:
+    """A published command waiting for vcontrold to report its value."""
+
+    topic: str
+    value: Any
+    sent: float
+    attempt: int
+    cancel_timeout: CALLBACK_TYPE
+
+
+class ViessmannCommandTracker:
+    """Pair published commands with the state update confirming them.
+
+    A command counts as confirmed once vcontrold reports the sent value on
+    the state topic. Unconfirmed commands are published again with a doubled
+    timeout; when all retries are used up the datapoint is marked unconfirmed
+    until a matching value arrives.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        publish: PublishCallback,
+        timeout: float,
+        retries: int,
+    ) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self.publish = publish
+        self.timeout = timeout
+        self.retries = retries
+        self.stats = ViessmannTrackerStats()
+        self.latency = ViessmannHistogram(LATENCY_BUCKETS)
+        self.pending: dict[str, _PendingCommand] = {}
+        self.unconfirmed: dict[str, Any] = {}
+        self._listeners: dict[str, tuple[Callable[[], None], ...]] = {}
+
+    @callback
+    def async_add_listener(
+        self, state_key: str, status_callback: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Call status_callback when the confirmation status of a key changes."""
+        self._listeners[state_key] = self._listeners.get(state_key, ()) + (
+            status_callback,
+        )
+
+        @callback
+        def async_remove() -> None:
+            """Remove the listener."""
+            self._listeners[state_key] = tuple(
+                cb for cb in self._listeners[state_key] if cb is not status_callback
+            )
+
+        return async_remove
+
+    @callback
+    def async_track(self, state_key: str, topic: str, value: Any) -> None:
+        """Start waiting for vcontrold to report value on state_key."""
+        if (previous := self.pending.pop(state_key, None)) is not None:
+            previous.cancel_timeout()
+        self.stats.tracked += 1
+        self.pending[state_key] = _PendingCommand(
+            topic,
+            value,
+            self.hass.loop.time(),
+            0,
+            self._async_schedule_timeout(state_key, self.timeout),
+        )
+        if self.unconfirmed.pop(state_key, None) is not None:
+            self._async_notify(state_key)
+
+    @callback
+    def async_confirm(self, state_key: str, value: Any) -> None:
+        """Confirm the command sent to state_key if value matches it."""
+        if (command := self.pending.get(state_key)) is not None:
+            if value != command.value and str(value) != str(command.value):
+                return
+            del self.pending[state_key]
+            command.cancel_timeout()
+            self.stats.confirmed += 1
+            self.latency.add(self.hass.loop.time() - command.sent)
+        expected = self.unconfirmed.get(state_key)
+        if expected is not None and (value == expected or str(value) == str(expected)):
+            del self.unconfirmed[state_key]
+            self._async_notify(state_key)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop waiting for all commands."""
+        for command in self.pending.values():
+            command.cancel_timeout()
+        self.pending.clear()
+
+    def _async_schedule_timeout(self, state_key: str, delay: float) -> CALLBACK_TYPE:
+        """Schedule the timeout of the pending command of state_key."""
+
+        @callback
+        def _async_timed_out(_now) -> None:
+            self._async_timeout(state_key)
+
+        return async_call_later(self.hass, delay, _async_timed_out)
+
+    @callback
+    def _async_timeout(self, state_key: str) -> None:
+        """Retry a command vcontrold did not confirm in time, or give up."""
+        command = self.pending[state_key]
+        if command.attempt < self.retries:
+            command.attempt += 1
+            self.stats.retried += 1
+            _LOGGER.debug(
+                "No confirmation of %s on %s, retry %s",
+                command.value,
+                command.topic,
+                command.attempt,
+            )
+            command.cancel_timeout = self._async_schedule_timeout(
+                state_key, self.timeout * 2**command.attempt
+            )
+            self.hass.async_create_task(
+                _async_log_failure(
+                    command.topic, self.publish(command.topic, str(command.value))
+                )
+            )
+            return
+        del self.pending[state_key]
+        self.stats.timed_out += 1
+        _LOGGER.warning(
+            "vcontrold did not confirm %s on %s", command.value, command.topic
+        )
+        self.unconfirmed[state_key] = command.value
+        self._async_notify(state_key)
+
+    @callback
+    def _async_notify(self, state_key: str) -> None:
+        """Call the status listeners of state_key."""
+        for status_callback in self._listeners.get(state_key, ()):
+            status_callback()
+
+
+class ViessmannCommandQueue:
+    """Debounce and coalesce commands per command topic.
+
+    Every command goes over the slow Optolink bus, so a burst of commands to
+    the same topic (a dragged slider, a looping automation) is reduced to its
+    latest value once the topic was quiet for the debounce window. Commands
+    setting the value vcontrold last reported are dropped.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        publish: PublishCallback,
+        data: dict,
+        debounce: float,
+        tracker: ViessmannCommandTracker,
+    ) -> None:
+        """Initialize the queue on top of the entry's value store."""
+        self.hass = hass
+        self.publish = publish
+        self.debounce = debounce
+        self.tracker = tracker
+        self.stats = ViessmannCommandStats()
+        self._data = data
+        self._pending: dict[str, tuple[Any, str | None, bool]] = {}
+        self._timers: dict[str, CALLBACK_TYPE] = {}
+
+    async def async_send(
+        self, topic: str, value: Any, state_key: str | None, confirm: bool = True
+    ) -> None:
+        """Queue value for topic, replacing a command not yet published.
+
+        state_key names the datapoint confirming the command. With confirm,
+        the round trip is tracked until vcontrold reports value.
+        """
+        self.stats.requested += 1
+        if topic in self._pending:
+            self.stats.coalesced += 1
+        self._pending[topic] = (value, state_key, confirm)
+
+        if (cancel := self._timers.pop(topic, None)) is not None:
+            cancel()
+        if self.debounce <= 0:
+            await self._async_publish(topic)
+            return
+
+        @callback
+        def _async_debounced(_now) -> None:
+            self._timers.pop(topic, None)
+            self.hass.async_create_task(
+                _async_log_failure(topic, self._async_publish(topic))
+            )
+
+        self._timers[topic] = async_call_later(
+            self.hass, self.debounce, _async_debounced
+        )
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Drop all queued commands."""
+        for cancel in self._timers.values():
+            cancel()
+        self._timers.clear()
+        self._pending.clear()
+
+    async def _async_publish(self, topic: str) -> None:
+        """Publish the latest queued value of a topic."""
+        if (pending := self._pending.pop(topic, None)) is None:
+            return
+        value, state_key, confirm = pending
+        datapoint = self._data.get(state_key)
+        if (
+            datapoint is not None
+            and datapoint.value == value
+            and state_key not in self.tracker.pending
+        ):
+            _LOGGER.debug("Skip %s, vcontrold already reports %s", topic, value)
+            self.stats.skipped_unchanged += 1
+            return
+        _LOGGER.debug("MQTT topic: %s, payload: %s", topic, value)
+        self.stats.published += 1
+        if confirm and state_key is not None:
+            self.tracker.async_track(state_key, topic, value)
+        await self.publish(topic, str(value))
@@ -1,26 +1,389 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from functools import partial
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 
 from .const import DOMAIN, MANUFACTURER, MODEL
+from .coordinator import ViessmannCoordinator, ViessmannValue
+from .decoder import StateConverter
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def viessmann_device_info(device_friendly_name: str) -> DeviceInfo:
+    """Return the information of the heater device all entities belong to."""
+    return DeviceInfo(
+        name=device_friendly_name,
+        identifiers={(DOMAIN, device_friendly_name)},
+        manufacturer=MANUFACTURER,
+        model=MODEL,
+    )
+
+
+@callback
+def async_add_viessmann_entities(
+    coordinator: ViessmannCoordinator,
+    entities: list[ViessmannBaseEntity],
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Add the entities of a platform.
+
+    In discovery mode, entities of datapoints not seen yet are held back and
+    added once their datapoint is discovered.
+    """
+    if (discovery := coordinator.discovery) is None:
+        async_add_entities(entities)
+        return
+    held: dict[str, list[ViessmannBaseEntity]] = {}
+    ready = []
+    for entity in entities:
+        key = coordinator.datapoint_key(entity.state_topic)
+        if key in discovery.seen:
+            ready.append(entity)
+        else:
+            held.setdefault(key, []).append(entity)
+    if ready:
+        async_add_entities(ready)
+    if not held:
+        return
+
+    @callback
+    def async_discovered(keys: list[str]) -> None:
+        """Add the held back entities of discovered datapoints."""
+        if discovered := [entity for key in keys for entity in held.pop(key, ())]:
+            async_add_entities(discovered)
+
+    discovery.async_add_listener(async_discovered)
+
+
+def description_by_key(table: tuple, key: str) -> Any:
+    """Return the description of a key in a description table."""
+    return next(description for description in table if description.key == key)
 
 
 class ViessmannBaseEntity:
-    """Viessmann entity base class."""
+    """Viessmann entity base class.
+
+    Entities are views on the coordinator's decoded values. A platform sets
+    `_state_attr` to the attribute holding its state; the shared value is
+    converted by a function compiled from the entity description.
+    """
+
+    # States are pushed by the coordinator.
+    _attr_should_poll = False
+    _state_attr = "_attr_native_value"
+    _convert: StateConverter
+    # The state comes from a cached value past the maximum cache age.
+    _stale = False
+    # Key of the datapoint viewed, set once added.
+    _datapoint_key: str | None = None
+    # Least time between two state writes, if not the description's.
+    _min_update_interval: timedelta | None = None
 
     def __init__(
         self,
         device_friendly_name: str,
         mqtt_root: str,
+        coordinator: ViessmannCoordinator,
     ) -> None:
         """Init device info class."""
         self.device_friendly_name = device_friendly_name
         self.mqtt_root = mqtt_root
+        self.coordinator = coordinator
 
     @property
     def device_info(self) -> DeviceInfo:
         """Return the device information."""
-        return DeviceInfo(
-            name=self.device_friendly_name,
-            identifiers={(DOMAIN, self.device_friendly_name)},
-            manufacturer=MANUFACTURER,
-            model=MODEL,
+        return viessmann_device_info(self.device_friendly_name)
+
+    @property
+    def state_topic(self) -> str:
+        """Return the MQTT topic the entity reads its state from."""
+        return self.coordinator.topics.state_topic(self.entity_description)
+
+    @property
+    def command_topic(self) -> str | None:
+        """Return the MQTT topic the entity publishes commands to."""
+        return self.coordinator.topics.command_topic(self.entity_description)
+
+    async def async_send_command(self, value: Any) -> None:
+        """Queue value for the entity's command topic.
+
+        The state is not changed here; it follows once vcontrold reports the
+        new value on the state topic.
+        """
+        await self.coordinator.commands.async_send(
+            self.command_topic,
+            value,
+            self.coordinator.datapoint_key(self.state_topic),
+            self.entity_description.confirm_command,
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return True while the datapoint keeps being received."""
+        availability = self.coordinator.availability
+        if self._datapoint_key is None:
+            return availability.online
+        return availability.is_available(self._datapoint_key)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return a stale state and the command vcontrold did not confirm."""
+        attributes: dict[str, Any] = {}
+        if self._stale:
+            attributes["stale"] = True
+        unconfirmed = self.coordinator.tracker.unconfirmed
+        if unconfirmed and (
+            value := unconfirmed.get(self.coordinator.datapoint_key(self.state_topic))
+        ) is not None:
+            attributes["unconfirmed_command"] = value
+        return attributes or None
+
+    async def async_added_to_hass(self) -> None:
+        """Start viewing the value of the entity's state topic."""
+        await super().async_added_to_hass()
+        self._convert = self.coordinator.state_converter(self.entity_description)
+        key = self._datapoint_key = self.coordinator.datapoint_key(self.state_topic)
+        if self._min_update_interval is None:
+            self._min_update_interval = self.entity_description.min_update_interval
+        if self._min_update_interval is not None:
+            self.async_on_remove(lambda: self.coordinator.throttle.async_remove(self))
+        # Start from the value received or cached so far; the platform
+        # writes the state once the entity is added.
+        if (datapoint := self.coordinator.last_value(self.state_topic)) is not None:
+            try:
+                setattr(self, self._state_attr, self._convert(datapoint.value))
+            except (TypeError, ValueError):
+                pass
+            else:
+                self._stale = key in self.coordinator.stale
+        self.async_on_remove(
+            self.coordinator.async_add_stale_listener(
+                self.state_topic, self._handle_stale
+            )
         )
+        self.async_on_remove(
+            self.coordinator.availability.async_add_listener(
+                key, self.async_write_ha_state
+            )
+        )
+        self.async_on_remove(
+            self.coordinator.async_add_listener(
+                self.state_topic,
+                self._handle_value_update,
+            )
+        )
+        if self.command_topic is not None:
+            self.async_on_remove(
+                self.coordinator.tracker.async_add_listener(
+                    self.coordinator.datapoint_key(self.state_topic),
+                    self.async_write_ha_state,
+                )
+            )
+
+    def _write_suppressed(self, state: Any) -> str | None:
+        """Return why the description's write policy suppresses a new state.
+
+        Returns "unchanged" or "deadband", or None if the state is written.
+        """
+        description = self.entity_description
+        if not description.write_on_change:
+            return None
+        current = getattr(self, self._state_attr)
+        if state == current:
+            return "unchanged"
+        if (
+            isinstance(state, float | int)
+            and isinstance(current, float | int)
+            and not isinstance(state, bool)
+        ):
+            delta = abs(state - current)
+            if (description.deadband is not None and delta < description.deadband) or (
+                description.deadband_rel is not None
+                and delta < description.deadband_rel * abs(current)
+            ):
+                return "deadband"
+        return None
+
+    @callback
+    def _async_update_state(self, state: Any) -> None:
+        """Write a new state unless the write policy suppresses it."""
+        throttle = self.coordinator.throttle
+        if (reason := self._write_suppressed(state)) is not None:
+            stats = self.coordinator.write_stats
+            if reason == "unchanged":
+                stats.suppressed_unchanged += 1
+            else:
+                stats.suppressed_deadband += 1
+            # The latest value matches the written state, drop held back ones.
+            throttle.async_cancel(self)
+            return
+        if (interval := self._min_update_interval) is not None:
+            self._throttled_state = state
+            if not throttle.async_allow(
+                self, interval.total_seconds(), self._async_flush_throttled
+            ):
+                self.coordinator.write_stats.throttled += 1
+                return
+        self._async_write_state(state)
+
+    @callback
+    def _async_flush_throttled(self) -> None:
+        """Write the latest state held back by the throttle.
+
+        It was counted when it came in, so it is only checked again here.
+        """
+        if self._write_suppressed(self._throttled_state) is None:
+            self._async_write_state(self._throttled_state)
+
+    @callback
+    def _async_write_state(self, state: Any) -> None:
+        """Set and write the entity state."""
+        setattr(self, self._state_attr, state)
+        self.coordinator.write_stats.written += 1
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_stale(self) -> None:
+        """Flag the cached state as stale."""
+        self._stale = True
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_value_update(self, datapoint: ViessmannValue) -> None:
+        """Update the entity state from the value store."""
+        try:
+            state = self._convert(datapoint.value)
+        except (TypeError, ValueError):
+            # Counted as a decode error by the coordinator.
+            _LOGGER.debug("Cannot convert %r for %s", datapoint.value, self.entity_id)
+            return
+        if self._stale:
+            # Write the live value even if it equals the cached one.
+            self._stale = False
+            self.coordinator.throttle.async_cancel(self)
+            self._async_write_state(state)
+            return
+        self._async_update_state(state)
+
+
+# Seconds a composite entity collects changed values, like those of one
+# poll cycle, before writing them in one state update.
+COMPOSITE_WRITE_DELAY = 1.0
+
+
+class ViessmannCompositeEntity:
+    """Entity combining the values of several datapoints.
+
+    `_sources` maps names to the descriptions of the datapoints the entity
+    views; their converted values are kept in `_values` by name. Changes
+    arriving within the write delay are written in one state update, so
+    the state stays coherent and a poll cycle costs a single write.
+    """
+
+    _attr_should_poll = False
+    _sources: dict[str, Any]
+
+    def __init__(self, coordinator: ViessmannCoordinator) -> None:
+        """Initialize the entity."""
+        self.coordinator = coordinator
+        self._values: dict[str, Any] = {}
+        self._updated: datetime | None = None
+        self._unsub_write: CALLBACK_TYPE | None = None
+
+    @property
+    def state_topic(self) -> str:
+        """Return the topic of the first source, the one discovery waits for."""
+        first = next(iter(self._sources.values()))
+        return self.coordinator.topics.state_topic(first)
+
+    @property
+    def available(self) -> bool:
+        """Return True while the first source keeps being received."""
+        return self.coordinator.availability.is_available(
+            self.coordinator.datapoint_key(self.state_topic)
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Start viewing the values of all sources."""
+        await super().async_added_to_hass()
+        coordinator = self.coordinator
+        for name, description in self._sources.items():
+            convert = coordinator.state_converter(description)
+            topic = coordinator.topics.state_topic(description)
+            # Start from the values received or cached so far.
+            if (datapoint := coordinator.last_value(topic)) is not None:
+                self._set_value(name, convert, datapoint)
+            self.async_on_remove(
+                coordinator.async_add_listener(
+                    topic, partial(self._handle_value_update, name, convert)
+                )
+            )
+        self.async_on_remove(
+            coordinator.availability.async_add_listener(
+                coordinator.datapoint_key(self.state_topic), self.async_write_ha_state
+            )
+        )
+        self.async_on_remove(self._async_cancel_write)
+
+    async def async_send_command(self, name: str, value: Any) -> None:
+        """Queue value for the command topic of a source."""
+        coordinator = self.coordinator
+        description = self._sources[name]
+        await coordinator.commands.async_send(
+            coordinator.topics.command_topic(description),
+            value,
+            coordinator.datapoint_key(coordinator.topics.state_topic(description)),
+            description.confirm_command,
+        )
+
+    def _set_value(
+        self, name: str, convert: StateConverter, datapoint: ViessmannValue
+    ) -> bool:
+        """Store the value of a source, returning whether it changed."""
+        try:
+            state = convert(datapoint.value)
+        except (TypeError, ValueError):
+            return False
+        values = self._values
+        if name in values and values[name] == state:
+            return False
+        values[name] = state
+        if self._updated is None or datapoint.timestamp > self._updated:
+            self._updated = datapoint.timestamp
+        return True
+
+    @callback
+    def _handle_value_update(
+        self, name: str, convert: StateConverter, datapoint: ViessmannValue
+    ) -> None:
+        """Collect a changed value for the next write."""
+        if not self._set_value(name, convert, datapoint):
+            self.coordinator.write_stats.suppressed_unchanged += 1
+            return
+        if self._unsub_write is None:
+            self._unsub_write = async_call_later(
+                self.hass, COMPOSITE_WRITE_DELAY, self._async_write
+            )
+
+    @callback
+    def _async_write(self, _now: datetime) -> None:
+        """Write all values collected since the last write."""
+        self._unsub_write = None
+        self.coordinator.write_stats.written += 1
+        self.async_write_ha_state()
+
+    @callback
+    def _async_cancel_write(self) -> None:
+        """Drop a pending write."""
+        if self._unsub_write is not None:
+            self._unsub_write()
+            self._unsub_write = None
@@ -7,39 +7,61 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.components import mqtt
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers import config_validation as cv
+import homeassistant.helpers.config_validation as cv
 
-from .const import DATA_SCHEMA, DOMAIN, MQTT_ROOT_TOPIC, MQTT_ROOT_TOPIC_DEFAULT
-
-_LOGGER = logging.getLogger(__name__)
-
-# TODO adjust the data schema to the data that you need
-STEP_USER_DATA_SCHEMA = vol.Schema(
-    {
-        vol.Required("host"): cv.string,
-        vol.Required("username"): cv.string,
-        vol.Required("password"): cv.string,
-        vol.Required(MQTT_ROOT_TOPIC, default=MQTT_ROOT_TOPIC_DEFAULT): cv.string,
-    }
+from .const import (
+    AGGREGATE_CANDIDATES,
+    CONF_AGGREGATE,
+    CONF_CACHE_MAX_AGE,
+    CONF_CATALOG,
+    CONF_COMMAND_DEBOUNCE,
+    CONF_COMMAND_RETRIES,
+    CONF_COMMAND_TIMEOUT,
+    CONF_CURVE_HALF_LIFE,
+    CONF_DEVICE_ID,
+    CONF_DISCOVERY,
+    CONF_DISCOVERY_WINDOW,
+    CONF_EXPIRE_FACTOR,
+    CONF_LONG_TERM,
+    CONF_POLL_BUDGET,
+    CONF_POLL_TOPIC,
+    CONF_ROLLING_WINDOW,
+    CONF_STATUS_TOPIC,
+    CONF_TIMESERIES,
+    DATA_SCHEMA,
+    DEFAULT_AGGREGATE,
+    DEFAULT_CACHE_MAX_AGE,
+    DEFAULT_CATALOG,
+    DEFAULT_COMMAND_DEBOUNCE,
+    DEFAULT_COMMAND_RETRIES,
+    DEFAULT_COMMAND_TIMEOUT,
+    DEFAULT_CURVE_HALF_LIFE,
+    DEFAULT_DEVICE_ID,
+    DEFAULT_DISCOVERY,
+    DEFAULT_DISCOVERY_WINDOW,
+    DEFAULT_EXPIRE_FACTOR,
+    DEFAULT_LONG_TERM,
+    DEFAULT_POLL_BUDGET,
+    DEFAULT_POLL_TOPIC,
+    DEFAULT_ROLLING_WINDOW,
+    DEFAULT_STATUS_TOPIC,
+    DEFAULT_TIMESERIES,
+    DEFAULT_VCONTROLD_PORT,
+    DOMAIN,
+    LONG_TERM_CANDIDATES,
+    MQTT_ROOT_TOPIC,
+    TIMESERIES_CANDIDATES,
 )
+from .transport import VcontroldError, ViessmannTransport
 
+_LOGGER = logging.getLogger(__name__)
 
-class PlaceholderHub:
-    """Placeholder class to make tests pass.
-
-    TODO Remove this placeholder class and replace with things from your PyPI package.
-    """
-
-    def __init__(self, host: str) -> None:
-        """Initialize."""
-        self.host = host
-
-    async def authenticate(self, username: str, password: str) -> bool:
-        """Test if we can authenticate with the host."""
-        return True
+STEP_USER_DATA_SCHEMA = DATA_SCHEMA
 
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
@@ -47,32 +69,37 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
 
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
     """
-    # TODO validate the data can be used to set up a connection.
-
-    # If your PyPI package is not built with async, pass your methods
-    # to the executor:
-    # await hass.async_add_executor_job(
-    #     your_validate_func, data["username"], data["password"]
-    # )
-
-    hub = PlaceholderHub(data["host"])
-
-    if not await hub.authenticate(data["username"], data["password"]):
-        raise InvalidAuth
+    if (host := data.get(CONF_HOST)) is not None:
+        transport = ViessmannTransport(
+            host, data.get(CONF_PORT, DEFAULT_VCONTROLD_PORT)
+        )
+        try:
+            await transport.async_connect()
+        except VcontroldError as err:
+            raise CannotConnect from err
+        await transport.async_close()
+    elif not hass.config_entries.async_entries(mqtt.DOMAIN):
+        raise CannotConnect
 
-    # If you cannot connect:
-    # throw CannotConnect
-    # If the authentication is wrong:
-    # InvalidAuth
+    mqtt_root = data[MQTT_ROOT_TOPIC].strip().rstrip("/")
+    try:
+        mqtt.valid_publish_topic(mqtt_root)
+    except vol.Invalid as err:
+        raise InvalidTopic from err
+    # A root below another one would receive its messages twice.
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        other = entry.data[MQTT_ROOT_TOPIC]
+        if mqtt_root.startswith(f"{other}/") or other.startswith(f"{mqtt_root}/"):
+            raise NestedTopic
 
-    # Return info that you want to store in the config entry.
-    return {"title": MQTT_ROOT_TOPIC}
+    # Every vcontrold root topic is a heater of its own.
+    return {"title": mqtt_root, "host": host}
 
 
 class ViessmannConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Viessmann."""
 
-    VERSION = 1
+    VERSION = 2
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -84,25 +111,148 @@ class ViessmannConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 info = await validate_input(self.hass, user_input)
             except CannotConnect:
                 errors["base"] = "cannot_connect"
-            except InvalidAuth:
-                errors["base"] = "invalid_auth"
+            except InvalidTopic:
+                errors[MQTT_ROOT_TOPIC] = "invalid_topic"
+            except NestedTopic:
+                errors[MQTT_ROOT_TOPIC] = "nested_topic"
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
             else:
-                # Abort if the same integration was already configured.
+                # Abort if the same root topic was already configured.
                 await self.async_set_unique_id(info["title"])
                 self._abort_if_unique_id_configured()
-                
-                return self.async_create_entry(title=info["title"], data=user_input)
+
+                data = {MQTT_ROOT_TOPIC: info["title"]}
+                if info["host"] is not None:
+                    data[CONF_HOST] = info["host"]
+                    data[CONF_PORT] = user_input[CONF_PORT]
+                return self.async_create_entry(title=info["title"], data=data)
 
         return self.async_show_form(
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> ViessmannOptionsFlow:
+        """Get the options flow for this handler."""
+        return ViessmannOptionsFlow(config_entry)
+
+
+class ViessmannOptionsFlow(config_entries.OptionsFlow):
+    """Handle the options of a Viessmann heater."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_COMMAND_DEBOUNCE,
+                        default=options.get(
+                            CONF_COMMAND_DEBOUNCE, DEFAULT_COMMAND_DEBOUNCE
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+                    vol.Optional(
+                        CONF_COMMAND_TIMEOUT,
+                        default=options.get(
+                            CONF_COMMAND_TIMEOUT, DEFAULT_COMMAND_TIMEOUT
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=1, max=3600)),
+                    vol.Optional(
+                        CONF_COMMAND_RETRIES,
+                        default=options.get(
+                            CONF_COMMAND_RETRIES, DEFAULT_COMMAND_RETRIES
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=5)),
+                    vol.Optional(
+                        CONF_POLL_TOPIC,
+                        default=options.get(CONF_POLL_TOPIC, DEFAULT_POLL_TOPIC),
+                    ): str,
+                    vol.Optional(
+                        CONF_POLL_BUDGET,
+                        default=options.get(CONF_POLL_BUDGET, DEFAULT_POLL_BUDGET),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=20)),
+                    vol.Optional(
+                        CONF_CACHE_MAX_AGE,
+                        default=options.get(CONF_CACHE_MAX_AGE, DEFAULT_CACHE_MAX_AGE),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=604800)),
+                    vol.Optional(
+                        CONF_DISCOVERY,
+                        default=options.get(CONF_DISCOVERY, DEFAULT_DISCOVERY),
+                    ): bool,
+                    vol.Optional(
+                        CONF_DISCOVERY_WINDOW,
+                        default=options.get(
+                            CONF_DISCOVERY_WINDOW, DEFAULT_DISCOVERY_WINDOW
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=1, max=3600)),
+                    vol.Optional(
+                        CONF_CATALOG,
+                        default=options.get(CONF_CATALOG, DEFAULT_CATALOG),
+                    ): str,
+                    vol.Optional(
+                        CONF_DEVICE_ID,
+                        default=options.get(CONF_DEVICE_ID, DEFAULT_DEVICE_ID),
+                    ): str,
+                    vol.Optional(
+                        CONF_AGGREGATE,
+                        default=options.get(CONF_AGGREGATE, DEFAULT_AGGREGATE),
+                    ): cv.multi_select(AGGREGATE_CANDIDATES),
+                    vol.Optional(
+                        CONF_STATUS_TOPIC,
+                        default=options.get(CONF_STATUS_TOPIC, DEFAULT_STATUS_TOPIC),
+                    ): str,
+                    vol.Optional(
+                        CONF_EXPIRE_FACTOR,
+                        default=options.get(CONF_EXPIRE_FACTOR, DEFAULT_EXPIRE_FACTOR),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                    vol.Optional(
+                        CONF_ROLLING_WINDOW,
+                        default=options.get(
+                            CONF_ROLLING_WINDOW, DEFAULT_ROLLING_WINDOW
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=60, max=86400)),
+                    vol.Optional(
+                        CONF_LONG_TERM,
+                        default=options.get(CONF_LONG_TERM, DEFAULT_LONG_TERM),
+                    ): cv.multi_select(LONG_TERM_CANDIDATES),
+                    vol.Optional(
+                        CONF_CURVE_HALF_LIFE,
+                        default=options.get(
+                            CONF_CURVE_HALF_LIFE, DEFAULT_CURVE_HALF_LIFE
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=365)),
+                    vol.Optional(
+                        CONF_TIMESERIES,
+                        default=options.get(CONF_TIMESERIES, DEFAULT_TIMESERIES),
+                    ): cv.multi_select(TIMESERIES_CANDIDATES),
+                }
+            ),
+        )
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
 
-class InvalidAuth(HomeAssistantError):
-    """Error to indicate there is invalid auth."""
+class InvalidTopic(HomeAssistantError):
+    """Error to indicate the MQTT root topic is invalid."""
+
+
+class NestedTopic(HomeAssistantError):
+    """Error to indicate the MQTT root topic contains or is below another."""
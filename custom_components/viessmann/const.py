@@ -2,11 +2,10 @@
 
 from __future__ import annotations
 
-import re
-
-from datetime import datetime
-from dataclasses import dataclass
 from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import re
 
 import voluptuous as vol
 
@@ -14,6 +13,7 @@ from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntityDescription,
 )
+from homeassistant.components.datetime import DateTimeEntityDescription
 from homeassistant.components.number import NumberEntityDescription
 from homeassistant.components.select import SelectEntityDescription
 from homeassistant.components.sensor import (
@@ -23,17 +23,19 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.components.switch import SwitchDeviceClass, SwitchEntityDescription
 from homeassistant.const import (
+    CONF_HOST,
+    CONF_PORT,
     PERCENTAGE,
     Platform,
+    UnitOfElectricCurrent,
+    UnitOfElectricPotential,
     UnitOfEnergy,
     UnitOfLength,
     UnitOfPower,
-    UnitOfElectricPotential,
-    UnitOfElectricCurrent,
+    UnitOfTime,
 )
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import EntityCategory
-from homeassistant.components.datetime import DateTimeEntityDescription
 
 PLATFORMS: list[Platform] = [
     Platform.SELECT,
@@ -42,6 +44,8 @@ PLATFORMS: list[Platform] = [
     Platform.NUMBER,
     #Platform.SWITCH,
     Platform.DATETIME,
+    Platform.CLIMATE,
+    Platform.WATER_HEATER,
 ]
 
 # Global values
@@ -50,17 +54,105 @@ MANUFACTURER = "Viessmann"
 MODEL = "Vitodens 333F"
 MQTT_ROOT_TOPIC = "vcontrold"
 MQTT_ROOT_TOPIC_DEFAULT = "vcontrold"
+DEFAULT_VCONTROLD_PORT = 3002
+# Topic below the root carrying all values of a poll cycle as a JSON object.
+SNAPSHOT_TOPIC = "snapshot"
+# Base poll interval of datapoints without one of their own.
+DEFAULT_SCAN_INTERVAL = timedelta(seconds=60)
+
+# Options
+CONF_COMMAND_DEBOUNCE = "command_debounce"
+DEFAULT_COMMAND_DEBOUNCE = 1.0
+CONF_COMMAND_TIMEOUT = "command_timeout"
+DEFAULT_COMMAND_TIMEOUT = 120.0
+CONF_COMMAND_RETRIES = "command_retries"
+DEFAULT_COMMAND_RETRIES = 1
+# Topic below the root the MQTT bridge takes read requests on, the payload
+# is a comma separated list of get commands. Empty leaves polling to the
+# bridge.
+CONF_POLL_TOPIC = "poll_topic"
+DEFAULT_POLL_TOPIC = ""
+CONF_POLL_BUDGET = "poll_budget"
+DEFAULT_POLL_BUDGET = 2.0
+# Seconds after which values cached from the last run count as stale.
+CONF_CACHE_MAX_AGE = "cache_max_age"
+DEFAULT_CACHE_MAX_AGE = 3600.0
+# Only create entities for datapoints seen within the discovery window.
+CONF_DISCOVERY = "discovery"
+DEFAULT_DISCOVERY = False
+CONF_DISCOVERY_WINDOW = "discovery_window"
+DEFAULT_DISCOVERY_WINDOW = 120.0
+# vcontrold command catalog (vito.xml or a JSON export) relative to the
+# configuration directory, and the device ID of the heater in it. Empty
+# uses the built-in descriptions only.
+CONF_CATALOG = "catalog"
+DEFAULT_CATALOG = ""
+CONF_DEVICE_ID = "device_id"
+DEFAULT_DEVICE_ID = ""
+# Diagnostic datapoints shown as attributes of one aggregate entity instead
+# of entities of their own.
+CONF_AGGREGATE = "aggregate"
+DEFAULT_AGGREGATE: list[str] = []
+# Topic below the root the MQTT bridge publishes its birth and last will
+# messages on, like "online" and "offline".
+CONF_STATUS_TOPIC = "status_topic"
+DEFAULT_STATUS_TOPIC = "status"
+# A datapoint is unavailable once no value arrived for this many of its poll
+# intervals. 0 keeps datapoints available as long as the bridge is online.
+CONF_EXPIRE_FACTOR = "expire_factor"
+DEFAULT_EXPIRE_FACTOR = 3.0
+# Seconds of samples the rolling statistics sensors are computed over.
+CONF_ROLLING_WINDOW = "rolling_window"
+DEFAULT_ROLLING_WINDOW = 3600.0
+# Datapoints whose hourly mean, minimum and maximum are imported into the
+# recorder's long-term statistics. Their sensors write at most every
+# LONG_TERM_UPDATE_INTERVAL and compile no statistics of their own.
+CONF_LONG_TERM = "long_term"
+DEFAULT_LONG_TERM: list[str] = []
+LONG_TERM_UPDATE_INTERVAL = timedelta(minutes=5)
+# Days after which samples of the heating curve estimate count half, 0
+# weighs all samples alike.
+CONF_CURVE_HALF_LIFE = "curve_half_life"
+DEFAULT_CURVE_HALF_LIFE = 14.0
+# Datapoints every sample of which is kept in a fixed-size file below
+# <config>/viessmann, for high-resolution history over the websocket API.
+CONF_TIMESERIES = "timeseries"
+DEFAULT_TIMESERIES: list[str] = []
 
 # Data schema required by configuration flow
 DATA_SCHEMA = vol.Schema(
     {
         vol.Required(MQTT_ROOT_TOPIC, default=MQTT_ROOT_TOPIC_DEFAULT): cv.string,
+        # Talk to vcontrold directly instead of through the MQTT bridge.
+        vol.Optional(CONF_HOST): cv.string,
+        vol.Optional(CONF_PORT, default=DEFAULT_VCONTROLD_PORT): cv.port,
     }
 )
 
 
-@dataclass
-class ViessmannSensorEntityDescription(SensorEntityDescription):
+@dataclass(frozen=True)
+class ViessmannEntityDescriptionMixin:
+    """State write policy shared by all Viessmann entity descriptions."""
+
+    # Only write the state when it differs from the last written one.
+    write_on_change: bool = True
+    # Numeric states only: suppress changes smaller than an absolute value
+    # or a fraction of the last written state.
+    deadband: float | None = None
+    deadband_rel: float | None = None
+    # Minimum time between two state writes. Updates in between are held
+    # back and the latest one is written when the interval has passed.
+    min_update_interval: timedelta | None = None
+    # Commands are confirmed once vcontrold reports the sent value. Disable
+    # for datapoints whose reported value drifts from the command, like a clock.
+    confirm_command: bool = True
+    # Base interval the integration reads the datapoint at, if it polls.
+    # It shrinks while the value changes and grows while it is stable.
+    poll_interval: timedelta | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class ViessmannSensorEntityDescription(ViessmannEntityDescriptionMixin, SensorEntityDescription):
     """Enhance the sensor entity description for Viessmann"""
 
     value_fn: Callable | None = lambda v: round(float(v),1)
@@ -68,16 +160,35 @@ class ViessmannSensorEntityDescription(SensorEntityDescription):
     mqttTopicCurrentValue: str | None = None
 
 
-@dataclass
-class ViessmannBinarySensorEntityDescription(BinarySensorEntityDescription):
+@dataclass(frozen=True, kw_only=True)
+class ViessmannStatisticsSensorEntityDescription(SensorEntityDescription):
+    """Describe a sensor reporting the integration's own counters"""
+
+    # Called with the entry's coordinator.
+    value_fn: Callable
+    attributes_fn: Callable | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class ViessmannRollingSensorEntityDescription(SensorEntityDescription):
+    """Describe a statistic of a datapoint over the rolling window"""
+
+    # Key of the datapoint the samples come from.
+    source: str
+    # Name of the ViessmannRollingWindow property reported.
+    statistic: str
+
+
+@dataclass(frozen=True, kw_only=True)
+class ViessmannBinarySensorEntityDescription(ViessmannEntityDescriptionMixin, BinarySensorEntityDescription):
     """Enhance the sensor entity description for Viessmann"""
 
     state: Callable | None = None
     mqttTopicCurrentValue: str | None = None
 
 
-@dataclass
-class ViessmannSelectEntityDescription(SelectEntityDescription):
+@dataclass(frozen=True, kw_only=True)
+class ViessmannSelectEntityDescription(ViessmannEntityDescriptionMixin, SelectEntityDescription):
     """Enhance the select entity description for Viessmann"""
 
     valueMapCommand: dict | None = None
@@ -89,7 +200,7 @@ class ViessmannSelectEntityDescription(SelectEntityDescription):
     ivalue_fn: Callable | None = None
 
 
-@dataclass
+@dataclass(frozen=True, kw_only=True)
 class ViessmannSwitchEntityDescription(SwitchEntityDescription):
     """Enhance the select entity description for Viessmann"""
 
@@ -97,8 +208,8 @@ class ViessmannSwitchEntityDescription(SwitchEntityDescription):
     mqttTopicCurrentValue: str | None = None
 
 
-@dataclass
-class ViessmannNumberEntityDescription(NumberEntityDescription):
+@dataclass(frozen=True, kw_only=True)
+class ViessmannNumberEntityDescription(ViessmannEntityDescriptionMixin, NumberEntityDescription):
     """Enhance the number entity description for Viessmann"""
 
     mqttTopicCommand: str | None = None
@@ -107,8 +218,8 @@ class ViessmannNumberEntityDescription(NumberEntityDescription):
     ivalue_fn: Callable | None = float
     
 
-@dataclass
-class ViessmannDatetimeEntityDescription(DateTimeEntityDescription):
+@dataclass(frozen=True, kw_only=True)
+class ViessmannDatetimeEntityDescription(ViessmannEntityDescriptionMixin, DateTimeEntityDescription):
     """Enhance the select entity description for Viessmann"""
 
     mqttTopicCommand: str | None = None
@@ -117,7 +228,7 @@ class ViessmannDatetimeEntityDescription(DateTimeEntityDescription):
     ivalue_fn: Callable | None = None
     
     
-SENSORS = [
+SENSORS = (
     # System
     ViessmannSensorEntityDescription(
         key="getTempA",
@@ -126,6 +237,7 @@ SENSORS = [
         native_unit_of_measurement="°C",
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:thermometer",
+        poll_interval=timedelta(minutes=5),
     ),
     ViessmannSensorEntityDescription(
         key="getTempRaumNorSollM1",
@@ -134,6 +246,7 @@ SENSORS = [
         native_unit_of_measurement="°C",
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:thermometer",
+        poll_interval=timedelta(minutes=15),
     ),
     ViessmannSensorEntityDescription(
         key="getTempRaumRedSollM1",
@@ -142,6 +255,7 @@ SENSORS = [
         native_unit_of_measurement="°C",
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:thermometer",
+        poll_interval=timedelta(minutes=15),
     ),
     ViessmannSensorEntityDescription(
         key="getTempPartyM1",
@@ -150,6 +264,7 @@ SENSORS = [
         native_unit_of_measurement="°C",
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:thermometer",
+        poll_interval=timedelta(minutes=15),
     ),
     ViessmannSensorEntityDescription(
         key="getTempKist",
@@ -174,6 +289,9 @@ SENSORS = [
         native_unit_of_measurement="°C",
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:thermometer",
+        deadband=0.5,
+        min_update_interval=timedelta(seconds=10),
+        poll_interval=timedelta(seconds=30),
     ),
     ViessmannSensorEntityDescription(
         key="getTempSTSSOL",
@@ -256,6 +374,7 @@ SENSORS = [
         #native_unit_of_measurement="%",
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:counter",
+        poll_interval=timedelta(minutes=15),
     ),
     
     ViessmannSensorEntityDescription(
@@ -265,6 +384,7 @@ SENSORS = [
         native_unit_of_measurement=PERCENTAGE,
         entity_category=EntityCategory.DIAGNOSTIC,
         #icon="mdi:thermometer",
+        poll_interval=timedelta(seconds=30),
     ),
     ViessmannSensorEntityDescription(
         key="getLeistungIst",
@@ -273,6 +393,8 @@ SENSORS = [
         native_unit_of_measurement=PERCENTAGE,
         entity_category=EntityCategory.DIAGNOSTIC,
         #icon="mdi:thermometer",
+        min_update_interval=timedelta(seconds=10),
+        poll_interval=timedelta(seconds=30),
     ),
     
     ViessmannSensorEntityDescription(
@@ -282,9 +404,11 @@ SENSORS = [
         native_unit_of_measurement=PERCENTAGE,
         entity_category=EntityCategory.DIAGNOSTIC,
         #icon="mdi:thermometer",
+        min_update_interval=timedelta(seconds=10),
+        poll_interval=timedelta(seconds=30),
     ),
-]
-BINARY_SENSORS = [
+)
+BINARY_SENSORS = (
     ViessmannBinarySensorEntityDescription(
         key="getBetriebPartyM1",
         name="BetriebPartyM1",
@@ -327,8 +451,8 @@ BINARY_SENSORS = [
         device_class=None,
         icon="mdi:update",
     ),
-    ]
-SELECTS = [
+    )
+SELECTS = (
     ViessmannSelectEntityDescription(
         key="getBetriebProg",
         entity_category=EntityCategory.CONFIG,
@@ -352,6 +476,7 @@ SELECTS = [
         ],
         value_fn=lambda x: int(float(x)),
         ivalue_fn=float,
+        poll_interval=timedelta(minutes=15),
     ),
     ViessmannSelectEntityDescription(
         key="getBetriebArtM1",
@@ -383,14 +508,15 @@ SELECTS = [
             "H+WW",
             "ABSCHALT",
         ],
+        poll_interval=timedelta(minutes=15),
     ),
     ViessmannSelectEntityDescription(
         key="getBetriebPartyM1",
         entity_category=EntityCategory.CONFIG,
         name="BetriebPartyM1",
         valueMapCurrentValue={
-            '0': "OFF",
-            '1': "ON",
+            0: "OFF",
+            1: "ON",
         },
         valueMapCommand={
             "OFF": 0,
@@ -402,6 +528,27 @@ SELECTS = [
             "OFF",
             "ON",
         ],
+        value_fn=lambda x: int(float(x)),
+    ),
+    ViessmannSelectEntityDescription(
+        key="getBetriebSparM1",
+        entity_category=EntityCategory.CONFIG,
+        name="BetriebSparM1",
+        valueMapCurrentValue={
+            0: "OFF",
+            1: "ON",
+        },
+        valueMapCommand={
+            "OFF": 0,
+            "ON": 1,
+        },
+        mqttTopicCommand="setBetriebSparM1",
+        mqttTopicCurrentValue="getBetriebSparM1",
+        modes=[
+            "OFF",
+            "ON",
+        ],
+        value_fn=lambda x: int(float(x)),
     ),
     ViessmannSelectEntityDescription(
         key="getPumpeStatusZirku",
@@ -449,9 +596,9 @@ SELECTS = [
             "Warmwasser",
         ],
     ),
-    ]
+    )
 
-NUMBERS = [
+NUMBERS = (
     ViessmannNumberEntityDescription(
         key="getNiveauM1",
         name="NiveauM1",
@@ -467,6 +614,7 @@ NUMBERS = [
         icon="mdi:car-cruise-control",
         value_fn=float,
         ivalue_fn=int,
+        poll_interval=timedelta(minutes=15),
     ),
     ViessmannNumberEntityDescription(
         key="getNeigungM1",
@@ -483,6 +631,24 @@ NUMBERS = [
         icon="mdi:car-cruise-control",
         value_fn=float,
         ivalue_fn=float,
+        poll_interval=timedelta(minutes=15),
+    ),
+    ViessmannNumberEntityDescription(
+        key="getTempWWsoll",
+        name="TempWWsoll",
+        native_unit_of_measurement="°C",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        mode="box",
+        native_min_value=10.0,
+        native_max_value=60.0,
+        native_step=1.0,
+        entity_category=EntityCategory.CONFIG,
+        mqttTopicCommand="setTempWWsoll",
+        mqttTopicCurrentValue="getTempWWsoll",
+        icon="mdi:target",
+        value_fn=float,
+        ivalue_fn=float,
+        poll_interval=timedelta(minutes=15),
     ),
     ViessmannNumberEntityDescription(
         key="getTempRaumNorSollM1",
@@ -499,6 +665,7 @@ NUMBERS = [
         icon="mdi:target",
         value_fn=float,
         ivalue_fn=float,
+        poll_interval=timedelta(minutes=15),
     ),
     ViessmannNumberEntityDescription(
         key="getTempRaumRedSollM1",
@@ -515,6 +682,7 @@ NUMBERS = [
         icon="mdi:target",
         value_fn=float,
         ivalue_fn=float,
+        poll_interval=timedelta(minutes=15),
     ),
     ViessmannNumberEntityDescription(
         key="getTempPartyM1",
@@ -531,6 +699,7 @@ NUMBERS = [
         icon="mdi:car-cruise-control",
         value_fn=float,
         ivalue_fn=float,
+        poll_interval=timedelta(minutes=15),
     ),
     ViessmannNumberEntityDescription(
         key="getDurationPartyM1",
@@ -546,10 +715,13 @@ NUMBERS = [
         icon="mdi:car-cruise-control",
         value_fn=int,
         ivalue_fn=int,
+        poll_interval=timedelta(minutes=15),
     ),
-]
+)
+
+SYSTEM_TIME_RE = re.compile(r'^\d{4,4}-\d\d-\d\dT\d\d:\d\d:\d\d\+\d{4,4}$')
 
-DATETIMES = [
+DATETIMES = (
     
     ViessmannDatetimeEntityDescription(
         key="getSystemTime",
@@ -558,8 +730,177 @@ DATETIMES = [
         mqttTopicCommand="setSystemTime",
         mqttTopicCurrentValue="getSystemTime",
         # icon=None,
-        value_fn=lambda v: datetime.fromisoformat(v) if re.match(r'^\d{4,4}-\d\d-\d\dT\d\d:\d\d:\d\d\+\d{4,4}$',v) else None,
+        value_fn=lambda v: datetime.fromisoformat(v) if SYSTEM_TIME_RE.match(v) else None,
         ivalue_fn=lambda v: datetime.astimezone(v).isoformat(),
-    )
+        min_update_interval=timedelta(seconds=60),
+        confirm_command=False,
+        poll_interval=timedelta(hours=1),
+    ),
     
-    ] 
+    )
+
+ENTITY_DESCRIPTIONS = (*SENSORS, *BINARY_SENSORS, *SELECTS, *NUMBERS, *DATETIMES)
+
+# Sensors which can be aggregated, by key.
+AGGREGATE_CANDIDATES = {
+    description.key: description.name
+    for description in SENSORS
+    if description.entity_category == EntityCategory.DIAGNOSTIC
+}
+
+# Sensors with long-term statistics imported by the integration, by key.
+LONG_TERM_CANDIDATES = {
+    description.key: description.name
+    for description in SENSORS
+    if description.native_unit_of_measurement is not None
+}
+
+# Sensors whose samples can be kept as a time series, by key.
+TIMESERIES_CANDIDATES = LONG_TERM_CANDIDATES
+
+# Rolling statistics of busy datapoints, disabled by default. The standard
+# deviation is a difference, so it carries the unit but no device class.
+ROLLING_SENSORS = tuple(
+    ViessmannRollingSensorEntityDescription(
+        key=f"{source.key}_{statistic}",
+        name=f"{source.name}{suffix}",
+        source=source.key,
+        statistic=statistic,
+        device_class=None if statistic == "stddev" else source.device_class,
+        native_unit_of_measurement=source.native_unit_of_measurement,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:chart-bell-curve",
+    )
+    for source in SENSORS
+    if source.key in ("getTempAbgas", "getLeistungIst", "getTempKist")
+    for statistic, suffix in (
+        ("mean", "Mean"),
+        ("minimum", "Min"),
+        ("maximum", "Max"),
+        ("stddev", "StdDev"),
+    )
+)
+
+# Performance counters of the integration itself, disabled by default.
+STATISTICS_SENSORS = (
+    ViessmannStatisticsSensorEntityDescription(
+        key="messages",
+        name="Messages",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:message-processing",
+        value_fn=lambda coordinator: coordinator.message_stats.total_messages,
+    ),
+    ViessmannStatisticsSensorEntityDescription(
+        key="decode_errors",
+        name="DecodeErrors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:message-alert",
+        value_fn=lambda coordinator: coordinator.message_stats.total_decode_errors,
+    ),
+    ViessmannStatisticsSensorEntityDescription(
+        key="callback_time_p99",
+        name="CallbackTimeP99",
+        native_unit_of_measurement=UnitOfTime.MICROSECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:timer-outline",
+        value_fn=lambda coordinator: (
+            None
+            if (p99 := coordinator.message_stats.callback_time.percentile(0.99))
+            is None
+            else round(p99 * 1e6, 1)
+        ),
+    ),
+    ViessmannStatisticsSensorEntityDescription(
+        key="state_writes",
+        name="StateWrites",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:database-edit",
+        value_fn=lambda coordinator: coordinator.write_stats.written,
+    ),
+)
+
+# Burner cycle analytics over the last hour and in total.
+BURNER_SENSORS = (
+    ViessmannStatisticsSensorEntityDescription(
+        key="burner_starts_per_hour",
+        name="BurnerStartsPerHour",
+        native_unit_of_measurement="starts/h",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:fire-alert",
+        value_fn=lambda coordinator: coordinator.burner.starts_per_hour(),
+    ),
+    ViessmannStatisticsSensorEntityDescription(
+        key="burner_mean_on_time",
+        name="BurnerMeanOnTime",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:timer-fire",
+        value_fn=lambda coordinator: (
+            None
+            if (seconds := coordinator.burner.mean_on_time()) is None
+            else round(seconds)
+        ),
+    ),
+    ViessmannStatisticsSensorEntityDescription(
+        key="burner_modulation",
+        name="BurnerModulation",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:chart-histogram",
+        value_fn=lambda coordinator: (
+            None
+            if (modulation := coordinator.burner.mean_modulation()) is None
+            else round(modulation, 1)
+        ),
+        attributes_fn=lambda coordinator: coordinator.burner.modulation_histogram(),
+    ),
+    ViessmannStatisticsSensorEntityDescription(
+        key="burner_hours",
+        name="BurnerHours",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:clock-fire",
+        value_fn=lambda coordinator: round(coordinator.burner.burner_hours(), 2),
+    ),
+)
+
+# Heating curve of M1 estimated from the target and the actual flow.
+HEATING_CURVE_SENSORS = tuple(
+    ViessmannStatisticsSensorEntityDescription(
+        key=f"heating_curve_{fit}_{estimate}",
+        name=f"HeatingCurve{prefix}{suffix}",
+        native_unit_of_measurement=unit,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=fit == "target",
+        icon="mdi:chart-bell-curve-cumulative",
+        value_fn=lambda coordinator, fit=fit, estimate=estimate, digits=digits: (
+            None
+            if (value := getattr(coordinator.heating_curve.fits[fit], estimate))
+            is None
+            else round(value, digits)
+        ),
+    )
+    for fit, prefix in (("target", ""), ("actual", "Actual"))
+    for estimate, suffix, unit, digits in (
+        ("slope", "Slope", None, 2),
+        ("intercept", "Level", "K", 1),
+        ("r_squared", "Fit", None, 3),
+    )
+)
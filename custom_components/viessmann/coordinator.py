@@ -0,0 +1,734 @@
+"""Decode-once value store for the Viessmann integration."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import partial
+import logging
+from time import perf_counter
+from typing import Any
+
+from homeassistant.components import mqtt
+from homeassistant.components.mqtt.models import ReceiveMessage
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import JSON_DECODE_EXCEPTIONS, json_loads
+
+from .availability import BRIDGE_OFFLINE, BRIDGE_ONLINE, ViessmannAvailability
+from .burner import BURNER_DATAPOINTS, ViessmannBurnerCycles
+from .cache import ViessmannValueCache
+from .commands import ViessmannCommandQueue, ViessmannCommandTracker
+from .const import (
+    DEFAULT_CACHE_MAX_AGE,
+    DEFAULT_COMMAND_DEBOUNCE,
+    DEFAULT_COMMAND_RETRIES,
+    DEFAULT_COMMAND_TIMEOUT,
+    DEFAULT_EXPIRE_FACTOR,
+    DEFAULT_POLL_BUDGET,
+    DEFAULT_ROLLING_WINDOW,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STATUS_TOPIC,
+    SENSORS,
+    SNAPSHOT_TOPIC,
+)
+from .decoder import (
+    PayloadDecoder,
+    StateConverter,
+    compile_json_value_decoders,
+    compile_payload_decoders,
+    compile_state_converter,
+    decode_number,
+    json_value_decoder,
+    payload_decoder,
+)
+from .discovery import ViessmannDiscovery
+from .dispatcher import ViessmannDispatcher
+from .heating_curve import CURVE_DATAPOINTS, ViessmannHeatingCurve
+from .longterm import ViessmannLongTermStatistics
+from .rolling import ViessmannRollingWindow
+from .scheduler import BASE_INTERVALS, ViessmannPollScheduler, base_intervals
+from .stats import CALLBACK_TIME_SAMPLE_MASK, ViessmannMessageStats
+from .throttle import ViessmannThrottle
+from .timeseries import ViessmannTimeSeries, timeseries_directory
+from .topics import ViessmannTopics
+from .transport import VcontroldError, ViessmannTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class ViessmannValue:
+    """Last decoded value of a vcontrold datapoint."""
+
+    value: Any
+    timestamp: datetime
+
+
+ValueCallback = Callable[[ViessmannValue], None]
+# Stores a decoded value; unchanged values are only fanned out if asked to.
+ValueHandler = Callable[[Any, datetime, bool], None]
+# Receives the key and value of every datapoint that changed.
+ChangeCallback = Callable[[str, ViessmannValue], None]
+
+
+@dataclass
+class ViessmannWriteStats:
+    """Counters of state writes done and suppressed by the write policy."""
+
+    written: int = 0
+    suppressed_unchanged: int = 0
+    suppressed_deadband: int = 0
+    throttled: int = 0
+
+    @property
+    def suppressed(self) -> int:
+        """Return the number of suppressed state writes."""
+        return self.suppressed_unchanged + self.suppressed_deadband
+
+
+class ViessmannCoordinator:
+    """Per-entry store of decoded datapoint values.
+
+    Every topic is decoded once when its message arrives. Entities viewing the
+    same datapoint register as listeners and derive their state from the
+    shared `ViessmannValue` instead of parsing the payload themselves.
+
+    Messages come from the MQTT bridge, or, with a transport, from batched
+    reads of vcontrold itself. Commands take the same way back. With a
+    transport or a poll topic, the integration schedules the reads itself.
+
+    A bridge may also publish all values of a poll cycle as one JSON object
+    on `<root>/snapshot`. It is parsed once and only changed values are
+    fanned out.
+
+    With a cache, the values of the last run are loaded before any entity
+    is added. Entities start from them, and they count as stale once they
+    are older than the maximum cache age and not received again.
+
+    In discovery mode, entities are only created for datapoints vcontrold
+    actually publishes. Until a datapoint is seen, a one-shot route waits
+    for its topic; the first value is kept for the entity created for it.
+
+    A datapoint turns unavailable once no value arrived for expire_factor
+    of its poll intervals, and all of them while the bridge is offline,
+    going by its birth and last will messages on the status topic or by
+    failed reads, or while Home Assistant is disconnected from the broker.
+
+    Datapoints with an enabled rolling sensor feed their samples to a ring
+    buffer right from the value handler, and those with long-term statistics
+    to their five-minute bucket. Burner cycle analytics listen to the burner
+    datapoints like any entity, the heating curve estimator samples the
+    stored values on a timer of its own. Datapoints with a time series
+    append every sample to its memory-mapped file from the value handler.
+    Change listeners receive every changed value, of any datapoint, like the
+    websocket subscriptions of dashboards.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        mqtt_root: str,
+        dispatcher: ViessmannDispatcher,
+        command_debounce: float = DEFAULT_COMMAND_DEBOUNCE,
+        command_timeout: float = DEFAULT_COMMAND_TIMEOUT,
+        command_retries: int = DEFAULT_COMMAND_RETRIES,
+        transport: ViessmannTransport | None = None,
+        poll_topic: str | None = None,
+        poll_budget: float = DEFAULT_POLL_BUDGET,
+        cache: ViessmannValueCache | None = None,
+        cache_max_age: float = DEFAULT_CACHE_MAX_AGE,
+        discovery_window: float | None = None,
+        extra_descriptions: tuple = (),
+        status_topic: str | None = DEFAULT_STATUS_TOPIC,
+        expire_factor: float = DEFAULT_EXPIRE_FACTOR,
+        rolling_window: float = DEFAULT_ROLLING_WINDOW,
+        long_term: Iterable[str] = (),
+        burner: ViessmannBurnerCycles | None = None,
+        heating_curve: ViessmannHeatingCurve | None = None,
+        timeseries: Iterable[str] = (),
+    ) -> None:
+        """Initialize the store for one vcontrold root topic."""
+        self.hass = hass
+        self.mqtt_root = mqtt_root
+        self.dispatcher = dispatcher
+        self.transport = transport
+        self.poll_topic = f"{mqtt_root}/{poll_topic}" if poll_topic else None
+        self.status_topic = f"{mqtt_root}/{status_topic}" if status_topic else None
+        # Descriptions of this entry only, like those from a datapoint catalog.
+        self.extra_descriptions = extra_descriptions
+        self.topics = ViessmannTopics(mqtt_root, extra_descriptions)
+        self._decoders = compile_payload_decoders(extra_descriptions)
+        self._json_decoders = compile_json_value_decoders(self._decoders)
+        # State converters of the entities by description position, only
+        # valid while the descriptions of this entry are.
+        self._converters: dict[int, StateConverter] = {}
+        self.data: dict[str, ViessmannValue] = {}
+        # Values no listener received yet, from the last run or discovery,
+        # and those of them older than cache_max_age.
+        self.cached: dict[str, ViessmannValue] = {}
+        self.stale: set[str] = set()
+        self.cache = cache
+        self.cache_max_age = cache_max_age
+        self.expire_factor = expire_factor
+        self.availability = ViessmannAvailability(
+            hass, self._expected_interval, self._last_seen
+        )
+        self._unsub_status: CALLBACK_TYPE | None = None
+        # Every sample of these datapoints, changed or not, is added to
+        # their rolling window as it is stored. The windows are created by
+        # the first rolling sensor added, most are disabled by default.
+        self._rolling_window = rolling_window
+        self.rolling: dict[str, ViessmannRollingWindow] = {}
+        self.burner = burner
+        self.heating_curve = heating_curve
+        self.long_term: ViessmannLongTermStatistics | None = None
+        if long_term_keys := set(long_term):
+            self.long_term = ViessmannLongTermStatistics(
+                hass,
+                mqtt_root,
+                [
+                    description
+                    for description in SENSORS
+                    if description.key in long_term_keys
+                ],
+            )
+        self.timeseries: dict[str, ViessmannTimeSeries] = {}
+        if timeseries := list(timeseries):
+            directory = timeseries_directory(hass, mqtt_root)
+            self.timeseries = {
+                key: ViessmannTimeSeries(directory / f"{key}.bin") for key in timeseries
+            }
+        self._unsub_connection: CALLBACK_TYPE | None = None
+        self.write_stats = ViessmannWriteStats()
+        self.message_stats = ViessmannMessageStats(perf_counter())
+        self.throttle = ViessmannThrottle(hass)
+        self.tracker = ViessmannCommandTracker(
+            hass, self.async_publish, command_timeout, command_retries
+        )
+        self.commands = ViessmannCommandQueue(
+            hass, self.async_publish, self.data, command_debounce, self.tracker
+        )
+        self._prefix = f"{mqtt_root}/"
+        self._listeners: dict[str, tuple[ValueCallback, ...]] = {}
+        self._handlers: dict[str, ValueHandler] = {}
+        self._routes: dict[str, CALLBACK_TYPE] = {}
+        self._unsub_snapshot: CALLBACK_TYPE | None = None
+        self._stale_listeners: dict[str, tuple[Callable[[], None], ...]] = {}
+        self._change_listeners: tuple[ChangeCallback, ...] = ()
+        self._unsub_stale: CALLBACK_TYPE | None = None
+        self.discovery: ViessmannDiscovery | None = None
+        self._discovery_routes: dict[str, CALLBACK_TYPE] = {}
+        if discovery_window is not None:
+            self.discovery = ViessmannDiscovery(hass, discovery_window)
+        # Command key to the key of the datapoint confirming it.
+        self._confirming: dict[str, str] = {
+            self.datapoint_key(command): self.datapoint_key(state)
+            for command, state in zip(self.topics.command, self.topics.state)
+            if command is not None
+        }
+        self._base_intervals = {
+            **base_intervals(extra_descriptions),
+            **BASE_INTERVALS,
+        }
+        self.scheduler: ViessmannPollScheduler | None = None
+        if transport is not None or self.poll_topic is not None:
+            self.scheduler = ViessmannPollScheduler(
+                hass, self.async_request_read, poll_budget, self._base_intervals
+            )
+
+    async def async_setup(self) -> None:
+        """Start receiving vcontrold messages."""
+        if self.timeseries:
+            await self.hass.async_add_executor_job(self._open_timeseries)
+        if self.cache is not None:
+            for key, (value, timestamp) in (await self.cache.async_load()).items():
+                self.cached[key] = ViessmannValue(value, timestamp)
+            self._async_check_stale(None)
+        if self.burner is not None:
+            await self.burner.async_load()
+            for key in BURNER_DATAPOINTS:
+                self.async_add_listener(
+                    key, partial(self.burner.async_received, key)
+                )
+        if self.heating_curve is not None:
+            await self.heating_curve.async_load()
+            for key in CURVE_DATAPOINTS:
+                # Only make sure the datapoints are received.
+                self.async_add_listener(key, lambda datapoint: None)
+            self.heating_curve.async_start(self.last_value)
+        if self.transport is None:
+            self.message_stats.track(SNAPSHOT_TOPIC)
+            self._unsub_snapshot = self.dispatcher.async_register(
+                f"{self._prefix}{SNAPSHOT_TOPIC}", self._async_snapshot_received
+            )
+            if self.discovery is not None:
+                self._async_start_discovery()
+            if self.status_topic is not None:
+                self._unsub_status = self.dispatcher.async_register(
+                    self.status_topic, self._async_status_received
+                )
+            self.availability.async_set_connected(mqtt.is_connected(self.hass))
+            self._unsub_connection = mqtt.async_subscribe_connection_status(
+                self.hass, self.availability.async_set_connected
+            )
+            await self.dispatcher.async_add_root(self.mqtt_root)
+        else:
+            await self.transport.async_connect()
+            if self.discovery is not None:
+                await self._async_discover_transport()
+        if self.expire_factor > 0:
+            self.availability.async_start()
+        if self.long_term is not None:
+            self.long_term.async_start()
+        if self.scheduler is not None:
+            self.scheduler.async_start()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop receiving vcontrold messages."""
+        if self.scheduler is not None:
+            self.scheduler.async_stop()
+        if self.transport is None:
+            self.dispatcher.async_remove_root(self.mqtt_root)
+            for unsub in (
+                self._unsub_snapshot,
+                self._unsub_status,
+                self._unsub_connection,
+            ):
+                if unsub is not None:
+                    unsub()
+            self._unsub_snapshot = self._unsub_status = None
+            self._unsub_connection = None
+        else:
+            self.hass.async_create_task(self.transport.async_close())
+        if self._unsub_stale is not None:
+            self._unsub_stale()
+            self._unsub_stale = None
+        self.availability.async_stop()
+        if self.long_term is not None:
+            self.long_term.async_stop()
+        if self.heating_curve is not None:
+            self.heating_curve.async_stop()
+        if self.timeseries:
+            self.hass.async_add_executor_job(
+                self._close_timeseries, list(self.timeseries.values())
+            )
+            self.timeseries = {}
+        if self.discovery is not None:
+            self.discovery.async_stop()
+        for remove_route in self._discovery_routes.values():
+            remove_route()
+        self._discovery_routes.clear()
+        self.throttle.async_shutdown()
+        self.commands.async_shutdown()
+        self.tracker.async_shutdown()
+        for remove_route in self._routes.values():
+            remove_route()
+        self._routes.clear()
+        self._handlers.clear()
+        self._listeners.clear()
+        self._stale_listeners.clear()
+        self._change_listeners = ()
+        self._converters.clear()
+
+    def datapoint_key(self, topic: str) -> str:
+        """Return the datapoint key of a topic given with or without root."""
+        return topic.removeprefix(self._prefix)
+
+    @callback
+    def async_add_listener(self, topic: str, update_callback: ValueCallback) -> CALLBACK_TYPE:
+        """Call update_callback with the decoded value of every topic update.
+
+        Returns a callable which removes the listener again.
+        """
+        key = self.datapoint_key(topic)
+        self._listeners[key] = self._listeners.get(key, ()) + (update_callback,)
+        if key not in self._handlers:
+            self.message_stats.track(key)
+            handler = self._handlers[key] = self._value_handler(key)
+            if self.transport is None:
+                self._routes[key] = self.dispatcher.async_register(
+                    f"{self._prefix}{key}", self._message_handler(key, handler)
+                )
+
+        @callback
+        def async_remove() -> None:
+            """Remove the listener."""
+            remaining = tuple(
+                cb for cb in self._listeners.get(key, ()) if cb is not update_callback
+            )
+            if remaining:
+                self._listeners[key] = remaining
+                return
+            self._listeners.pop(key, None)
+            self._handlers.pop(key, None)
+            if (remove_route := self._routes.pop(key, None)) is not None:
+                remove_route()
+
+        return async_remove
+
+    def payload_decoder(self, key: str) -> PayloadDecoder:
+        """Return the payload decoder of a datapoint key."""
+        if (decode := self._decoders.get(key)) is not None:
+            return decode
+        return payload_decoder(key)
+
+    def state_converter(self, description) -> StateConverter:
+        """Return the state converter of a description, compiled once."""
+        position = self.topics.position(description)
+        if (convert := self._converters.get(position)) is None:
+            convert = self._converters[position] = compile_state_converter(
+                description
+            )
+        return convert
+
+    def rolling_window(self, key: str) -> ViessmannRollingWindow:
+        """Return the rolling window of a datapoint key, created once."""
+        if (window := self.rolling.get(key)) is None:
+            window = self.rolling[key] = ViessmannRollingWindow(self._rolling_window)
+        return window
+
+    def json_value_decoder(self, key: str) -> Callable[[Any], Any]:
+        """Return the decoder of a datapoint key's values in a JSON snapshot."""
+        if (decode := self._json_decoders.get(key)) is not None:
+            return decode
+        return json_value_decoder(key)
+
+    def last_value(self, topic: str) -> ViessmannValue | None:
+        """Return the latest value of a topic, received or cached."""
+        key = self.datapoint_key(topic)
+        return self.data.get(key) or self.cached.get(key)
+
+    @callback
+    def async_add_stale_listener(
+        self, topic: str, stale_callback: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Call stale_callback when the cached value of a topic turns stale."""
+        key = self.datapoint_key(topic)
+        self._stale_listeners[key] = self._stale_listeners.get(key, ()) + (
+            stale_callback,
+        )
+
+        @callback
+        def async_remove() -> None:
+            """Remove the listener."""
+            self._stale_listeners[key] = tuple(
+                cb
+                for cb in self._stale_listeners.get(key, ())
+                if cb is not stale_callback
+            )
+
+        return async_remove
+
+    @callback
+    def async_add_change_listener(self, change_callback: ChangeCallback) -> CALLBACK_TYPE:
+        """Call change_callback with every changed value, of any datapoint."""
+        self._change_listeners += (change_callback,)
+
+        @callback
+        def async_remove() -> None:
+            """Remove the listener."""
+            self._change_listeners = tuple(
+                cb for cb in self._change_listeners if cb is not change_callback
+            )
+
+        return async_remove
+
+    async def async_publish(self, topic: str, payload: str) -> None:
+        """Send a command payload to a full command topic."""
+        if self.transport is None:
+            await mqtt.async_publish(self.hass, topic, payload)
+            return
+        key = self.datapoint_key(topic)
+        await self.transport.async_write(key, payload)
+        # Read the new value back right away instead of waiting for the poll.
+        if (state_key := self._confirming.get(key)) is not None:
+            await self.async_refresh([state_key])
+
+    async def async_refresh(self, keys: list[str] | None = None) -> None:
+        """Read datapoints from the transport in one batch.
+
+        Without keys, all datapoints with listeners are read.
+        """
+        assert self.transport is not None
+        if keys is None:
+            keys = list(self._handlers)
+        values = await self.transport.async_read(keys)
+        timestamp = dt_util.utcnow()
+        messages = self.message_stats.messages
+        decode_errors = self.message_stats.decode_errors
+        for key, payload in values.items():
+            if (handler := self._handlers.get(key)) is None:
+                continue
+            messages[key] += 1
+            if payload is None:
+                decode_errors[key] += 1
+                continue
+            handler(self.payload_decoder(key)(payload), timestamp, True)
+
+    async def async_request_read(self, keys: list[str]) -> None:
+        """Have vcontrold read datapoints, over the transport or MQTT."""
+        if self.transport is None:
+            assert self.poll_topic is not None
+            await mqtt.async_publish(self.hass, self.poll_topic, ",".join(keys))
+            return
+        try:
+            await self.async_refresh(keys)
+        except VcontroldError as err:
+            if self.availability.bridge_online:
+                _LOGGER.warning("Polling %s failed: %s", self.mqtt_root, err)
+            self.availability.async_set_bridge(False)
+        else:
+            self.availability.async_set_bridge(True)
+
+    def _expected_interval(self, key: str) -> float:
+        """Return the seconds after which a datapoint without value expires."""
+        interval = self._base_intervals.get(
+            key, DEFAULT_SCAN_INTERVAL.total_seconds()
+        )
+        if self.scheduler is not None:
+            # Unchanged values are polled less often.
+            interval = max(interval, self.scheduler.intervals.get(key, interval))
+        return interval * self.expire_factor
+
+    def _last_seen(self, key: str) -> datetime | None:
+        """Return when a datapoint was last received."""
+        if (datapoint := self.data.get(key)) is None:
+            return None
+        return datapoint.timestamp
+
+    @callback
+    def _async_status_received(self, message: ReceiveMessage) -> None:
+        """Follow the birth and last will messages of the bridge."""
+        payload = message.payload
+        if isinstance(payload, bytes):
+            payload = payload.decode(errors="replace")
+        status = payload.strip().lower()
+        if status in BRIDGE_ONLINE:
+            self.availability.async_set_bridge(True)
+        elif status in BRIDGE_OFFLINE:
+            self.availability.async_set_bridge(False)
+        else:
+            _LOGGER.debug("Unknown bridge status on %s: %s", message.topic, payload)
+
+    def _open_timeseries(self) -> None:
+        """Map the time series files, leaving out those which fail."""
+        for key, series in list(self.timeseries.items()):
+            try:
+                series.open()
+            except OSError as err:
+                _LOGGER.error("Cannot open the time series of %s: %s", key, err)
+                del self.timeseries[key]
+
+    @staticmethod
+    def _close_timeseries(timeseries: list[ViessmannTimeSeries]) -> None:
+        """Unmap the time series files."""
+        for series in timeseries:
+            series.close()
+
+    def _candidate_keys(self) -> list[str]:
+        """Return the keys of all datapoints entities can be created for."""
+        return list(dict.fromkeys(self.datapoint_key(t) for t in self.topics.state))
+
+    @callback
+    def _async_start_discovery(self) -> None:
+        """Wait for the first message of every datapoint not known yet."""
+        assert self.discovery is not None
+        self.discovery.async_start(self.cached)
+        for key in self._candidate_keys():
+            if key not in self.discovery.seen:
+                self._discovery_routes[key] = self.dispatcher.async_register(
+                    f"{self._prefix}{key}",
+                    partial(
+                        self._async_discovery_received, key, self.payload_decoder(key)
+                    ),
+                )
+
+    async def _async_discover_transport(self) -> None:
+        """Read every datapoint once; those vcontrold can read are seen."""
+        assert self.discovery is not None and self.transport is not None
+        values = await self.transport.async_read(self._candidate_keys())
+        timestamp = dt_util.utcnow()
+        for key, payload in values.items():
+            if payload is not None:
+                self.cached[key] = ViessmannValue(
+                    self.payload_decoder(key)(payload), timestamp
+                )
+        self.discovery.async_start(self.cached)
+
+    @callback
+    def _async_discovery_received(
+        self, key: str, decode: Callable[[bytes], Any], message: ReceiveMessage
+    ) -> None:
+        """Keep the first value of a datapoint and announce it."""
+        try:
+            value = decode(message.payload)
+        except UnicodeDecodeError:
+            return
+        self._async_discovered(key, value, message.timestamp)
+
+    @callback
+    def _async_discovered(self, key: str, value: Any, timestamp: datetime) -> None:
+        """Record a datapoint seen for the first time."""
+        if (remove_route := self._discovery_routes.pop(key, None)) is not None:
+            remove_route()
+        if key not in self.data:
+            self.cached[key] = ViessmannValue(value, timestamp)
+            self.stale.discard(key)
+        assert self.discovery is not None
+        self.discovery.async_discovered(key)
+
+    @callback
+    def _async_check_stale(self, now: datetime | None) -> None:
+        """Mark cached values past the maximum age stale and re-arm the timer."""
+        self._unsub_stale = None
+        if now is None:
+            now = dt_util.utcnow()
+        max_age = timedelta(seconds=self.cache_max_age)
+        next_check: datetime | None = None
+        for key, datapoint in self.cached.items():
+            if key in self.stale:
+                continue
+            if (expires := datapoint.timestamp + max_age) <= now:
+                self.stale.add(key)
+                for stale_callback in self._stale_listeners.get(key, ()):
+                    stale_callback()
+            elif next_check is None or expires < next_check:
+                next_check = expires
+        if next_check is not None:
+            self._unsub_stale = async_track_point_in_utc_time(
+                self.hass, self._async_check_stale, next_check
+            )
+
+    def _cache_values(self) -> dict[str, tuple[Any, datetime]]:
+        """Return the values to persist, received ones over cached ones."""
+        return {
+            key: (datapoint.value, datapoint.timestamp)
+            for values in (self.cached, self.data)
+            for key, datapoint in values.items()
+        }
+
+    @callback
+    def _async_snapshot_received(self, message: ReceiveMessage) -> None:
+        """Store all values of a JSON snapshot, fanning out the changed ones."""
+        start = perf_counter()
+        stats = self.message_stats
+        stats.messages[SNAPSHOT_TOPIC] += 1
+        try:
+            snapshot = json_loads(message.payload)
+        except JSON_DECODE_EXCEPTIONS:
+            snapshot = None
+        if not isinstance(snapshot, dict):
+            stats.decode_errors[SNAPSHOT_TOPIC] += 1
+            _LOGGER.warning("Invalid snapshot on %s: %s", message.topic, message.payload)
+            return
+        handlers = self._handlers
+        messages = stats.messages
+        timestamp = message.timestamp
+        discovering = self._discovery_routes
+        for key, raw in snapshot.items():
+            if raw is None:
+                continue
+            if (handler := handlers.get(key)) is not None:
+                messages[key] += 1
+                handler(self.json_value_decoder(key)(raw), timestamp, False)
+            elif key in discovering:
+                self._async_discovered(
+                    key, self.json_value_decoder(key)(raw), timestamp
+                )
+        stats.callback_time.add(perf_counter() - start)
+
+    def _message_handler(
+        self, key: str, handler: ValueHandler
+    ) -> Callable[[ReceiveMessage], None]:
+        """Return the dispatcher callback decoding the messages of one key."""
+        decode = self.payload_decoder(key)
+        numeric = decode is decode_number
+        messages = self.message_stats.messages
+        decode_errors = self.message_stats.decode_errors
+        callback_time = self.message_stats.callback_time
+
+        def store(message: ReceiveMessage) -> None:
+            """Decode a message once and store it."""
+            try:
+                value = decode(message.payload)
+            except UnicodeDecodeError:
+                decode_errors[key] += 1
+                return
+            # Numeric topics fall back to text for payloads like "-- Error".
+            if numeric and value.__class__ is str:
+                decode_errors[key] += 1
+            handler(value, message.timestamp, True)
+
+        @callback
+        def message_received(message: ReceiveMessage) -> None:
+            """Count a message and store it, timing a sample of them."""
+            count = messages[key] + 1
+            messages[key] = count
+            if count & CALLBACK_TIME_SAMPLE_MASK:
+                store(message)
+                return
+            start = perf_counter()
+            store(message)
+            callback_time.add(perf_counter() - start)
+
+        return message_received
+
+    def _value_handler(self, key: str) -> ValueHandler:
+        """Return the callback storing the decoded values of one key."""
+        tracker = self.tracker
+        observe = self.scheduler.async_observe if self.scheduler is not None else None
+        cache = self.cache
+        availability = self.availability
+        unavailable = availability.unavailable
+        rolling = self.rolling
+        buckets = (
+            self.long_term.buckets.get(key) if self.long_term is not None else None
+        )
+        series = self.timeseries.get(key)
+
+        @callback
+        def value_received(
+            value: Any, timestamp: datetime, notify_unchanged: bool
+        ) -> None:
+            """Store a value and fan it out to all listeners."""
+            if value.__class__ is float:
+                if (window := rolling.get(key)) is not None:
+                    window.add(timestamp.timestamp(), value)
+                if buckets is not None:
+                    buckets.add(timestamp.timestamp(), value)
+                if series is not None:
+                    series.append(timestamp.timestamp(), value)
+            if (datapoint := self.data.get(key)) is None:
+                changed = True
+                datapoint = self.data[key] = ViessmannValue(value, timestamp)
+                # Received again, the cached value is history.
+                if self.cached.pop(key, None) is not None:
+                    self.stale.discard(key)
+                availability.async_track(key, timestamp)
+            else:
+                changed = datapoint.value != value
+                if observe is not None:
+                    observe(key, changed)
+                datapoint.value = value
+                datapoint.timestamp = timestamp
+                if key in unavailable:
+                    availability.async_seen(key, timestamp)
+                if not changed and not notify_unchanged:
+                    if key in tracker.pending:
+                        tracker.async_confirm(key, value)
+                    return
+            if cache is not None:
+                cache.async_schedule_save(self._cache_values)
+            if key in tracker.pending or key in tracker.unconfirmed:
+                tracker.async_confirm(key, value)
+            for update_callback in self._listeners.get(key, ()):
+                update_callback(datapoint)
+            if changed:
+                # Republished values only concern the entities.
+                for change_callback in self._change_listeners:
+                    change_callback(key, datapoint)
+
+        return value_received
@@ -1,27 +1,25 @@
 """The Viessmannmqtt component for controlling the Viessmann wallbox via home assistant / MQTT"""
 from __future__ import annotations
 
-import copy
+from datetime import datetime
 import logging
-from datetime import datetime,timedelta
-import re
 
-from homeassistant.components import mqtt
 from homeassistant.components.datetime import DOMAIN, DateTimeEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import slugify
 
-from .common import ViessmannBaseEntity
-
 # Import global values.
+from .common import ViessmannBaseEntity, async_add_viessmann_entities
 from .const import (
     DATETIMES,
+    DOMAIN as VIESSMANN_DOMAIN,
     MQTT_ROOT_TOPIC,
     ViessmannDatetimeEntityDescription,
 )
+from .coordinator import ViessmannCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,23 +30,22 @@ async def async_setup_entry(
     """Set up sensors for Viessmann."""
     integrationUniqueID = config.unique_id
     mqttRoot = config.data[MQTT_ROOT_TOPIC]
+    coordinator = hass.data[VIESSMANN_DOMAIN][config.entry_id]
 
     entities = []
     # Create all global sensors.
-    descriptions = copy.deepcopy(DATETIMES)
-    for description in descriptions:
-        description.mqttTopicCurrentValue = f"{mqttRoot}/{description.key}"
-        _LOGGER.debug("mqttTopic: %s", description.mqttTopicCurrentValue)
+    for description in DATETIMES:
         entities.append(
             ViessmannDatetimeEntity(
                 uniqueID=integrationUniqueID,
                 description=description,
                 device_friendly_name=integrationUniqueID,
                 mqtt_root=mqttRoot,
+                coordinator=coordinator,
             )
         )
 
-    async_add_entities(entities)
+    async_add_viessmann_entities(coordinator, entities, async_add_entities)
 
 
 class ViessmannDatetimeEntity(ViessmannBaseEntity, DateTimeEntity):
@@ -61,6 +58,7 @@ class ViessmannDatetimeEntity(ViessmannBaseEntity, DateTimeEntity):
         uniqueID: str | None,
         device_friendly_name: str,
         mqtt_root: str,
+        coordinator: ViessmannCoordinator,
         description: ViessmannDatetimeEntityDescription,
     ) -> None:
         """Initialize the sensor."""
@@ -69,52 +67,16 @@ class ViessmannDatetimeEntity(ViessmannBaseEntity, DateTimeEntity):
         super().__init__(
             device_friendly_name=device_friendly_name,
             mqtt_root=mqtt_root,
+            coordinator=coordinator,
         )
 
         self.entity_description = description
         self._attr_unique_id = slugify(f"{uniqueID}-{description.name}")
-        self.entity_id = f"{DOMAIN}.{uniqueID}_{description.name}".lower()
+        self.entity_id = f"{DOMAIN}.{slugify(uniqueID)}_{description.name}".lower()
         self._attr_name = description.name
-        self._attr_native_value = datetime.astimezone(datetime.now())
-
-    async def async_added_to_hass(self):
-        """Subscribe to MQTT events."""
-
-        @callback
-        def message_received(message):
-            """Handle new MQTT messages."""
-            try:
-                val = self.entity_description.value_fn(message.payload)
-                _LOGGER.debug(f"{val=}")
-                if not val is None and not self._attr_native_value is None and self.entity_description.name=='SystemTime':
-                    #_LOGGER.debug(f"{(val-self._attr_native_value)=} < {timedelta(seconds=60)=}")
-                    if (val-self._attr_native_value) < timedelta(seconds=60):
-                        _LOGGER.debug(f"omit update of 'SystemTime'")
-                        return
-                self._attr_native_value = val
-            except Exception as e:
-                _LOGGER.error(e)
-                self._attr_native_value = None
+        # Set from the cached or received value once added.
+        self._attr_native_value = None
 
-            # Update entity state with value published on MQTT.
-            self.async_write_ha_state()
-
-        await mqtt.async_subscribe(
-            self.hass,
-            self.entity_description.mqttTopicCurrentValue,
-            message_received,
-            1,
-        )
-        
     async def async_set_value(self, value: datetime) -> None:
         """Update the current value."""
-        
-        self._attr_native_value = value
-        
-        topic = f"{self.entity_description.mqttTopicCommand}"
-        _LOGGER.debug("MQTT topic: %s", topic)
-        payload = str(self.entity_description.ivalue_fn(self._attr_native_value))
-        _LOGGER.debug("MQTT payload: %s", payload)
-        await mqtt.async_publish(self.hass, topic, payload)
-        
-        # self.async_write_ha_state()
+        await self.async_send_command(self.entity_description.ivalue_fn(value))
@@ -0,0 +1,206 @@
+"""Payload decoders compiled from the Viessmann entity descriptions."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from functools import cache
+import logging
+from typing import Any
+
+from homeassistant.components.sensor import SensorDeviceClass
+
+from .const import (
+    ENTITY_DESCRIPTIONS,
+    ViessmannBinarySensorEntityDescription,
+    ViessmannDatetimeEntityDescription,
+    ViessmannNumberEntityDescription,
+    ViessmannSelectEntityDescription,
+    ViessmannSensorEntityDescription,
+)
+from .topics import state_key
+
+_LOGGER = logging.getLogger(__name__)
+
+PayloadDecoder = Callable[[bytes], Any]
+StateConverter = Callable[[Any], Any]
+
+# Upper bound of memoized states per description, enough for every mode list.
+MAX_TABLE_SIZE = 64
+
+
+def decode_number(payload: bytes) -> Any:
+    """Decode a numeric payload, falling back to text."""
+    try:
+        return float(payload)
+    except ValueError:
+        return payload.decode().strip()
+
+
+def decode_text(payload: bytes) -> str:
+    """Decode a text payload."""
+    return payload.decode().strip()
+
+
+def decode_json_number(value: Any) -> Any:
+    """Decode a JSON snapshot value of a numeric topic, falling back to text."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return str(value).strip()
+
+
+def decode_json_text(value: Any) -> str:
+    """Decode a JSON snapshot value of a text topic."""
+    return str(value).strip()
+
+
+def _is_text_description(description) -> bool:
+    """Return True if a description consumes its payload as text."""
+    if isinstance(description, ViessmannDatetimeEntityDescription):
+        return True
+    if isinstance(description, ViessmannSensorEntityDescription):
+        return description.device_class == SensorDeviceClass.ENUM
+    if isinstance(description, ViessmannSelectEntityDescription):
+        return description.value_fn is None and any(
+            isinstance(key, str) for key in description.valueMapCurrentValue
+        )
+    return False
+
+
+def compile_payload_decoder(descriptions: Iterable) -> PayloadDecoder:
+    """Return the decoder for a topic shared by the given descriptions.
+
+    Text topics skip the float attempt and the exception it would raise on
+    every message.
+    """
+    if any(_is_text_description(description) for description in descriptions):
+        return decode_text
+    return decode_number
+
+
+def compile_payload_decoders(descriptions: Iterable) -> dict[str, PayloadDecoder]:
+    """Return the payload decoder of every state topic, keyed by topic suffix."""
+    by_key: dict[str, list] = {}
+    for description in descriptions:
+        by_key.setdefault(state_key(description), []).append(description)
+    return {key: compile_payload_decoder(group) for key, group in by_key.items()}
+
+
+@cache
+def _payload_decoders() -> dict[str, PayloadDecoder]:
+    """Return the decoders of all state topics, shared by all config entries."""
+    return compile_payload_decoders(ENTITY_DESCRIPTIONS)
+
+
+def payload_decoder(key: str) -> PayloadDecoder:
+    """Return the shared payload decoder of a topic suffix."""
+    return _payload_decoders().get(key, decode_number)
+
+
+def compile_json_value_decoders(
+    decoders: dict[str, PayloadDecoder],
+) -> dict[str, Callable[[Any], Any]]:
+    """Return the JSON snapshot value decoders matching payload decoders."""
+    return {
+        key: decode_json_text if decoder is decode_text else decode_json_number
+        for key, decoder in decoders.items()
+    }
+
+
+@cache
+def _json_value_decoders() -> dict[str, Callable[[Any], Any]]:
+    """Return the JSON snapshot value decoders of all state topics."""
+    return compile_json_value_decoders(_payload_decoders())
+
+
+def json_value_decoder(key: str) -> Callable[[Any], Any]:
+    """Return the decoder of a topic suffix's values in a JSON snapshot."""
+    return _json_value_decoders().get(key, decode_json_number)
+
+
+def _tabled(convert: StateConverter) -> StateConverter:
+    """Memoize a converter for datapoints with a small set of values."""
+    table: dict[Any, Any] = {}
+
+    def lookup(value: Any) -> Any:
+        try:
+            return table[value]
+        except KeyError:
+            pass
+        state = convert(value)
+        if len(table) < MAX_TABLE_SIZE:
+            table[value] = state
+        return state
+
+    return lookup
+
+
+def _compile_sensor(description: ViessmannSensorEntityDescription) -> StateConverter:
+    value_fn = description.value_fn
+    value_map = description.valueMap
+    if value_map is not None:
+        if value_fn is None:
+            return _tabled(value_map.get)
+        return _tabled(lambda value: value_map.get(value_fn(value)))
+    if value_fn is None:
+        return lambda value: value
+    return value_fn
+
+
+def _compile_binary_sensor(
+    description: ViessmannBinarySensorEntityDescription,
+) -> StateConverter:
+    return lambda value: bool(float(value))
+
+
+def _compile_number(description: ViessmannNumberEntityDescription) -> StateConverter:
+    value_fn = description.value_fn
+    return lambda value: value_fn(float(value))
+
+
+def _compile_select(description: ViessmannSelectEntityDescription) -> StateConverter:
+    value_fn = description.value_fn
+    value_map = description.valueMapCurrentValue
+
+    def convert(value: Any) -> Any:
+        try:
+            if value_fn is not None:
+                value = value_fn(value)
+            return value_map.get(value)
+        except ValueError as e:
+            _LOGGER.error(e)
+            return None
+
+    return _tabled(convert)
+
+
+def _compile_datetime(
+    description: ViessmannDatetimeEntityDescription,
+) -> StateConverter:
+    value_fn = description.value_fn
+
+    def convert(value: Any) -> Any:
+        try:
+            return value_fn(value)
+        except Exception as e:
+            _LOGGER.error(e)
+            return None
+
+    return convert
+
+
+_COMPILERS: dict[type, Callable[[Any], StateConverter]] = {
+    ViessmannSensorEntityDescription: _compile_sensor,
+    ViessmannBinarySensorEntityDescription: _compile_binary_sensor,
+    ViessmannNumberEntityDescription: _compile_number,
+    ViessmannSelectEntityDescription: _compile_select,
+    ViessmannDatetimeEntityDescription: _compile_datetime,
+}
+
+
+def compile_state_converter(description) -> StateConverter:
+    """Return a function converting a decoded value into the entity state.
+
+    The description's value_fn and value map are bound once, so the hot path
+    does no attribute lookups or branching on optional fields.
+    """
+    return _COMPILERS[type(description)](description)
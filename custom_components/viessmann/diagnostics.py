@@ -0,0 +1,47 @@
+"""Diagnostics support for Viessmann."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from time import perf_counter
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import ViessmannCoordinator
+
+TO_REDACT = {CONF_HOST, CONF_PASSWORD, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the performance counters of a config entry."""
+    coordinator: ViessmannCoordinator = hass.data[DOMAIN][entry.entry_id]
+    tracker = coordinator.tracker
+    diagnostics: dict[str, Any] = {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "messages": coordinator.message_stats.as_dict(perf_counter()),
+        "state_writes": asdict(coordinator.write_stats),
+        "commands": asdict(coordinator.commands.stats),
+        "command_round_trips": {
+            **asdict(tracker.stats),
+            "latency": tracker.latency.as_dict(),
+            "pending": sorted(tracker.pending),
+            "unconfirmed": dict(tracker.unconfirmed),
+        },
+    }
+    if (scheduler := coordinator.scheduler) is not None:
+        diagnostics["polling"] = {
+            **asdict(scheduler.stats),
+            "intervals": dict(scheduler.intervals),
+        }
+    if (transport := coordinator.transport) is not None:
+        diagnostics["transport"] = asdict(transport.stats)
+    return diagnostics
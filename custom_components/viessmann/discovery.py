@@ -0,0 +1,87 @@
+"""Datapoint discovery for the Viessmann integration."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from datetime import datetime
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds datapoints discovered after the window are collected before they
+# are announced, so a poll cycle adds its entities in one go.
+DISCOVERY_BATCH_DELAY = 2.0
+
+DiscoveryCallback = Callable[[list[str]], None]
+
+
+class ViessmannDiscovery:
+    """Track the datapoints vcontrold actually publishes.
+
+    Datapoints known from the start are announced right away. Those seen
+    during the discovery window are collected and announced together when
+    it closes; any seen later are announced in small batches.
+    """
+
+    def __init__(self, hass: HomeAssistant, window: float) -> None:
+        """Initialize discovery with a window in seconds."""
+        self.hass = hass
+        self.window = window
+        self.seen: set[str] = set()
+        self._pending: list[str] = []
+        self._listeners: tuple[DiscoveryCallback, ...] = ()
+        self._unsub_flush: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self, known: Iterable[str]) -> None:
+        """Mark known datapoints as seen and open the discovery window."""
+        self.seen.update(known)
+        self._unsub_flush = async_call_later(self.hass, self.window, self._async_flush)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop announcing datapoints."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        self._pending.clear()
+        self._listeners = ()
+
+    @callback
+    def async_add_listener(self, discovery_callback: DiscoveryCallback) -> CALLBACK_TYPE:
+        """Call discovery_callback with every batch of discovered datapoints."""
+        self._listeners += (discovery_callback,)
+
+        @callback
+        def async_remove() -> None:
+            """Remove the listener."""
+            self._listeners = tuple(
+                cb for cb in self._listeners if cb is not discovery_callback
+            )
+
+        return async_remove
+
+    @callback
+    def async_discovered(self, key: str) -> None:
+        """Record a datapoint seen for the first time."""
+        if key in self.seen:
+            return
+        self.seen.add(key)
+        self._pending.append(key)
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self.hass, DISCOVERY_BATCH_DELAY, self._async_flush
+            )
+
+    @callback
+    def _async_flush(self, _now: datetime) -> None:
+        """Announce the datapoints discovered since the last batch."""
+        self._unsub_flush = None
+        if not self._pending:
+            return
+        keys, self._pending = self._pending, []
+        _LOGGER.debug("Discovered datapoints %s", keys)
+        for discovery_callback in self._listeners:
+            discovery_callback(keys)
@@ -0,0 +1,98 @@
+"""Topic-indexed MQTT dispatcher for the Viessmann integration."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+
+from homeassistant.components import mqtt
+from homeassistant.components.mqtt.models import ReceiveMessage
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_DISPATCHER = f"{DOMAIN}_dispatcher"
+
+MessageCallback = Callable[[ReceiveMessage], None]
+
+
+class ViessmannDispatcher:
+    """Route the messages of the root wildcard subscriptions to callbacks.
+
+    vcontrold publishes every datapoint below a common root topic. Instead of
+    one MQTT subscription per entity, a single `<root>/#` subscription is made
+    per root and each message is looked up by its topic. One dispatcher is
+    shared by all config entries, so routing stays a single dict lookup no
+    matter how many heaters are configured. Payloads are passed on as raw
+    bytes and decoded by the receiver.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the dispatcher."""
+        self.hass = hass
+        # Tuples are replaced on (un)registration so routing never copies.
+        self._callbacks: dict[str, tuple[MessageCallback, ...]] = {}
+        self._roots: dict[str, CALLBACK_TYPE] = {}
+
+    @property
+    def roots(self) -> list[str]:
+        """Return the subscribed root topics."""
+        return list(self._roots)
+
+    async def async_add_root(self, mqtt_root: str) -> None:
+        """Subscribe to all topics below a root topic."""
+        if mqtt_root in self._roots:
+            return
+        self._roots[mqtt_root] = await mqtt.async_subscribe(
+            self.hass,
+            f"{mqtt_root}/#",
+            self.async_message_received,
+            1,
+            encoding=None,
+        )
+        _LOGGER.debug("Subscribed to %s/#", mqtt_root)
+
+    @callback
+    def async_remove_root(self, mqtt_root: str) -> None:
+        """Drop the wildcard subscription of a root topic."""
+        if (unsubscribe := self._roots.pop(mqtt_root, None)) is not None:
+            unsubscribe()
+
+    @callback
+    def async_register(self, topic: str, msg_callback: MessageCallback) -> CALLBACK_TYPE:
+        """Register a callback for a full topic.
+
+        Returns a callable which removes the registration again.
+        """
+        self._callbacks[topic] = self._callbacks.get(topic, ()) + (msg_callback,)
+
+        @callback
+        def async_remove() -> None:
+            """Remove the callback."""
+            remaining = tuple(
+                cb for cb in self._callbacks.get(topic, ()) if cb is not msg_callback
+            )
+            if remaining:
+                self._callbacks[topic] = remaining
+            else:
+                self._callbacks.pop(topic, None)
+
+        return async_remove
+
+    @callback
+    def async_message_received(self, message: ReceiveMessage) -> None:
+        """Route a message to the callbacks registered for its topic."""
+        callbacks = self._callbacks.get(message.topic)
+        if callbacks is None:
+            return
+        for msg_callback in callbacks:
+            msg_callback(message)
+
+
+@callback
+def async_get_dispatcher(hass: HomeAssistant) -> ViessmannDispatcher:
+    """Return the dispatcher shared by all Viessmann config entries."""
+    if (dispatcher := hass.data.get(DATA_DISPATCHER)) is None:
+        dispatcher = hass.data[DATA_DISPATCHER] = ViessmannDispatcher(hass)
+    return dispatcher
@@ -0,0 +1,214 @@
+"""Online heating curve estimation for the Viessmann integration."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Seconds a changed fit may wait before it is written.
+CURVE_SAVE_DELAY = 600
+
+# Datapoint keys of the outside, flow, target flow and room temperatures.
+CURVE_OUTSIDE = "getTempA"
+CURVE_FLOW = "getTempVListM1"
+CURVE_FLOW_TARGET = "getTempVLsollM1"
+CURVE_ROOM_TARGET = "getTempRaumNorSollM1"
+CURVE_DATAPOINTS = (CURVE_OUTSIDE, CURVE_FLOW, CURVE_FLOW_TARGET, CURVE_ROOM_TARGET)
+# Room setpoint until the heater reports one.
+DEFAULT_ROOM_TARGET = 20.0
+
+# Samples are taken at a fixed interval so steady weather is not weighted
+# by how often values change, and only from values younger than the
+# maximum age.
+SAMPLE_INTERVAL = timedelta(minutes=5)
+SAMPLE_MAX_AGE = 3600.0
+# A fit needs this many samples' weight before it is reported.
+MIN_WEIGHT = 12.0
+
+
+def curve_feature(outside: float, room: float) -> float:
+    """Return the outside term of the Viessmann heating curve.
+
+    The controller sets the flow temperature to room + level - slope * g
+    with g of the difference of outside and room temperature, so flow
+    minus room is linear in -g with the slope and level as coefficients.
+    """
+    delta = outside - room
+    return -delta * (1.4347 + 0.021 * delta + 247.9e-6 * delta * delta)
+
+
+class ViessmannCurveFit:
+    """Weighted least squares line fit with exponential forgetting.
+
+    Only the weighted sums of the samples are kept; every sample decays
+    them by the forgetting factor before it is added.
+    """
+
+    __slots__ = ("weight", "sx", "sy", "sxx", "sxy", "syy")
+
+    def __init__(self, sums: list[float] | None = None) -> None:
+        """Initialize the fit, from stored sums if given."""
+        (
+            self.weight,
+            self.sx,
+            self.sy,
+            self.sxx,
+            self.sxy,
+            self.syy,
+        ) = sums or (0.0,) * 6
+
+    @property
+    def sums(self) -> list[float]:
+        """Return the sufficient statistics of the fit."""
+        return [self.weight, self.sx, self.sy, self.sxx, self.sxy, self.syy]
+
+    def add(self, x: float, y: float, forget: float = 1.0) -> None:
+        """Add a sample after decaying the earlier ones by forget."""
+        self.weight = self.weight * forget + 1.0
+        self.sx = self.sx * forget + x
+        self.sy = self.sy * forget + y
+        self.sxx = self.sxx * forget + x * x
+        self.sxy = self.sxy * forget + x * y
+        self.syy = self.syy * forget + y * y
+
+    def _moments(self) -> tuple[float, float, float] | None:
+        """Return the weighted variances of x and y and their covariance."""
+        if self.weight < MIN_WEIGHT:
+            return None
+        weight = self.weight
+        var_x = self.sxx / weight - (self.sx / weight) ** 2
+        if var_x <= 1e-6:
+            # All samples at one outside temperature fix no slope.
+            return None
+        var_y = self.syy / weight - (self.sy / weight) ** 2
+        cov = self.sxy / weight - self.sx * self.sy / (weight * weight)
+        return var_x, max(var_y, 0.0), cov
+
+    @property
+    def slope(self) -> float | None:
+        """Return the slope of the fitted line."""
+        if (moments := self._moments()) is None:
+            return None
+        var_x, _, cov = moments
+        return cov / var_x
+
+    @property
+    def intercept(self) -> float | None:
+        """Return the value of the fitted line at x = 0."""
+        if (slope := self.slope) is None:
+            return None
+        return (self.sy - slope * self.sx) / self.weight
+
+    @property
+    def r_squared(self) -> float | None:
+        """Return the share of the variance of y the line explains."""
+        if (moments := self._moments()) is None:
+            return None
+        var_x, var_y, cov = moments
+        if var_y <= 1e-9:
+            return 1.0
+        return min(cov * cov / (var_x * var_y), 1.0)
+
+
+class ViessmannHeatingCurve:
+    """Estimate the heating curve of circuit M1 from its temperatures.
+
+    Every sample interval, the latest outside and room setpoint temperatures
+    are paired with the target and the actual flow temperature, each
+    feeding a fit of its own: the target one recovers the curve the
+    controller is set to, the actual one the curve the circuit achieves.
+    Samples are skipped while the circuit does not heat, that is while the
+    target flow is not above the room setpoint. With a half-life, older
+    samples fade so the fit follows changes of the settings. The sums are
+    saved across restarts.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, half_life: float) -> None:
+        """Initialize the estimator with a half-life in seconds, 0 for none."""
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.heating_curve"
+        )
+        self._dirty = False
+        self.forget = (
+            0.5 ** (SAMPLE_INTERVAL.total_seconds() / half_life) if half_life else 1.0
+        )
+        self.fits = {"target": ViessmannCurveFit(), "actual": ViessmannCurveFit()}
+        self._last_value: Callable[[str], Any] | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    async def async_load(self) -> None:
+        """Restore the sums of the fits."""
+        stored = await self._store.async_load() or {}
+        for name, sums in stored.get("fits", {}).items():
+            if name in self.fits and len(sums) == 6:
+                self.fits[name] = ViessmannCurveFit(sums)
+
+    async def async_remove(self) -> None:
+        """Delete the stored fits."""
+        await self._store.async_remove()
+
+    @callback
+    def async_start(self, last_value: Callable[[str], Any]) -> None:
+        """Start sampling the values last_value returns by datapoint key."""
+        self._last_value = last_value
+        self._unsub_timer = async_track_time_interval(
+            self.hass, self._async_sample, SAMPLE_INTERVAL
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop sampling."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    def _latest(self, key: str, now: float) -> float | None:
+        """Return the value of key unless it is too old or not a number."""
+        assert self._last_value is not None
+        if (datapoint := self._last_value(key)) is None:
+            return None
+        if datapoint.value.__class__ is not float:
+            return None
+        if now - datapoint.timestamp.timestamp() > SAMPLE_MAX_AGE:
+            return None
+        return datapoint.value
+
+    @callback
+    def _async_sample(self, now: datetime) -> None:
+        """Add the latest temperatures to the fits."""
+        timestamp = now.timestamp()
+        if (outside := self._latest(CURVE_OUTSIDE, timestamp)) is None:
+            return
+        room = self._latest(CURVE_ROOM_TARGET, timestamp) or DEFAULT_ROOM_TARGET
+        target = self._latest(CURVE_FLOW_TARGET, timestamp)
+        if target is None or target <= room:
+            return
+        x = curve_feature(outside, room)
+        self.fits["target"].add(x, target - room, self.forget)
+        if (flow := self._latest(CURVE_FLOW, timestamp)) is not None:
+            self.fits["actual"].add(x, flow - room, self.forget)
+        self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save the fits within the save delay."""
+        if self._dirty:
+            return
+        self._dirty = True
+
+        def _data_to_save() -> dict[str, Any]:
+            self._dirty = False
+            return {"fits": {name: fit.sums for name, fit in self.fits.items()}}
+
+        self._store.async_delay_save(_data_to_save, CURVE_SAVE_DELAY)
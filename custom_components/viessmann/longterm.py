@@ -0,0 +1,201 @@
+"""Long-term statistics of datapoints aggregated by the Viessmann integration."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+import math
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Samples are collected in buckets of five minutes, which are merged into
+# the hourly rows of the recorder's long-term statistics.
+BUCKET_SECONDS = 300
+HOUR_SECONDS = 3600
+
+
+@dataclass(slots=True)
+class ViessmannBucket:
+    """Mean, minimum and maximum of the samples of one period."""
+
+    start: float
+    count: int = 0
+    total: float = 0.0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other: ViessmannBucket) -> None:
+        """Add the samples of a shorter period."""
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def mean(self) -> float:
+        """Return the mean of the samples."""
+        return self.total / self.count
+
+    def as_statistic(self) -> dict[str, Any]:
+        """Return the bucket as a row of the recorder's statistics."""
+        return {
+            "start": dt_util.utc_from_timestamp(self.start),
+            "mean": self.mean,
+            "min": self.minimum,
+            "max": self.maximum,
+        }
+
+
+class ViessmannBuckets:
+    """Five-minute and hourly buckets of one datapoint.
+
+    Only the open five-minute bucket and the hour it belongs to are kept,
+    plus hours completed since they were last taken. The hour open when
+    collecting started lacks the samples before it and is never taken, so
+    the row imported before a restart is not replaced by a partial one.
+    """
+
+    __slots__ = ("started", "bucket", "hour", "completed", "changed")
+
+    def __init__(self, started: float) -> None:
+        """Initialize empty buckets collecting from a POSIX timestamp on."""
+        self.started = started
+        self.bucket: ViessmannBucket | None = None
+        self.hour: ViessmannBucket | None = None
+        self.completed: list[ViessmannBucket] = []
+        self.changed = False
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample taken at a POSIX timestamp."""
+        start = timestamp - timestamp % BUCKET_SECONDS
+        if (bucket := self.bucket) is None or bucket.start != start:
+            if bucket is not None:
+                self._close()
+            bucket = self.bucket = ViessmannBucket(start)
+        bucket.add(value)
+
+    def close(self, now: float) -> None:
+        """Close the open bucket once its period has passed."""
+        if self.bucket is not None and self.bucket.start + BUCKET_SECONDS <= now:
+            self._close()
+
+    def take(self) -> list[ViessmannBucket]:
+        """Return the hours changed since the last call, the open one last."""
+        hours = self.completed
+        self.completed = []
+        if self.hour is not None and self.hour.start >= self.started:
+            hours.append(self.hour)
+        self.changed = False
+        return hours
+
+    def _close(self) -> None:
+        """Merge the open five-minute bucket into its hour."""
+        bucket = self.bucket
+        assert bucket is not None
+        self.bucket = None
+        start = bucket.start - bucket.start % HOUR_SECONDS
+        if (hour := self.hour) is None or hour.start != start:
+            if hour is not None and hour.start >= self.started:
+                self.completed.append(hour)
+            hour = self.hour = ViessmannBucket(start)
+        hour.merge(bucket)
+        if start >= self.started:
+            self.changed = True
+
+
+class ViessmannLongTermStatistics:
+    """Import hourly mean, minimum and maximum of datapoints into the recorder.
+
+    The coordinator adds every sample of the chosen datapoints. Every five
+    minutes the passed buckets are merged into their hour, and the hours
+    changed since are imported as external statistics `viessmann:<root>_<key>`.
+    The open hour is imported again as it fills up, the recorder replaces
+    rows of the same start. The recorder only imports hourly rows; its
+    five-minute short-term statistics are compiled from the states of
+    entities and cannot be imported, so the five-minute buckets only pace
+    these updates.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, mqtt_root: str, descriptions: Iterable[Any]
+    ) -> None:
+        """Initialize the statistics of the described datapoints."""
+        self.hass = hass
+        self.buckets: dict[str, ViessmannBuckets] = {}
+        self.metadata: dict[str, dict[str, Any]] = {}
+        started = dt_util.utcnow().timestamp()
+        for description in descriptions:
+            self.buckets[description.key] = ViessmannBuckets(started)
+            self.metadata[description.key] = {
+                "has_mean": True,
+                "has_sum": False,
+                "name": f"{mqtt_root} {description.name}",
+                "source": DOMAIN,
+                "statistic_id": (
+                    f"{DOMAIN}:{slugify(mqtt_root)}_{description.key.lower()}"
+                ),
+                "unit_of_measurement": description.native_unit_of_measurement,
+            }
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start importing every five minutes."""
+        self._unsub_timer = async_track_time_interval(
+            self.hass, self._async_import, timedelta(seconds=BUCKET_SECONDS)
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Import what was collected and stop."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        for buckets in self.buckets.values():
+            if buckets.bucket is not None:
+                buckets.close(math.inf)
+        self._async_import(None)
+
+    @callback
+    def _async_import(self, now: datetime | None) -> None:
+        """Close the passed buckets and import the changed hours."""
+        if now is not None:
+            timestamp = now.timestamp()
+            for buckets in self.buckets.values():
+                buckets.close(timestamp)
+        changed = [
+            (key, buckets.take())
+            for key, buckets in self.buckets.items()
+            if buckets.changed
+        ]
+        if not changed or "recorder" not in self.hass.config.components:
+            return
+        # The recorder is optional, only import it when it is running.
+        from homeassistant.components.recorder.statistics import (  # pylint: disable=import-outside-toplevel
+            async_add_external_statistics,
+        )
+
+        for key, hours in changed:
+            _LOGGER.debug("Importing %d hours of %s", len(hours), key)
+            async_add_external_statistics(
+                self.hass,
+                self.metadata[key],
+                [hour.as_statistic() for hour in hours],
+            )
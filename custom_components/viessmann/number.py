@@ -1,29 +1,28 @@
 from __future__ import annotations
 
-import copy
 from dataclasses import dataclass
 import logging
 from os import device_encoding, stat
 
 from sqlalchemy import desc
 
-from homeassistant.components import mqtt
 from homeassistant.components.number import DOMAIN, NumberEntity, NumberMode
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.util import slugify
 
-from .common import ViessmannBaseEntity
-
 # Import global values.
+from .common import ViessmannBaseEntity, async_add_viessmann_entities
 from .const import (
+    DOMAIN as VIESSMANN_DOMAIN,
     MQTT_ROOT_TOPIC,
     NUMBERS,
     ViessmannNumberEntityDescription,
 )
+from .coordinator import ViessmannCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,25 +33,23 @@ async def async_setup_entry(
     """Set up sensors for Viessmann."""
     integrationUniqueID = config.unique_id
     mqttRoot = config.data[MQTT_ROOT_TOPIC]
+    coordinator = hass.data[VIESSMANN_DOMAIN][config.entry_id]
 
     numberList = []
 
-    NUMBERS_COPY = copy.deepcopy(NUMBERS)
-    for description in NUMBERS_COPY:
-        description.mqttTopicCommand = f"{mqttRoot}/{description.mqttTopicCommand}"
-        description.mqttTopicCurrentValue = f"{mqttRoot}/{description.mqttTopicCurrentValue}"
-
+    for description in NUMBERS:
         numberList.append(
             ViessmannNumber(
                 unique_id=integrationUniqueID,
                 description=description,
                 device_friendly_name=integrationUniqueID,
                 mqtt_root=mqttRoot,
+                coordinator=coordinator,
                 # state=description.min_value,
             )
         )
 
-    async_add_entities(numberList)
+    async_add_viessmann_entities(coordinator, numberList, async_add_entities)
 
 
 class ViessmannNumber(ViessmannBaseEntity, NumberEntity):
@@ -65,6 +62,7 @@ class ViessmannNumber(ViessmannBaseEntity, NumberEntity):
         unique_id: str,
         device_friendly_name: str,
         mqtt_root: str,
+        coordinator: ViessmannCoordinator,
         description: ViessmannNumberEntityDescription,
         state: float | None = None,
         native_min_value: float | None = None,
@@ -76,12 +74,13 @@ class ViessmannNumber(ViessmannBaseEntity, NumberEntity):
         super().__init__(
             device_friendly_name=device_friendly_name,
             mqtt_root=mqtt_root,
+            coordinator=coordinator,
         )
 
         self.entity_description = description
 
         self._attr_unique_id = slugify(f"{unique_id}-{description.name}")
-        self.entity_id = f"{DOMAIN}.{unique_id}_{description.name}".lower()
+        self.entity_id = f"{DOMAIN}.{slugify(unique_id)}_{description.name}".lower()
         self._attr_name = description.name
 
         # if state is not None:
@@ -98,35 +97,10 @@ class ViessmannNumber(ViessmannBaseEntity, NumberEntity):
         if native_step is not None:
             self._attr_native_step = native_step
 
-    async def async_added_to_hass(self):
-        """Subscribe to MQTT events."""
-
-        @callback
-        def message_received(message):
-            """Handle new MQTT messages."""
-            self._attr_native_value = self.entity_description.value_fn(float(message.payload))
-            self.async_write_ha_state()
-
-        # Subscribe to MQTT topic and connect callack message
-        await mqtt.async_subscribe(
-            self.hass,
-            self.entity_description.mqttTopicCurrentValue,
-            message_received,
-            1,
-        )
-
     async def async_set_native_value(self, value):
         """Update the current value.
         After set_value --> the result is published to MQTT.
         But the HA sensor shall only change when the MQTT message on the /get/ topic is received.
         Only then, Viessmann has changed the setting as well.
         """
-        self._attr_native_value = value
-        
-        topic = f"{self.entity_description.mqttTopicCommand}"
-        _LOGGER.debug("MQTT topic: %s", topic)
-        payload = str(self.entity_description.ivalue_fn(self._attr_native_value))
-        _LOGGER.debug("MQTT payload: %s", payload)
-        await mqtt.async_publish(self.hass, topic, payload)
-        
-        # self.async_write_ha_state()
+        await self.async_send_command(self.entity_description.ivalue_fn(value))
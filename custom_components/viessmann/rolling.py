@@ -0,0 +1,135 @@
+"""Rolling window statistics for the Viessmann integration."""
+from __future__ import annotations
+
+from array import array
+from collections import deque
+import math
+
+# Samples kept per window at most; older ones are dropped first.
+ROLLING_WINDOW_SIZE = 2048
+
+
+class ViessmannRollingWindow:
+    """Mean, minimum, maximum and standard deviation of recent samples.
+
+    Samples sit in two preallocated arrays used as one ring buffer, indexed
+    by a running sequence number. Sums are updated as samples enter and
+    leave; they are taken of the difference to the first sample, which
+    keeps the variance of nearly constant samples from cancelling out. The
+    minimum and maximum come from monotonic queues of sequence numbers, so
+    adding a sample and reading any statistic is O(1) amortized. Samples
+    leave once they are older than the window or the ring is full.
+    """
+
+    __slots__ = (
+        "window",
+        "size",
+        "_times",
+        "_values",
+        "_start",
+        "_end",
+        "_shift",
+        "_sum",
+        "_sum_sq",
+        "_min",
+        "_max",
+    )
+
+    def __init__(self, window: float, size: int = ROLLING_WINDOW_SIZE) -> None:
+        """Initialize a window of the given seconds."""
+        self.window = window
+        self.size = size
+        self._times = array("d", bytes(8 * size))
+        self._values = array("d", bytes(8 * size))
+        # Sequence numbers of the oldest sample and past the newest.
+        self._start = 0
+        self._end = 0
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        # Sequence numbers of increasing and decreasing values.
+        self._min: deque[int] = deque()
+        self._max: deque[int] = deque()
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        return self._end - self._start
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample taken at a POSIX timestamp."""
+        size = self.size
+        if self._end - self._start == size:
+            self._drop()
+        values = self._values
+        seq = self._end
+        self._times[seq % size] = timestamp
+        values[seq % size] = value
+        if seq == self._start:
+            self._shift = value
+        delta = value - self._shift
+        self._sum += delta
+        self._sum_sq += delta * delta
+        minimum = self._min
+        while minimum and values[minimum[-1] % size] >= value:
+            minimum.pop()
+        minimum.append(seq)
+        maximum = self._max
+        while maximum and values[maximum[-1] % size] <= value:
+            maximum.pop()
+        maximum.append(seq)
+        self._end = seq + 1
+
+    def expire(self, now: float) -> None:
+        """Drop the samples older than the window."""
+        cutoff = now - self.window
+        times = self._times
+        size = self.size
+        while self._start < self._end and times[self._start % size] <= cutoff:
+            self._drop()
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the samples."""
+        if not (count := self._end - self._start):
+            return None
+        return self._shift + self._sum / count
+
+    @property
+    def minimum(self) -> float | None:
+        """Return the smallest sample."""
+        if not self._min:
+            return None
+        return self._values[self._min[0] % self.size]
+
+    @property
+    def maximum(self) -> float | None:
+        """Return the largest sample."""
+        if not self._max:
+            return None
+        return self._values[self._max[0] % self.size]
+
+    @property
+    def stddev(self) -> float | None:
+        """Return the sample standard deviation."""
+        if (count := self._end - self._start) < 2:
+            return None
+        variance = (self._sum_sq - self._sum * self._sum / count) / (count - 1)
+        # Rounding may leave a tiny negative variance.
+        return math.sqrt(max(variance, 0.0))
+
+    def _drop(self) -> None:
+        """Drop the oldest sample."""
+        seq = self._start
+        value = self._values[seq % self.size]
+        self._start = seq + 1
+        if self._start == self._end:
+            # Start over to shed rounding errors of the running sums.
+            self._sum = self._sum_sq = 0.0
+        else:
+            delta = value - self._shift
+            self._sum -= delta
+            self._sum_sq -= delta * delta
+        if self._min[0] == seq:
+            self._min.popleft()
+        if self._max[0] == seq:
+            self._max.popleft()
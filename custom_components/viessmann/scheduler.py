@@ -0,0 +1,176 @@
+"""Adaptive datapoint poll scheduler for the Viessmann integration."""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_at
+
+from .const import DEFAULT_SCAN_INTERVAL, ENTITY_DESCRIPTIONS
+from .throttle import TIMER_TOLERANCE
+from .topics import state_key
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bounds of the adaptive interval relative to the base interval.
+MIN_INTERVAL_FACTOR = 0.25
+MAX_INTERVAL_FACTOR = 8.0
+# Interval factors applied after a changed and after an unchanged value.
+TIGHTEN_FACTOR = 0.5
+BACK_OFF_FACTOR = 1.5
+# Seconds of unused read budget that may be saved up for a burst.
+BURST_SECONDS = 5.0
+
+
+
+def base_intervals(descriptions: Iterable) -> dict[str, float]:
+    """Return the base poll interval of every datapoint in seconds.
+
+    Datapoints read by several descriptions are polled at the shortest of
+    their intervals.
+    """
+    intervals: dict[str, float] = {}
+    for description in descriptions:
+        interval = (description.poll_interval or DEFAULT_SCAN_INTERVAL).total_seconds()
+        key = state_key(description)
+        intervals[key] = min(interval, intervals.get(key, interval))
+    return intervals
+
+
+BASE_INTERVALS = base_intervals(ENTITY_DESCRIPTIONS)
+
+# Requests a batch of datapoint reads.
+ReadCallback = Callable[[list[str]], Awaitable[None]]
+
+
+@dataclass
+class ViessmannPollStats:
+    """Counters of the reads requested by the scheduler."""
+
+    reads: int = 0
+    batches: int = 0
+    deferred: int = 0
+
+
+class ViessmannPollScheduler:
+    """Own the read cadence of all datapoints of an entry.
+
+    Every datapoint starts at its base interval. The interval halves while
+    the value keeps changing and grows while it stays the same, within
+    fixed factors of the base. Reads due at the same time are requested as
+    one batch, and a token bucket caps the reads per second so the Optolink
+    bus is never flooded; reads over budget wait for the next tokens, the
+    most overdue first. All datapoints share one timer.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        read: ReadCallback,
+        budget: float,
+        base_intervals: dict[str, float] = BASE_INTERVALS,
+    ) -> None:
+        """Initialize the scheduler with a budget in reads per second."""
+        self.hass = hass
+        self.read = read
+        self.budget = budget
+        self.stats = ViessmannPollStats()
+        self.intervals = dict(base_intervals)
+        self._base = base_intervals
+        self._capacity = max(1.0, budget * BURST_SECONDS)
+        self._tokens = self._capacity
+        self._refilled = 0.0
+        self._due: dict[str, float] = {}
+        self._requested: dict[str, float] = {}
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._timer_due: float | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Read every datapoint once, then keep polling."""
+        now = self.hass.loop.time()
+        self._refilled = now
+        self._due = dict.fromkeys(self._base, now)
+        self._async_schedule(now)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop polling."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+            self._timer_due = None
+        self._due.clear()
+
+    @callback
+    def async_observe(self, key: str, changed: bool) -> None:
+        """Adapt the interval of key to a newly received value."""
+        if (base := self._base.get(key)) is None or key not in self._due:
+            return
+        interval = self.intervals[key]
+        if changed:
+            interval = max(base * MIN_INTERVAL_FACTOR, interval * TIGHTEN_FACTOR)
+        else:
+            interval = min(base * MAX_INTERVAL_FACTOR, interval * BACK_OFF_FACTOR)
+        self.intervals[key] = interval
+        due = self._requested.get(key, self.hass.loop.time()) + interval
+        self._due[key] = due
+        self._async_schedule(due)
+
+    async def _async_read(self, batch: list[str]) -> None:
+        """Request a batch of reads, logging a failure.
+
+        The read callback marks the bridge offline when vcontrold cannot be
+        reached; the datapoints are requested again when they are next due.
+        """
+        try:
+            await self.read(batch)
+        except HomeAssistantError as err:
+            _LOGGER.debug("Requesting %s failed: %s", ", ".join(batch), err)
+
+    @callback
+    def _async_schedule(self, due: float) -> None:
+        """Make sure the shared timer fires no later than due."""
+        if self._timer_due is not None and self._timer_due <= due:
+            return
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+        self._timer_due = due
+        self._unsub_timer = async_call_at(self.hass, self._async_poll_due, due)
+
+    @callback
+    def _async_poll_due(self, _now) -> None:
+        """Request the due reads the budget allows and re-arm the timer."""
+        # The timer only fires once its due time has been reached.
+        now = max(self.hass.loop.time(), self._timer_due or 0.0)
+        self._unsub_timer = None
+        self._timer_due = None
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._refilled) * self.budget
+        )
+        self._refilled = now
+
+        due = sorted(
+            (due, key)
+            for key, due in self._due.items()
+            if due <= now + TIMER_TOLERANCE
+        )
+        batch = [key for _, key in due[: int(self._tokens)]]
+        if batch:
+            self._tokens -= len(batch)
+            for key in batch:
+                self._requested[key] = now
+                self._due[key] = now + self.intervals[key]
+            self.stats.batches += 1
+            self.stats.reads += len(batch)
+            self.hass.async_create_task(self._async_read(batch))
+
+        if len(due) > len(batch):
+            # Wait for the next token.
+            self.stats.deferred += len(due) - len(batch)
+            self._async_schedule(now + (1 - self._tokens) / self.budget)
+        elif self._due:
+            self._async_schedule(min(self._due.values()))
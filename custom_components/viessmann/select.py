@@ -1,22 +1,22 @@
 """Viessmann Selector"""
 from __future__ import annotations
 
-import copy
 import logging
 
-from homeassistant.components import mqtt
 from homeassistant.components.select import DOMAIN, SelectEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import slugify
 
-from .common import ViessmannBaseEntity
+from .common import ViessmannBaseEntity, async_add_viessmann_entities
 from .const import (
+    DOMAIN as VIESSMANN_DOMAIN,
     MQTT_ROOT_TOPIC,
     SELECTS,
     ViessmannSelectEntityDescription,
 )
+from .coordinator import ViessmannCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,27 +29,27 @@ async def async_setup_entry(
 
     integrationUniqueID = config_entry.unique_id
     mqttRoot = config_entry.data[MQTT_ROOT_TOPIC]
+    coordinator = hass.data[VIESSMANN_DOMAIN][config_entry.entry_id]
 
     selectList = []
-    global_selects = copy.deepcopy(SELECTS)
-    for description in global_selects:
-        description.mqttTopicCommand = f"{mqttRoot}/{description.mqttTopicCommand}"
-        description.mqttTopicCurrentValue = f"{mqttRoot}/{description.mqttTopicCurrentValue}"
+    for description in SELECTS:
         selectList.append(
             ViessmannSelect(
                 unique_id=integrationUniqueID,
                 description=description,
                 device_friendly_name=integrationUniqueID,
                 mqtt_root=mqttRoot,
+                coordinator=coordinator,
             )
         )
-    async_add_entities(selectList)
+    async_add_viessmann_entities(coordinator, selectList, async_add_entities)
 
 
 class ViessmannSelect(ViessmannBaseEntity, SelectEntity):
     """Entity representing the inverter operation mode."""
 
     entity_description: ViessmannSelectEntityDescription
+    _state_attr = "_attr_current_option"
 
     def __init__(
         self,
@@ -57,65 +57,37 @@ class ViessmannSelect(ViessmannBaseEntity, SelectEntity):
         device_friendly_name: str,
         description: ViessmannSelectEntityDescription,
         mqtt_root: str,
+        coordinator: ViessmannCoordinator,
     ) -> None:
         """Initialize the sensor and the Viessmann device."""
         super().__init__(
             device_friendly_name=device_friendly_name,
             mqtt_root=mqtt_root,
+            coordinator=coordinator,
         )
         """Initialize the inverter operation mode setting entity."""
         self.entity_description = description
 
         self._attr_unique_id = slugify(f"{unique_id}-{description.name}")
-        self.entity_id = f"{DOMAIN}.{unique_id}_{description.name}".lower()
+        self.entity_id = f"{DOMAIN}.{slugify(unique_id)}_{description.name}".lower()
         self._attr_name = description.name
 
         self._attr_options = description.modes
         self._attr_current_option = None
 
-    async def async_added_to_hass(self):
-        """Subscribe to MQTT events."""
-
-        @callback
-        def message_received(message):
-            """Handle new MQTT messages."""
-            _LOGGER.debug(f"received: {message=}")
-            try:
-                val = message.payload
-                if self.entity_description.value_fn: val = self.entity_description.value_fn(val) 
-                self._attr_current_option = self.entity_description.valueMapCurrentValue.get(val)
-            except ValueError as e:
-                _LOGGER.error(e)
-                self._attr_current_option = None
-
-            self.async_write_ha_state()
-
-        # Subscribe to MQTT topic and connect callack message
-        if self.entity_description.mqttTopicCurrentValue is not None:
-            await mqtt.async_subscribe(
-                self.hass,
-                self.entity_description.mqttTopicCurrentValue,
-                message_received,
-                1,
-            )
-
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
-        topic = f"{self.entity_description.mqttTopicCommand}"
-        _LOGGER.debug("MQTT topic: %s", topic)
         try:
             payload = self.entity_description.valueMapCommand.get(option)
-            _LOGGER.debug("MQTT payload: %s", payload)
             publish_mqtt_message = True
         except ValueError:
             publish_mqtt_message = False
 
         if publish_mqtt_message:
-            await mqtt.async_publish(self.hass, topic, payload)
+            await self.async_send_command(payload)
         """After select --> the result is published to MQTT. 
         But the HA sensor shall only change when the MQTT message on the /get/ topic is received.
         Only then, Viessmann has changed the setting as well.
         """
         # self._attr_current_option = option
         # self.async_write_ha_state()
-
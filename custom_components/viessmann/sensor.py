@@ -1,31 +1,53 @@
 """The openwbmqtt component for controlling the openWB wallbox via home assistant / MQTT"""
 from __future__ import annotations
 
-import copy
-from datetime import timedelta
+from datetime import datetime, timedelta
 import logging
 import re
+from typing import Any
 
-from homeassistant.components import mqtt
-from homeassistant.components.sensor import DOMAIN, SensorEntity
+from homeassistant.components.sensor import DOMAIN, SensorDeviceClass, SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import async_get as async_get_dev_reg
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 from homeassistant.util import dt, slugify
 
-from .common import ViessmannBaseEntity
-
 # Import global values.
+from .common import (
+    ViessmannBaseEntity,
+    ViessmannCompositeEntity,
+    async_add_viessmann_entities,
+    viessmann_device_info,
+)
 from .const import (
+    BURNER_SENSORS,
+    CONF_AGGREGATE,
+    CONF_LONG_TERM,
+    DEFAULT_AGGREGATE,
+    DEFAULT_LONG_TERM,
+    DOMAIN as VIESSMANN_DOMAIN,
+    HEATING_CURVE_SENSORS,
+    LONG_TERM_UPDATE_INTERVAL,
     MQTT_ROOT_TOPIC,
+    ROLLING_SENSORS,
     SENSORS,
+    STATISTICS_SENSORS,
+    ViessmannRollingSensorEntityDescription,
     ViessmannSensorEntityDescription,
+    ViessmannStatisticsSensorEntityDescription,
 )
+from .coordinator import ViessmannCoordinator
+from .rolling import ViessmannRollingWindow
 
 _LOGGER = logging.getLogger(__name__)
 
+# Update interval of the statistics and rolling sensors, the only polled
+# entities.
+SCAN_INTERVAL = timedelta(seconds=60)
+
 
 async def async_setup_entry(
     hass: HomeAssistant, config: ConfigEntry, async_add_entities: AddEntitiesCallback
@@ -34,23 +56,64 @@ async def async_setup_entry(
 
     integrationUniqueID = config.unique_id
     mqttRoot = config.data[MQTT_ROOT_TOPIC]
+    coordinator = hass.data[VIESSMANN_DOMAIN][config.entry_id]
 
+    aggregate = set(config.options.get(CONF_AGGREGATE, DEFAULT_AGGREGATE))
+    long_term = set(config.options.get(CONF_LONG_TERM, DEFAULT_LONG_TERM))
     sensorList = []
     # Create all global sensors.
-    global_sensors = copy.deepcopy(SENSORS)
-    for description in global_sensors:
-        description.mqttTopicCurrentValue = f"{mqttRoot}/{description.key}"
-        _LOGGER.debug("mqttTopic: %s", description.mqttTopicCurrentValue)
+    for description in (*SENSORS, *coordinator.extra_descriptions):
+        if description.key in aggregate:
+            continue
         sensorList.append(
             ViessmannSensor(
                 uniqueID=integrationUniqueID,
                 description=description,
                 device_friendly_name=integrationUniqueID,
                 mqtt_root=mqttRoot,
+                coordinator=coordinator,
+                long_term=description.key in long_term,
             )
         )
 
-    async_add_entities(sensorList)
+    async_add_viessmann_entities(coordinator, sensorList, async_add_entities)
+
+    if aggregate:
+        async_add_entities(
+            [
+                ViessmannAggregateSensor(
+                    uniqueID=integrationUniqueID,
+                    coordinator=coordinator,
+                    descriptions=[
+                        description
+                        for description in SENSORS
+                        if description.key in aggregate
+                    ],
+                )
+            ]
+        )
+
+    async_add_entities(
+        ViessmannStatisticsSensor(
+            uniqueID=integrationUniqueID,
+            description=description,
+            coordinator=coordinator,
+        )
+        for description in (
+            *STATISTICS_SENSORS,
+            *BURNER_SENSORS,
+            *HEATING_CURVE_SENSORS,
+        )
+    )
+
+    async_add_entities(
+        ViessmannRollingSensor(
+            uniqueID=integrationUniqueID,
+            description=description,
+            coordinator=coordinator,
+        )
+        for description in ROLLING_SENSORS
+    )
 
 
 class ViessmannSensor(ViessmannBaseEntity, SensorEntity):
@@ -63,46 +126,138 @@ class ViessmannSensor(ViessmannBaseEntity, SensorEntity):
         uniqueID: str | None,
         device_friendly_name: str,
         mqtt_root: str,
+        coordinator: ViessmannCoordinator,
         description: ViessmannSensorEntityDescription,
+        long_term: bool = False,
     ) -> None:
         """Initialize the sensor and the openWB device."""
         super().__init__(
             device_friendly_name=device_friendly_name,
             mqtt_root=mqtt_root,
+            coordinator=coordinator,
         )
 
         self.entity_description = description
 
         self._attr_unique_id = slugify(f"{uniqueID}-{description.name}")
-        self.entity_id = f"{DOMAIN}.{uniqueID}_{description.name}".lower()
+        self.entity_id = f"{DOMAIN}.{slugify(uniqueID)}_{description.name}".lower()
+        self._attr_name = description.name
+        if long_term:
+            # The integration imports the statistics, the state is a preview.
+            # The shared description stays as it is, topics are looked up
+            # by it.
+            self._attr_state_class = None
+            self._min_update_interval = LONG_TERM_UPDATE_INTERVAL
+
+
+class ViessmannStatisticsSensor(SensorEntity):
+    """Sensor reporting a counter or analytics metric of the integration."""
+
+    entity_description: ViessmannStatisticsSensorEntityDescription
+
+    def __init__(
+        self,
+        uniqueID: str | None,
+        coordinator: ViessmannCoordinator,
+        description: ViessmannStatisticsSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.coordinator = coordinator
+        self.entity_description = description
+        self._attr_device_info = viessmann_device_info(uniqueID)
+        self._attr_unique_id = slugify(f"{uniqueID}-{description.name}")
+        self.entity_id = f"{DOMAIN}.{slugify(uniqueID)}_{description.name}".lower()
+        self._attr_name = description.name
+
+    async def async_update(self) -> None:
+        """Read the counter."""
+        description = self.entity_description
+        self._attr_native_value = description.value_fn(self.coordinator)
+        if description.attributes_fn is not None:
+            self._attr_extra_state_attributes = description.attributes_fn(
+                self.coordinator
+            )
+
+
+class ViessmannRollingSensor(SensorEntity):
+    """Sensor reporting a statistic of a datapoint over the rolling window.
+
+    Samples are added to the window by the coordinator; the sensor only
+    reads the statistic at its update interval.
+    """
+
+    entity_description: ViessmannRollingSensorEntityDescription
+
+    def __init__(
+        self,
+        uniqueID: str | None,
+        coordinator: ViessmannCoordinator,
+        description: ViessmannRollingSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.coordinator = coordinator
+        self.entity_description = description
+        self._window: ViessmannRollingWindow | None = None
+        self._attr_device_info = viessmann_device_info(uniqueID)
+        self._attr_unique_id = slugify(f"{uniqueID}-{description.name}")
+        self.entity_id = f"{DOMAIN}.{slugify(uniqueID)}_{description.name}".lower()
         self._attr_name = description.name
 
-    async def async_added_to_hass(self):
-        """Subscribe to MQTT events."""
-
-        @callback
-        def message_received(message):
-            """Handle new MQTT messages."""
-            self._attr_native_value = message.payload
-
-            # Convert data if a conversion function is defined
-            if self.entity_description.value_fn is not None:
-                self._attr_native_value = self.entity_description.value_fn(self._attr_native_value)
-
-            # Map values as defined in the value map dict.
-            if self.entity_description.valueMap is not None:
-                try:
-                    self._attr_native_value = self.entity_description.valueMap.get(self._attr_native_value)
-                except ValueError:
-                    self._attr_native_value = self._attr_native_value
-
-            # Update entity state with value published on MQTT.
-            self.async_write_ha_state()
-
-        # Subscribe to MQTT topic and connect callack message
-        await mqtt.async_subscribe(
-            self.hass,
-            self.entity_description.mqttTopicCurrentValue,
-            message_received,
-            1,
+    @property
+    def available(self) -> bool:
+        """Return True while the datapoint keeps being received."""
+        return self.coordinator.availability.is_available(
+            self.entity_description.source
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Keep the datapoint received even with its own sensor disabled."""
+        await super().async_added_to_hass()
+        self._window = self.coordinator.rolling_window(self.entity_description.source)
+        self.async_on_remove(
+            self.coordinator.async_add_listener(
+                self.entity_description.source, lambda datapoint: None
+            )
         )
+
+    async def async_update(self) -> None:
+        """Read the statistic of the samples within the window."""
+        assert self._window is not None
+        self._window.expire(dt.utcnow().timestamp())
+        value = getattr(self._window, self.entity_description.statistic)
+        self._attr_native_value = None if value is None else round(value, 2)
+
+
+class ViessmannAggregateSensor(ViessmannCompositeEntity, SensorEntity):
+    """Sensor showing several diagnostic datapoints as its attributes.
+
+    The state is the time of the latest change.
+    """
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:format-list-bulleted"
+
+    def __init__(
+        self,
+        uniqueID: str | None,
+        coordinator: ViessmannCoordinator,
+        descriptions: list[ViessmannSensorEntityDescription],
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._sources = {description.name: description for description in descriptions}
+        self._attr_device_info = viessmann_device_info(uniqueID)
+        self._attr_unique_id = slugify(f"{uniqueID}-Diagnostics")
+        self.entity_id = f"{DOMAIN}.{slugify(uniqueID)}_diagnostics"
+        self._attr_name = "Diagnostics"
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return the time of the latest change."""
+        return self._updated
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the values of the aggregated datapoints."""
+        return self._values
@@ -0,0 +1,115 @@
+"""Lightweight statistics helpers for the Viessmann integration."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+
+class ViessmannHistogram:
+    """Fixed-bucket histogram with percentile estimates.
+
+    Adding a sample is a bisect and two additions on preallocated counters.
+    Percentiles are estimated by the upper bound of the bucket they fall in.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        """Initialize the histogram with ascending bucket upper bounds."""
+        self.bounds = bounds
+        # The last bucket collects everything above the highest bound.
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the estimated value below which fraction of the samples fall."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        cumulative = 0
+        for index, bucket in enumerate(self.counts):
+            cumulative += bucket
+            if cumulative >= rank and bucket:
+                if index < len(self.bounds):
+                    return min(self.bounds[index], self.max)
+                return self.max
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary of the histogram."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "max": self.max if self.count else None,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "buckets": dict(
+                zip([*map(str, self.bounds), "inf"], self.counts, strict=True)
+            ),
+        }
+
+
+# Callback execution time buckets in seconds.
+CALLBACK_TIME_BUCKETS = (2e-6, 5e-6, 1e-5, 2e-5, 5e-5, 1e-4, 2e-4, 5e-4, 1e-3, 1e-2)
+# Only every 16th message of a topic is timed, the clock reads would cost
+# more than routing the message.
+CALLBACK_TIME_SAMPLE_MASK = 15
+
+
+class ViessmannMessageStats:
+    """Hot path counters of the messages an entry receives.
+
+    Counters of a topic are created when its handler is set up, so counting
+    a message is an in-place dict update. Callback times are sampled.
+    """
+
+    __slots__ = ("started", "messages", "decode_errors", "callback_time")
+
+    def __init__(self, started: float) -> None:
+        """Initialize empty counters, started is the monotonic start time."""
+        self.started = started
+        self.messages: dict[str, int] = {}
+        self.decode_errors: dict[str, int] = {}
+        self.callback_time = ViessmannHistogram(CALLBACK_TIME_BUCKETS)
+
+    def track(self, key: str) -> None:
+        """Create the counters of a topic suffix."""
+        self.messages.setdefault(key, 0)
+        self.decode_errors.setdefault(key, 0)
+
+    @property
+    def total_messages(self) -> int:
+        """Return the number of messages of all topics."""
+        return sum(self.messages.values())
+
+    @property
+    def total_decode_errors(self) -> int:
+        """Return the number of undecodable messages of all topics."""
+        return sum(self.decode_errors.values())
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        """Return the counters with message rates up to monotonic time now."""
+        elapsed = max(now - self.started, 1e-9)
+        return {
+            "seconds": round(elapsed, 1),
+            "topics": {
+                key: {
+                    "messages": count,
+                    "per_second": round(count / elapsed, 4),
+                    "decode_errors": self.decode_errors[key],
+                }
+                for key, count in sorted(self.messages.items())
+            },
+            "callback_time": self.callback_time.as_dict(),
+        }
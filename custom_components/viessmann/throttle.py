@@ -0,0 +1,98 @@
+"""Shared state write rate limiter for the Viessmann integration."""
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_at
+
+_LOGGER = logging.getLogger(__name__)
+
+# Event loop timers may fire up to the clock resolution early.
+TIMER_TOLERANCE = 0.01
+
+
+class ViessmannThrottle:
+    """Rate limit state writes with a leading edge and a trailing flush.
+
+    The first write of a key passes immediately. Writes arriving within the
+    minimum interval are held back by the caller, and the throttle calls the
+    key's flush callback once the interval has passed, so the latest value
+    of a burst is never lost. The flush counts as the key's next write.
+    All keys of an entry share one timer.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the throttle."""
+        self.hass = hass
+        self._last_write: dict[Hashable, float] = {}
+        self._pending: dict[Hashable, tuple[float, Callable[[], None]]] = {}
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._timer_due: float | None = None
+
+    @callback
+    def async_allow(
+        self, key: Hashable, interval: float, flush: Callable[[], None]
+    ) -> bool:
+        """Return True if key may write now, else schedule flush for later."""
+        now = self.hass.loop.time()
+        last = self._last_write.get(key)
+        if last is None or now - last >= interval - TIMER_TOLERANCE:
+            self._last_write[key] = now
+            self._pending.pop(key, None)
+            return True
+        if key not in self._pending:
+            due = last + interval
+            self._pending[key] = (due, flush)
+            self._async_schedule(due)
+        return False
+
+    @callback
+    def async_cancel(self, key: Hashable) -> None:
+        """Drop a pending flush of key."""
+        self._pending.pop(key, None)
+
+    @callback
+    def async_remove(self, key: Hashable) -> None:
+        """Forget key entirely."""
+        self._pending.pop(key, None)
+        self._last_write.pop(key, None)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the timer and all pending flushes."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+            self._timer_due = None
+        self._pending.clear()
+        self._last_write.clear()
+
+    @callback
+    def _async_schedule(self, due: float) -> None:
+        """Make sure the shared timer fires no later than due."""
+        if self._timer_due is not None and self._timer_due <= due:
+            return
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+        self._timer_due = due
+        self._unsub_timer = async_call_at(self.hass, self._async_flush_due, due)
+
+    @callback
+    def _async_flush_due(self, _now) -> None:
+        """Flush every key whose interval has passed and re-arm the timer."""
+        # The timer only fires once its due time has been reached.
+        flush_until = max(self.hass.loop.time(), self._timer_due) + TIMER_TOLERANCE
+        self._unsub_timer = None
+        self._timer_due = None
+        due_keys = [
+            key for key, (due, _) in self._pending.items() if due <= flush_until
+        ]
+        now = self.hass.loop.time()
+        for key in due_keys:
+            _, flush = self._pending.pop(key)
+            self._last_write[key] = now
+            flush()
+        if self._pending:
+            self._async_schedule(min(due for due, _ in self._pending.values()))
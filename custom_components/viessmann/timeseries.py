@@ -0,0 +1,208 @@
+"""Compact on-disk time series of datapoints for the Viessmann integration."""
+from __future__ import annotations
+
+import logging
+import math
+import mmap
+import os
+from pathlib import Path
+import shutil
+import struct
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import slugify
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Samples kept per datapoint; 16 bytes each, so a series takes 2 MB at most.
+TIMESERIES_CAPACITY = 131072
+
+# The header holds a magic, the capacity in samples and the number of
+# samples ever appended, followed by the samples as pairs of doubles.
+HEADER = struct.Struct("<4sIQ")
+MAGIC = b"VTS1"
+_WRITTEN = struct.Struct("<Q")
+_WRITTEN_OFFSET = 8
+
+
+def timeseries_directory(hass: HomeAssistant, mqtt_root: str) -> Path:
+    """Return the directory of the time series of a vcontrold root."""
+    return Path(hass.config.path(DOMAIN, slugify(mqtt_root)))
+
+
+def remove_timeseries(directory: Path) -> None:
+    """Delete the time series in directory.
+
+    Does blocking I/O, run it in the executor.
+    """
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+class ViessmannTimeSeries:
+    """Fixed-size ring of timestamped samples in a memory-mapped file.
+
+    The file is sized once for its capacity, the newest samples overwrite
+    the oldest. Appending writes two doubles and the running count into the
+    mapping; the operating system writes the pages back. Samples are
+    appended in the order received, so their timestamps ascend and a time
+    range is found by bisection. Reads return views of the mapping, no
+    sample is copied until it is downsampled or sent, or a snapshot is
+    taken for the executor.
+    """
+
+    __slots__ = ("path", "capacity", "_mmap", "_data", "_written")
+
+    def __init__(self, path: Path, capacity: int = TIMESERIES_CAPACITY) -> None:
+        """Initialize a series stored at path."""
+        self.path = path
+        self.capacity = capacity
+        self._mmap: mmap.mmap | None = None
+        self._data: memoryview | None = None
+        self._written = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples kept."""
+        return min(self._written, self.capacity)
+
+    def open(self) -> None:
+        """Map the file, creating it if missing or of another capacity.
+
+        Does blocking I/O, run it in the executor.
+        """
+        size = HEADER.size + 16 * self.capacity
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        with os.fdopen(fd, "r+b") as file:
+            header = file.read(HEADER.size)
+            valid = False
+            if len(header) == HEADER.size and os.fstat(fd).st_size == size:
+                magic, capacity, written = HEADER.unpack(header)
+                valid = magic == MAGIC and capacity == self.capacity
+            if not valid:
+                if header:
+                    _LOGGER.info("Starting over the time series in %s", self.path)
+                file.truncate(0)
+                file.truncate(size)
+                written = 0
+            # The mapping keeps a descriptor of its own.
+            self._mmap = mmap.mmap(fd, size)
+        if not valid:
+            HEADER.pack_into(self._mmap, 0, MAGIC, self.capacity, 0)
+        self._data = memoryview(self._mmap)[HEADER.size :].cast("d")
+        self._written = written
+
+    def close(self) -> None:
+        """Write back and unmap the file.
+
+        Does blocking I/O, run it in the executor.
+        """
+        if self._mmap is None:
+            return
+        assert self._data is not None
+        self._data.release()
+        self._data = None
+        self._mmap.flush()
+        self._mmap.close()
+        self._mmap = None
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Append a sample taken at a POSIX timestamp."""
+        if (data := self._data) is None:
+            return
+        index = 2 * (self._written % self.capacity)
+        data[index] = timestamp
+        data[index + 1] = value
+        self._written += 1
+        _WRITTEN.pack_into(self._mmap, _WRITTEN_OFFSET, self._written)
+
+    def segments(self, start: float, end: float) -> list[memoryview]:
+        """Return views of the samples taken from start to end.
+
+        Each view holds interleaved timestamps and values; a range crossing
+        the end of the ring takes two.
+        """
+        if (data := self._data) is None or not (count := len(self)):
+            return []
+        capacity = self.capacity
+        # Position of the oldest sample in the ring.
+        first = self._written % capacity if self._written > capacity else 0
+
+        def bisect(timestamp: float, right: bool) -> int:
+            """Return the logical index timestamp would be inserted at."""
+            low, high = 0, count
+            while low < high:
+                middle = (low + high) // 2
+                sample = data[2 * ((first + middle) % capacity)]
+                if sample < timestamp or (right and sample == timestamp):
+                    low = middle + 1
+                else:
+                    high = middle
+            return low
+
+        low = bisect(start, False)
+        high = bisect(end, True)
+        if low >= high:
+            return []
+        begin = (first + low) % capacity
+        stop = begin + high - low
+        if stop <= capacity:
+            return [data[2 * begin : 2 * stop]]
+        return [data[2 * begin :], data[: 2 * (stop - capacity)]]
+
+    def snapshot(self, start: float, end: float) -> list[memoryview]:
+        """Return copies of the samples taken from start to end.
+
+        Unlike the views of segments, the copies stay valid while samples
+        are appended and after the file is closed, so they can be processed
+        in the executor.
+        """
+        segments = self.segments(start, end)
+        copies = [memoryview(segment.tobytes()).cast("d") for segment in segments]
+        for segment in segments:
+            segment.release()
+        return copies
+
+    def query(
+        self, start: float, end: float, points: int | None = None
+    ) -> list[tuple[float, float]]:
+        """Return the samples from start to end, at most points of them."""
+        segments = self.segments(start, end)
+        samples = downsample(segments, points)
+        for segment in segments:
+            segment.release()
+        return samples
+
+
+def downsample(
+    segments: list[memoryview], points: int | None = None
+) -> list[tuple[float, float]]:
+    """Return the samples of segments, at most points of them.
+
+    Above points samples, consecutive samples are averaged in groups of
+    equal size, timestamps alike.
+    """
+    count = sum(len(segment) for segment in segments) // 2
+    if points is None or count <= points:
+        return [
+            sample
+            for segment in segments
+            for sample in zip(segment[::2], segment[1::2])
+        ]
+    group = math.ceil(count / points)
+    samples = []
+    sum_time = sum_value = 0.0
+    size = 0
+    for segment in segments:
+        for i in range(0, len(segment), 2):
+            sum_time += segment[i]
+            sum_value += segment[i + 1]
+            size += 1
+            if size == group:
+                samples.append((sum_time / size, sum_value / size))
+                sum_time = sum_value = 0.0
+                size = 0
+    if size:
+        samples.append((sum_time / size, sum_value / size))
+    return samples
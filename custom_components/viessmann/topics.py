@@ -0,0 +1,64 @@
+"""Per-entry MQTT topic index for the shared Viessmann entity descriptions."""
+from __future__ import annotations
+
+from .const import ENTITY_DESCRIPTIONS
+
+
+def state_key(description) -> str:
+    """Return the topic suffix a description reads its state from."""
+    return description.mqttTopicCurrentValue or description.key
+
+
+# Position of every shared description, computed once for all entries.
+_POSITIONS: dict[int, int] = {
+    id(description): position
+    for position, description in enumerate(ENTITY_DESCRIPTIONS)
+}
+
+
+class ViessmannTopics:
+    """Full state and command topics of all descriptions for one root topic.
+
+    The entity descriptions are frozen and shared between config entries, so
+    the only per-entry data are two tuples of topic strings. Descriptions of
+    an entry's own, like those from a datapoint catalog, are appended.
+    """
+
+    __slots__ = ("mqtt_root", "state", "command", "_positions")
+
+    def __init__(self, mqtt_root: str, extra_descriptions: tuple = ()) -> None:
+        """Resolve all topics below mqtt_root."""
+        self.mqtt_root = mqtt_root
+        descriptions = (*ENTITY_DESCRIPTIONS, *extra_descriptions)
+        self.state: tuple[str, ...] = tuple(
+            f"{mqtt_root}/{state_key(description)}" for description in descriptions
+        )
+        self.command: tuple[str | None, ...] = tuple(
+            f"{mqtt_root}/{description.mqttTopicCommand}"
+            if getattr(description, "mqttTopicCommand", None)
+            else None
+            for description in descriptions
+        )
+        self._positions = _POSITIONS
+        if extra_descriptions:
+            self._positions = {
+                **_POSITIONS,
+                **{
+                    id(description): position
+                    for position, description in enumerate(
+                        extra_descriptions, len(ENTITY_DESCRIPTIONS)
+                    )
+                },
+            }
+
+    def position(self, description) -> int:
+        """Return the position of a description in the topic tuples."""
+        return self._positions[id(description)]
+
+    def state_topic(self, description) -> str:
+        """Return the full state topic of a description."""
+        return self.state[self._positions[id(description)]]
+
+    def command_topic(self, description) -> str | None:
+        """Return the full command topic of a description, if it has one."""
+        return self.command[self._positions[id(description)]]
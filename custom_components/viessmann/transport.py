@@ -0,0 +1,159 @@
+"""Direct vcontrold TCP transport for the Viessmann integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+from dataclasses import dataclass
+import logging
+
+from homeassistant.exceptions import HomeAssistantError
+
+_LOGGER = logging.getLogger(__name__)
+
+# vcontrold ends every response with its prompt.
+PROMPT = b"vctrld>"
+DEFAULT_TIMEOUT = 10.0
+
+
+class VcontroldError(HomeAssistantError):
+    """Error to indicate vcontrold could not be reached or refused a command."""
+
+
+@dataclass
+class ViessmannTransportStats:
+    """Counters of the requests sent to vcontrold."""
+
+    commands: int = 0
+    batches: int = 0
+    connects: int = 0
+    errors: int = 0
+
+
+def parse_response(response: bytes) -> bytes | None:
+    """Return the value of a vcontrold response, None for an error.
+
+    vcontrold answers a read with the value followed by its unit, e.g.
+    `21.500000 Grad Celsius`. Numbers are returned without the unit, other
+    values as the whole line, matching what the MQTT bridge publishes.
+    """
+    line = response.strip().split(b"\n", 1)[0].strip()
+    if not line or line.startswith(b"ERR"):
+        return None
+    number = line.split(None, 1)[0]
+    try:
+        float(number)
+    except ValueError:
+        return line
+    return number
+
+
+class ViessmannTransport:
+    """Persistent connection to the text protocol of one vcontrold daemon.
+
+    A batch of commands is written in one go and the responses are read back
+    in order, so reading any number of datapoints costs a single round trip.
+    Requests are serialized on the connection; a broken connection is dropped
+    and opened again by the next request.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = DEFAULT_TIMEOUT) -> None:
+        """Initialize the transport."""
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.stats = ViessmannTransportStats()
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        """Return True if the connection is open."""
+        return self._writer is not None
+
+    async def async_connect(self) -> None:
+        """Open the connection unless it is open already."""
+        async with self._lock:
+            await self._async_ensure_connected()
+
+    async def async_close(self) -> None:
+        """Close the connection."""
+        async with self._lock:
+            if self._writer is None:
+                return
+            try:
+                self._writer.write(b"quit\n")
+                await self._writer.drain()
+            except OSError:
+                pass
+            self._async_drop()
+
+    async def async_request(self, commands: Sequence[str]) -> list[bytes]:
+        """Send commands in one write and return their raw responses in order."""
+        if not commands:
+            return []
+        async with self._lock:
+            try:
+                await self._async_ensure_connected()
+                return await self._async_request(commands)
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as err:
+                self.stats.errors += 1
+                self._async_drop()
+                raise VcontroldError(
+                    f"Error talking to vcontrold at {self.host}:{self.port}: {err!r}"
+                ) from err
+
+    async def async_read(self, keys: Sequence[str]) -> dict[str, bytes | None]:
+        """Read datapoints in one batch, returning None for failed reads."""
+        responses = await self.async_request(keys)
+        return {
+            key: parse_response(response)
+            for key, response in zip(keys, responses, strict=True)
+        }
+
+    async def async_write(self, command: str, value: str) -> None:
+        """Run a set command, raising VcontroldError if vcontrold refuses it."""
+        (response,) = await self.async_request([f"{command} {value}"])
+        if response.strip() != b"OK":
+            raise VcontroldError(
+                f"vcontrold refused {command} {value}: {response.strip().decode()}"
+            )
+
+    async def _async_ensure_connected(self) -> None:
+        """Open the connection and wait for the first prompt."""
+        if self._writer is not None:
+            return
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout
+            )
+            await asyncio.wait_for(self._reader.readuntil(PROMPT), self.timeout)
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as err:
+            self.stats.errors += 1
+            self._async_drop()
+            raise VcontroldError(
+                f"Cannot connect to vcontrold at {self.host}:{self.port}: {err!r}"
+            ) from err
+        self.stats.connects += 1
+        _LOGGER.debug("Connected to vcontrold at %s:%s", self.host, self.port)
+
+    async def _async_request(self, commands: Sequence[str]) -> list[bytes]:
+        """Write a batch of commands and read one response per command."""
+        assert self._reader is not None and self._writer is not None
+        self.stats.batches += 1
+        self.stats.commands += len(commands)
+        self._writer.write("".join(f"{command}\n" for command in commands).encode())
+        await self._writer.drain()
+        prompt_length = len(PROMPT)
+        return [
+            (await asyncio.wait_for(self._reader.readuntil(PROMPT), self.timeout))[
+                :-prompt_length
+            ]
+            for _ in commands
+        ]
+
+    def _async_drop(self) -> None:
+        """Forget the connection, closing it if still open."""
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
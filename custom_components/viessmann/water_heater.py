@@ -0,0 +1,103 @@
+"""Water heater entity of the Viessmann hot water circuit."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.components.water_heater import (
+    DOMAIN,
+    WaterHeaterEntity,
+    WaterHeaterEntityFeature,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import ATTR_TEMPERATURE, STATE_OFF, STATE_ON, UnitOfTemperature
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import slugify
+
+from .common import (
+    ViessmannCompositeEntity,
+    async_add_viessmann_entities,
+    description_by_key,
+    viessmann_device_info,
+)
+from .const import BINARY_SENSORS, DOMAIN as VIESSMANN_DOMAIN, NUMBERS, SELECTS, SENSORS
+from .coordinator import ViessmannCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Operating modes of M1 without hot water.
+NO_HOT_WATER_MODES = {"ABSCHALT", "RED", "NORM"}
+
+# The descriptions the water heater combines, by name. The hot water
+# temperature comes first, it is the one discovery waits for.
+SOURCES = {
+    "temperature": description_by_key(SENSORS, "getTempWWist"),
+    "target": description_by_key(NUMBERS, "getTempWWsoll"),
+    "mode": description_by_key(SELECTS, "getBetriebArtM1"),
+    "circulation": description_by_key(BINARY_SENSORS, "getPumpeStatusZirku"),
+}
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, config: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up the water heater entity."""
+    coordinator = hass.data[VIESSMANN_DOMAIN][config.entry_id]
+    async_add_viessmann_entities(
+        coordinator,
+        [ViessmannWaterHeater(unique_id=config.unique_id, coordinator=coordinator)],
+        async_add_entities,
+    )
+
+
+class ViessmannWaterHeater(ViessmannCompositeEntity, WaterHeaterEntity):
+    """Hot water with its temperature, setpoint and operation."""
+
+    _attr_supported_features = WaterHeaterEntityFeature.TARGET_TEMPERATURE
+    _attr_temperature_unit = UnitOfTemperature.CELSIUS
+    _attr_icon = "mdi:water-boiler"
+    _sources = SOURCES
+
+    def __init__(
+        self, unique_id: str | None, coordinator: ViessmannCoordinator
+    ) -> None:
+        """Initialize the water heater."""
+        super().__init__(coordinator)
+        target = SOURCES["target"]
+        self._attr_min_temp = target.native_min_value
+        self._attr_max_temp = target.native_max_value
+        self._attr_device_info = viessmann_device_info(unique_id)
+        self._attr_unique_id = slugify(f"{unique_id}-WW")
+        self.entity_id = f"{DOMAIN}.{slugify(unique_id)}_ww"
+        self._attr_name = "WW"
+
+    @property
+    def current_temperature(self) -> float | None:
+        """Return the hot water temperature."""
+        return self._values.get("temperature")
+
+    @property
+    def target_temperature(self) -> float | None:
+        """Return the hot water setpoint."""
+        return self._values.get("target")
+
+    @property
+    def current_operation(self) -> str | None:
+        """Return on if the operating mode heats hot water."""
+        if (mode := self._values.get("mode")) is None:
+            return None
+        return STATE_OFF if mode in NO_HOT_WATER_MODES else STATE_ON
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state of the circulation pump."""
+        return {"circulation_pump": self._values.get("circulation")}
+
+    async def async_set_temperature(self, **kwargs: Any) -> None:
+        """Change the hot water setpoint."""
+        if (temperature := kwargs.get(ATTR_TEMPERATURE)) is None:
+            return
+        await self.async_send_command(
+            "target", SOURCES["target"].ivalue_fn(temperature)
+        )
@@ -0,0 +1,181 @@
+"""Websocket API of the Viessmann integration."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .timeseries import downsample
+
+# Seconds between two delta messages of a subscription unless chosen.
+DEFAULT_SUBSCRIBE_INTERVAL = 1.0
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the websocket commands, once for all entries."""
+    websocket_api.async_register_command(hass, websocket_timeseries)
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/timeseries",
+        vol.Required("entry_id"): str,
+        vol.Required("key"): str,
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Optional("points"): vol.All(int, vol.Range(min=1)),
+    }
+)
+@websocket_api.async_response
+async def websocket_timeseries(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Send the samples of a datapoint's time series within a time range.
+
+    Samples are pairs of a POSIX timestamp and the value, averaged down to
+    at most points of them if given.
+    """
+    coordinator = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if coordinator is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not found"
+        )
+        return
+    if (series := coordinator.timeseries.get(msg["key"])) is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "No time series of this datapoint"
+        )
+        return
+    start_time = dt_util.parse_datetime(msg["start_time"])
+    end_time = (
+        dt_util.parse_datetime(msg["end_time"]) if "end_time" in msg else dt_util.utcnow()
+    )
+    if start_time is None or end_time is None:
+        connection.send_error(msg["id"], websocket_api.ERR_INVALID_FORMAT, "Invalid time")
+        return
+    # Averaging a long range takes a while, keep it off the loop. The range
+    # is copied on the loop first, where no sample is appended meanwhile and
+    # the series cannot be closed.
+    segments = series.snapshot(
+        dt_util.as_utc(start_time).timestamp(), dt_util.as_utc(end_time).timestamp()
+    )
+    samples = await hass.async_add_executor_job(
+        downsample, segments, msg.get("points")
+    )
+    connection.send_result(msg["id"], {"key": msg["key"], "samples": samples})
+
+
+class ViessmannSubscription:
+    """Coalesce the changed values of an entry for one websocket client.
+
+    Changes are collected by key, so a value changing several times
+    between two messages is only sent as its last value. A message goes out
+    at most once per interval; after a quiet period the first change is sent
+    right away.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg_id: int,
+        interval: float,
+    ) -> None:
+        """Initialize the subscription of a websocket message id."""
+        self.hass = hass
+        self.connection = connection
+        self.msg_id = msg_id
+        self.interval = interval
+        self.pending: dict[str, Any] = {}
+        self._last_sent = 0.0
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_send(self, values: dict[str, Any]) -> None:
+        """Send values in one event message."""
+        self._last_sent = self.hass.loop.time()
+        self.connection.send_message(
+            websocket_api.event_message(self.msg_id, {"values": values})
+        )
+
+    @callback
+    def async_changed(self, key: str, datapoint: Any) -> None:
+        """Collect a changed value and make sure it is sent in time."""
+        self.pending[key] = datapoint.value
+        if self._unsub_timer is not None:
+            return
+        delay = self._last_sent + self.interval - self.hass.loop.time()
+        if delay <= 0:
+            self._async_flush(None)
+        else:
+            self._unsub_timer = async_call_later(self.hass, delay, self._async_flush)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop sending."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self.pending = {}
+
+    @callback
+    def _async_flush(self, now: datetime | None) -> None:
+        """Send the collected values."""
+        self._unsub_timer = None
+        if self.pending:
+            pending = self.pending
+            self.pending = {}
+            self.async_send(pending)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Required("entry_id"): str,
+        vol.Optional("interval", default=DEFAULT_SUBSCRIBE_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=3600)
+        ),
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Send all decoded values of an entry, then their changes.
+
+    The first event holds every value, the following ones the values
+    changed since the previous event, at most one per interval seconds.
+    Values come right from the coordinator, not from entity states.
+    """
+    coordinator = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if coordinator is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not found"
+        )
+        return
+    subscription = ViessmannSubscription(hass, connection, msg["id"], msg["interval"])
+    unsub_changes = coordinator.async_add_change_listener(subscription.async_changed)
+
+    @callback
+    def async_unsubscribe() -> None:
+        """Stop the subscription."""
+        unsub_changes()
+        subscription.async_stop()
+
+    connection.subscriptions[msg["id"]] = async_unsubscribe
+    connection.send_result(msg["id"])
+    # Values from the last run count until received again.
+    values = {key: datapoint.value for key, datapoint in coordinator.cached.items()}
+    values.update(
+        (key, datapoint.value) for key, datapoint in coordinator.data.items()
+    )
+    subscription.async_send(values)
@@ -0,0 +1,45 @@
+"""Fixtures for the Viessmann integration tests."""
+import dataclasses
+
+import pytest
+
+from custom_components.viessmann.const import SENSORS
+from custom_components.viessmann.coordinator import ViessmannCoordinator
+from custom_components.viessmann.dispatcher import async_get_dispatcher
+from custom_components.viessmann.sensor import ViessmannSensor
+
+
+@pytest.fixture
+def add_test_sensor(hass):
+    """Return a factory adding a sensor of a TempTest datapoint.
+
+    Keyword arguments change the entity description, which otherwise is
+    the one of getTempA. The factory returns the coordinator and the sensor.
+    """
+
+    async def _async_add_test_sensor(**changes):
+        description = dataclasses.replace(
+            next(description for description in SENSORS if description.key == "getTempA"),
+            key="getTempTest",
+            name="TempTest",
+            **changes,
+        )
+        coordinator = ViessmannCoordinator(
+            hass,
+            "vcontrold",
+            async_get_dispatcher(hass),
+            extra_descriptions=(description,),
+        )
+        await coordinator.async_setup()
+        sensor = ViessmannSensor(
+            uniqueID="vcontrold",
+            device_friendly_name="vcontrold",
+            mqtt_root="vcontrold",
+            coordinator=coordinator,
+            description=description,
+        )
+        sensor.hass = hass
+        await sensor.async_added_to_hass()
+        return coordinator, sensor
+
+    return _async_add_test_sensor
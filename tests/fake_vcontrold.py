@@ -0,0 +1,77 @@
+"""In-process fake vcontrold daemon for testing the direct transport."""
+from __future__ import annotations
+
+import asyncio
+
+from custom_components.viessmann.transport import PROMPT
+
+
+class FakeVcontrold:
+    """Answer vcontrold's text protocol from a dict of responses.
+
+    `values` maps get commands to their response lines, e.g.
+    `{"getTempA": "12.300000 Grad Celsius"}`. A set command stores its
+    argument as the response of the matching get command.
+    """
+
+    def __init__(self, values: dict[str, str] | None = None) -> None:
+        """Initialize the fake daemon."""
+        self.values = dict(values or {})
+        self.commands: list[str] = []
+        self.connections = 0
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    @property
+    def port(self) -> int:
+        """Return the port the daemon listens on."""
+        assert self._server is not None
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self) -> None:
+        """Listen on a free local port."""
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        """Drop all connections and stop listening."""
+        self.drop_connections()
+        assert self._server is not None
+        self._server.close()
+        await self._server.wait_closed()
+
+    def drop_connections(self) -> None:
+        """Close all client connections, like a restarting daemon."""
+        for writer in self._writers:
+            writer.close()
+        self._writers.clear()
+
+    def respond(self, command: str) -> str:
+        """Return the response line to a command."""
+        name, _, argument = command.partition(" ")
+        if name.startswith("set") and argument:
+            self.values[f"get{name[3:]}"] = argument
+            return "OK"
+        if name in self.values:
+            return self.values[name]
+        return f"ERR: command {name} unknown"
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one client connection."""
+        self.connections += 1
+        self._writers.add(writer)
+        writer.write(PROMPT)
+        try:
+            while line := await reader.readline():
+                command = line.decode().strip()
+                if command == "quit":
+                    break
+                self.commands.append(command)
+                writer.write(f"{self.respond(command)}\n".encode() + PROMPT)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
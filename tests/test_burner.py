@@ -0,0 +1,47 @@
+"""Test the burner cycle analytics."""
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.viessmann.burner import ViessmannBurnerCycles
+from custom_components.viessmann.coordinator import ViessmannValue
+
+
+async def test_burner_cycles(hass, hass_storage):
+    """Test cycles are detected and measured within the hour."""
+    burner = ViessmannBurnerCycles(hass, "entry")
+    await burner.async_load()
+    start = dt_util.utcnow()
+
+    def receive(key, value, seconds):
+        burner.async_received(
+            key, ViessmannValue(value, start + timedelta(seconds=seconds))
+        )
+
+    # Two cycles of five and ten minutes, modulating at 30 and 70 %.
+    receive("getLeistungIst", 30.0, 0)
+    receive("getLeistungIst", 0.0, 300)
+    receive("getLeistungIst", 70.0, 600)
+    receive("getLeistungIst", 0.0, 1200)
+    now = start.timestamp() + 1200
+    assert burner.starts_per_hour(now) == 2
+    assert burner.mean_on_time(now) == 450
+    assert burner.mean_modulation(now) == (30 * 300 + 70 * 600) / 900
+    histogram = burner.modulation_histogram(now)
+    assert histogram["30-40 %"] == round(1 / 3, 3)
+    assert histogram["70-80 %"] == round(2 / 3, 3)
+    assert burner.burner_hours(now) == 0.25
+
+    # Once read, the start counter counts the starts.
+    receive("getBrennerStarts", 1000.0, 1300)
+    receive("getLeistungIst", 50.0, 1400)
+    receive("getBrennerStarts", 1003.0, 1500)
+    assert burner.starts_per_hour(now + 300) == 5
+    assert burner.burner_hours(now + 300) == 0.25 + 100 / 3600
+
+    # A long cycle ends after the starts left the window.
+    later = now + 4300
+    receive("getLeistungIst", 0.0, 5500)
+    assert burner.starts_per_hour(later) == 0
+    assert burner.mean_on_time(later) == 4100
+    assert round(burner.burner_hours(later), 3) == round(0.25 + 4100 / 3600, 3)
@@ -0,0 +1,142 @@
+"""Test the datapoint catalog."""
+import json
+
+from homeassistant.components.sensor import SensorDeviceClass
+import pytest
+
+from custom_components.viessmann import catalog as catalog_module
+from custom_components.viessmann.catalog import (
+    KIND_ENUM,
+    KIND_NUMBER,
+    CatalogCommand,
+    CatalogError,
+    catalog_descriptions,
+    load_catalog,
+)
+from custom_components.viessmann.decoder import compile_payload_decoders, decode_text
+
+VITO_XML = """<?xml version="1.0"?>
+<vito>
+  <devices>
+    <device ID="2098" name="V200KW2" protocol="KW2"/>
+    <device ID="20CB" name="VScotHO1" protocol="P300"/>
+  </devices>
+  <commands>
+    <command name="getTempA" protocmd="getaddr">
+      <addr>5525</addr><len>2</len><unit>UT</unit>
+      <description>Aussentemperatur</description>
+    </command>
+    <command name="getTempSolar" protocmd="getaddr">
+      <addr>6564</addr><len>2</len><unit>UT</unit>
+      <description>Kollektortemperatur</description>
+    </command>
+    <command name="getBetriebArtM2" protocmd="getaddr">
+      <description>Betriebsart M2</description>
+      <device ID="20CB"><addr>3323</addr><len>1</len><unit>BA</unit></device>
+    </command>
+    <command name="getKW2Only" protocmd="getaddr">
+      <device ID="2098"><addr>0800</addr><len>2</len><unit>UT</unit></device>
+    </command>
+    <command name="setTempWWsoll" protocmd="setaddr">
+      <addr>6300</addr><len>1</len><unit>UTI</unit>
+    </command>
+  </commands>
+</vito>
+"""
+
+VCONTROLD_XML = """<?xml version="1.0"?>
+<vcontrold>
+  <units>
+    <unit name="Temperatur 2Byte">
+      <abbrev>UT</abbrev><calculation>V/10</calculation>
+      <type>short</type><entity>Grad Celsius</entity>
+    </unit>
+    <unit name="BetriebsArt">
+      <abbrev>BA</abbrev><type>enum</type>
+      <enum bytes="00" text="WW"/><enum bytes="02" text="H+WW"/>
+    </unit>
+  </units>
+</vcontrold>
+"""
+
+
+@pytest.fixture
+def vito(tmp_path):
+    """Write vcontrold's XML files to a directory."""
+    (tmp_path / "vcontrold.xml").write_text(VCONTROLD_XML)
+    path = tmp_path / "vito.xml"
+    path.write_text(VITO_XML)
+    return path
+
+
+def test_xml_catalog(vito, tmp_path, monkeypatch):
+    """Test the commands of the selected device are compiled and cached."""
+    cache_dir = tmp_path / "cache"
+    catalog = load_catalog(vito, "20CB", cache_dir)
+    assert catalog.device_name == "VScotHO1"
+    assert catalog.commands == (
+        CatalogCommand("getTempA", "Aussentemperatur", KIND_NUMBER, "Grad Celsius"),
+        CatalogCommand(
+            "getTempSolar", "Kollektortemperatur", KIND_NUMBER, "Grad Celsius"
+        ),
+        CatalogCommand(
+            "getBetriebArtM2", "Betriebsart M2", KIND_ENUM, None, ("WW", "H+WW")
+        ),
+    )
+    assert len(list(cache_dir.iterdir())) == 1
+
+    def parse(*args):
+        raise AssertionError("catalog parsed again")
+
+    monkeypatch.setattr(catalog_module, "parse_xml_catalog", parse)
+    assert load_catalog(vito, "20CB", cache_dir) == catalog
+
+    # A changed catalog is parsed again.
+    vito.write_text(VITO_XML.replace("Aussentemperatur", "Aussen"))
+    with pytest.raises(AssertionError):
+        load_catalog(vito, "20CB", cache_dir)
+
+
+def test_catalog_device(vito, tmp_path):
+    """Test a device has to be chosen from several."""
+    with pytest.raises(CatalogError):
+        load_catalog(vito, None, tmp_path)
+    with pytest.raises(CatalogError):
+        load_catalog(vito, "FFFF", tmp_path)
+    kw2 = load_catalog(vito, "2098", tmp_path)
+    assert [command.name for command in kw2.commands] == [
+        "getTempA",
+        "getTempSolar",
+        "getKW2Only",
+    ]
+
+
+def test_json_catalog(tmp_path):
+    """Test a JSON export of a single device is read like the XML files."""
+    path = tmp_path / "vito.json"
+    path.write_text(
+        json.dumps(
+            {
+                "devices": [{"ID": "20CB", "name": "VScotHO1"}],
+                "units": [{"abbrev": "UT", "type": "short", "entity": "Grad Celsius"}],
+                "commands": [{"name": "getTempSolar", "unit": "UT"}],
+            }
+        )
+    )
+    catalog = load_catalog(path, None, tmp_path)
+    assert catalog.device_id == "20CB"
+    assert [command.name for command in catalog.commands] == ["getTempSolar"]
+
+
+def test_catalog_descriptions(vito, tmp_path):
+    """Test sensors are described for datapoints not described yet."""
+    descriptions = catalog_descriptions(load_catalog(vito, "20CB", tmp_path))
+    assert [description.key for description in descriptions] == [
+        "getTempSolar",
+        "getBetriebArtM2",
+    ]
+    solar, mode = descriptions
+    assert solar.device_class == SensorDeviceClass.TEMPERATURE
+    assert solar.native_unit_of_measurement == "°C"
+    assert mode.options == ["WW", "H+WW"]
+    assert compile_payload_decoders(descriptions)["getBetriebArtM2"] is decode_text
@@ -0,0 +1,71 @@
+"""Test the Viessmann climate and water heater entities."""
+from datetime import timedelta
+
+from homeassistant.components.climate import PRESET_ECO, HVACAction, HVACMode
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_fire_mqtt_message,
+    async_fire_time_changed,
+)
+
+from custom_components.viessmann.climate import ViessmannClimate
+from custom_components.viessmann.coordinator import ViessmannCoordinator
+from custom_components.viessmann.dispatcher import async_get_dispatcher
+from custom_components.viessmann.water_heater import ViessmannWaterHeater
+
+
+async def test_climate(hass, mqtt_mock):
+    """Test the circuit is written as one state and commands its setpoint."""
+    coordinator = ViessmannCoordinator(hass, "vcontrold", async_get_dispatcher(hass))
+    await coordinator.async_setup()
+    climate = ViessmannClimate("vcontrold", coordinator)
+    climate.hass = hass
+    await climate.async_added_to_hass()
+    water_heater = ViessmannWaterHeater("vcontrold", coordinator)
+    water_heater.hass = hass
+    await water_heater.async_added_to_hass()
+    writes = []
+    hass.bus.async_listen("state_changed", writes.append)
+
+    for key, payload in (
+        ("getBetriebArtM1", "H+WW"),
+        ("getBetriebPartyM1", "0"),
+        ("getBetriebSparM1", "1"),
+        ("getTempRaumNorSollM1", "21"),
+        ("getTempRaumRedSollM1", "17"),
+        ("getTempVListM1", "38.5"),
+        ("getPumpeStatusM1", "1"),
+        ("getTempWWist", "47.2"),
+        ("getTempWWsoll", "50"),
+    ):
+        async_fire_mqtt_message(hass, f"vcontrold/{key}", payload)
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert len(writes) == 2
+
+    state = hass.states.get("climate.vcontrold_m1")
+    assert state.state == HVACMode.HEAT
+    assert state.attributes["preset_mode"] == PRESET_ECO
+    assert state.attributes["hvac_action"] == HVACAction.HEATING
+    # Eco mode heats to the reduced setpoint.
+    assert state.attributes["temperature"] == 17.0
+    assert state.attributes["flow_temperature"] == 38.5
+    state = hass.states.get("water_heater.vcontrold_ww")
+    assert state.state == "on"
+    assert state.attributes["current_temperature"] == 47.2
+    assert state.attributes["temperature"] == 50.0
+
+    await climate.async_set_temperature(temperature=18)
+    await climate.async_set_hvac_mode(HVACMode.OFF)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=4))
+    await hass.async_block_till_done()
+    published = {
+        call.args[0]: call.args[1] for call in mqtt_mock.async_publish.call_args_list
+    }
+    assert published["vcontrold/setTempRaumRedSollM1"] == "18.0"
+    assert published["vcontrold/setBetriebArtM1"] == "WW"
+
+    await climate.async_remove()
+    await water_heater.async_remove()
+    coordinator.async_shutdown()
@@ -0,0 +1,132 @@
+"""Test the command queue and the command tracker."""
+from datetime import timedelta
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_fire_mqtt_message,
+    async_fire_time_changed,
+)
+
+from custom_components.viessmann.const import NUMBERS
+from custom_components.viessmann.coordinator import ViessmannCoordinator
+from custom_components.viessmann.dispatcher import async_get_dispatcher
+from custom_components.viessmann.number import ViessmannNumber
+
+STATE_KEY = "getTempRaumNorSollM1"
+COMMAND_TOPIC = "vcontrold/setTempRaumNorSollM1"
+
+
+def _published(mqtt_mock) -> list[tuple[str, str]]:
+    """Return the topics and payloads of the commands published."""
+    return [
+        (call.args[0], call.args[1])
+        for call in mqtt_mock.async_publish.call_args_list
+        if call.args[0] == COMMAND_TOPIC
+    ]
+
+
+async def test_command_queue(hass, mqtt_mock, caplog):
+    """Test a burst of commands is published once, with its latest value."""
+    coordinator = ViessmannCoordinator(
+        hass, "vcontrold", async_get_dispatcher(hass), command_debounce=1.0
+    )
+    await coordinator.async_setup()
+    coordinator.async_add_listener(STATE_KEY, lambda datapoint: None)
+    async_fire_mqtt_message(hass, f"vcontrold/{STATE_KEY}", "20")
+    await hass.async_block_till_done()
+    commands = coordinator.commands
+
+    for value in (20.5, 21.0, 21.5):
+        await commands.async_send(COMMAND_TOPIC, value, STATE_KEY)
+    await hass.async_block_till_done()
+    assert _published(mqtt_mock) == []
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert _published(mqtt_mock) == [(COMMAND_TOPIC, "21.5")]
+    assert (commands.stats.requested, commands.stats.coalesced) == (3, 2)
+
+    # Setting the value vcontrold reports publishes nothing.
+    async_fire_mqtt_message(hass, f"vcontrold/{STATE_KEY}", "21.5")
+    await hass.async_block_till_done()
+    await commands.async_send(COMMAND_TOPIC, 21.5, STATE_KEY)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=4))
+    await hass.async_block_till_done()
+    assert len(_published(mqtt_mock)) == 1
+    assert commands.stats.skipped_unchanged == 1
+
+    # A failed debounced publish is logged.
+    mqtt_mock.async_publish.side_effect = HomeAssistantError("not connected")
+    await commands.async_send(COMMAND_TOPIC, 22, STATE_KEY)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=6))
+    await hass.async_block_till_done()
+    assert f"Sending a command to {COMMAND_TOPIC} failed" in caplog.text
+    coordinator.async_shutdown()
+
+
+async def test_command_tracker(hass, mqtt_mock, caplog):
+    """Test commands are confirmed, retried and finally flagged."""
+    coordinator = ViessmannCoordinator(
+        hass,
+        "vcontrold",
+        async_get_dispatcher(hass),
+        command_debounce=0,
+        command_timeout=10,
+        command_retries=1,
+    )
+    await coordinator.async_setup()
+    number = ViessmannNumber(
+        unique_id="vcontrold",
+        device_friendly_name="vcontrold",
+        mqtt_root="vcontrold",
+        coordinator=coordinator,
+        description=next(
+            description for description in NUMBERS if description.key == STATE_KEY
+        ),
+    )
+    number.hass = hass
+    await number.async_added_to_hass()
+    tracker = coordinator.tracker
+    entity_id = "number.vcontrold_tempraumnorsollm1"
+
+    # Confirmed by the reported value.
+    await number.async_set_native_value(21)
+    await hass.async_block_till_done()
+    assert _published(mqtt_mock) == [(COMMAND_TOPIC, "21.0")]
+    assert STATE_KEY in tracker.pending
+    async_fire_mqtt_message(hass, f"vcontrold/{STATE_KEY}", "21")
+    await hass.async_block_till_done()
+    assert tracker.pending == {}
+    assert tracker.stats.confirmed == 1
+
+    # Published again after the timeout, then given up. A failed retry is
+    # logged.
+    await number.async_set_native_value(22)
+    await hass.async_block_till_done()
+    mqtt_mock.async_publish.side_effect = HomeAssistantError("not connected")
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    mqtt_mock.async_publish.side_effect = None
+    assert f"Sending a command to {COMMAND_TOPIC} failed" in caplog.text
+    assert _published(mqtt_mock)[1:] == [(COMMAND_TOPIC, "22.0")] * 2
+    assert tracker.stats.retried == 1
+    # The retry waits twice as long.
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=15))
+    await hass.async_block_till_done()
+    assert tracker.stats.timed_out == 0
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=25))
+    await hass.async_block_till_done()
+    assert tracker.stats.timed_out == 1
+    assert len(_published(mqtt_mock)) == 3
+    state = hass.states.get(entity_id)
+    assert state.state == "21.0"
+    assert state.attributes["unconfirmed_command"] == 22.0
+
+    # A late report of the value clears the flag.
+    async_fire_mqtt_message(hass, f"vcontrold/{STATE_KEY}", "22")
+    await hass.async_block_till_done()
+    state = hass.states.get(entity_id)
+    assert state.state == "22.0"
+    assert "unconfirmed_command" not in state.attributes
+    await number.async_remove()
+    coordinator.async_shutdown()
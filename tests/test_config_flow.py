@@ -0,0 +1,21 @@
+"""Test the Viessmann config flow."""
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.viessmann.config_flow import NestedTopic, validate_input
+from custom_components.viessmann.const import DOMAIN, MQTT_ROOT_TOPIC
+
+
+async def test_nested_roots(hass, mqtt_mock):
+    """Test a root containing or below a configured one is rejected."""
+    MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        unique_id="site/vcontrold",
+        data={MQTT_ROOT_TOPIC: "site/vcontrold"},
+    ).add_to_hass(hass)
+    for mqtt_root in ("site", "site/vcontrold/2"):
+        with pytest.raises(NestedTopic):
+            await validate_input(hass, {MQTT_ROOT_TOPIC: mqtt_root})
+    info = await validate_input(hass, {MQTT_ROOT_TOPIC: "site/vcontrold2/"})
+    assert info["title"] == "site/vcontrold2"
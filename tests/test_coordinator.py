@@ -0,0 +1,245 @@
+"""Test the decode-once value store."""
+import dataclasses
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_fire_mqtt_message,
+    async_fire_time_changed,
+)
+
+from custom_components.viessmann.cache import ViessmannValueCache
+from custom_components.viessmann.common import description_by_key
+from custom_components.viessmann.const import SENSORS
+from custom_components.viessmann.coordinator import ViessmannCoordinator
+from custom_components.viessmann.dispatcher import async_get_dispatcher
+
+
+async def test_decode_once(hass, mqtt_mock):
+    """Test a message is decoded once and shared by all listeners of a topic."""
+    coordinator = ViessmannCoordinator(hass, "vcontrold", async_get_dispatcher(hass))
+    await coordinator.async_setup()
+    received = []
+    remove_first = coordinator.async_add_listener("getTempA", received.append)
+    coordinator.async_add_listener("vcontrold/getTempA", received.append)
+    async_fire_mqtt_message(hass, "vcontrold/getTempA", "12.5")
+    await hass.async_block_till_done()
+    first, second = received
+    assert first is second is coordinator.data["getTempA"]
+    assert first.value == 12.5
+
+    # The value store is updated in place.
+    received.clear()
+    remove_first()
+    async_fire_mqtt_message(hass, "vcontrold/getTempA", "13")
+    await hass.async_block_till_done()
+    assert received == [first]
+    assert first.value == 13.0
+    coordinator.async_shutdown()
+
+
+async def test_snapshot(hass, mqtt_mock):
+    """Test a JSON snapshot only fans out changed values."""
+    coordinator = ViessmannCoordinator(hass, "vcontrold", async_get_dispatcher(hass))
+    await coordinator.async_setup()
+    updates = []
+    for key in ("getTempA", "getTempKist", "getBetriebArtM1"):
+        coordinator.async_add_listener(
+            key, lambda datapoint, key=key: updates.append((key, datapoint.value))
+        )
+
+    async_fire_mqtt_message(
+        hass,
+        "vcontrold/snapshot",
+        '{"getTempA": 12.3, "getTempKist": "40", "getBetriebArtM1": "H+WW",'
+        ' "getUnknown": 1}',
+    )
+    await hass.async_block_till_done()
+    assert sorted(updates) == [
+        ("getBetriebArtM1", "H+WW"),
+        ("getTempA", 12.3),
+        ("getTempKist", 40.0),
+    ]
+
+    updates.clear()
+    async_fire_mqtt_message(
+        hass,
+        "vcontrold/snapshot",
+        '{"getTempA": 12.3, "getTempKist": 41, "getBetriebArtM1": "H+WW"}',
+    )
+    async_fire_mqtt_message(hass, "vcontrold/snapshot", "not json")
+    await hass.async_block_till_done()
+    assert updates == [("getTempKist", 41.0)]
+
+    # Single topics keep updating listeners as before.
+    async_fire_mqtt_message(hass, "vcontrold/getTempA", "12.3")
+    await hass.async_block_till_done()
+    assert updates[-1] == ("getTempA", 12.3)
+    coordinator.async_shutdown()
+
+
+async def test_message_stats(hass, mqtt_mock):
+    """Test messages and decode errors are counted per topic."""
+    coordinator = ViessmannCoordinator(hass, "vcontrold", async_get_dispatcher(hass))
+    await coordinator.async_setup()
+    coordinator.async_add_listener("getTempA", lambda datapoint: None)
+
+    for payload in ("-- Error", b"\xff", *["12.3"] * 14):
+        async_fire_mqtt_message(hass, "vcontrold/getTempA", payload)
+    async_fire_mqtt_message(hass, "vcontrold/snapshot", "[]")
+    await hass.async_block_till_done()
+
+    stats = coordinator.message_stats
+    assert stats.messages == {"snapshot": 1, "getTempA": 16}
+    assert stats.decode_errors == {"snapshot": 1, "getTempA": 2}
+    # Every 16th message of a topic is timed.
+    assert stats.callback_time.count == 1
+    assert coordinator.data["getTempA"].value == 12.3
+    coordinator.async_shutdown()
+
+
+async def test_value_cache(hass, mqtt_mock, hass_storage):
+    """Test cached values are loaded, go stale and are saved again."""
+    now = dt_util.utcnow()
+    hass_storage["viessmann.entry.values"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": "viessmann.entry.values",
+        "data": {
+            "values": {
+                "getTempA": [12.3, (now - timedelta(minutes=50)).isoformat()],
+                "getTempKist": [40.0, (now - timedelta(minutes=5)).isoformat()],
+            }
+        },
+    }
+    coordinator = ViessmannCoordinator(
+        hass,
+        "vcontrold",
+        async_get_dispatcher(hass),
+        cache=ViessmannValueCache(hass, "entry"),
+        cache_max_age=3600,
+    )
+    await coordinator.async_setup()
+    assert coordinator.last_value("vcontrold/getTempA").value == 12.3
+    assert coordinator.stale == set()
+    stale = []
+    coordinator.async_add_stale_listener("getTempA", lambda: stale.append("getTempA"))
+    coordinator.async_add_listener("getTempKist", lambda datapoint: None)
+
+    async_fire_time_changed(hass, now + timedelta(minutes=11))
+    await hass.async_block_till_done()
+    assert stale == ["getTempA"]
+    assert coordinator.stale == {"getTempA"}
+
+    async_fire_mqtt_message(hass, "vcontrold/getTempKist", "41")
+    await hass.async_block_till_done()
+    assert "getTempKist" not in coordinator.cached
+    assert coordinator.last_value("getTempKist").value == 41.0
+
+    async_fire_time_changed(hass, now + timedelta(minutes=14))
+    await hass.async_block_till_done()
+    values = hass_storage["viessmann.entry.values"]["data"]["values"]
+    assert values["getTempA"][0] == 12.3
+    assert values["getTempKist"][0] == 41.0
+    coordinator.async_shutdown()
+
+
+async def test_discovery(hass, mqtt_mock):
+    """Test datapoints are announced once seen, in batches."""
+    coordinator = ViessmannCoordinator(
+        hass, "vcontrold", async_get_dispatcher(hass), discovery_window=60
+    )
+    await coordinator.async_setup()
+    discovered = []
+    coordinator.discovery.async_add_listener(discovered.append)
+    now = dt_util.utcnow()
+
+    async_fire_mqtt_message(hass, "vcontrold/getTempA", "12.3")
+    async_fire_mqtt_message(hass, "vcontrold/getTempA", "12.4")
+    async_fire_mqtt_message(hass, "vcontrold/snapshot", '{"getTempKist": 40}')
+    async_fire_mqtt_message(hass, "vcontrold/getUnknown", "1")
+    await hass.async_block_till_done()
+    assert discovered == []
+    assert coordinator.last_value("getTempA").value == 12.3
+
+    async_fire_time_changed(hass, now + timedelta(seconds=61))
+    await hass.async_block_till_done()
+    assert discovered == [["getTempA", "getTempKist"]]
+
+    async_fire_mqtt_message(hass, "vcontrold/getTempWWist", "48")
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, now + timedelta(seconds=64))
+    await hass.async_block_till_done()
+    assert discovered[1:] == [["getTempWWist"]]
+    assert coordinator.discovery.seen == {"getTempA", "getTempKist", "getTempWWist"}
+    coordinator.async_shutdown()
+
+
+async def test_availability(hass, mqtt_mock):
+    """Test datapoints expire without values and with the bridge offline."""
+    coordinator = ViessmannCoordinator(hass, "vcontrold", async_get_dispatcher(hass))
+    await coordinator.async_setup()
+    availability = coordinator.availability
+    changes = []
+    for key in ("getTempA", "getTempKist"):
+        coordinator.async_add_listener(key, lambda datapoint: None)
+        availability.async_add_listener(key, lambda key=key: changes.append(key))
+    now = dt_util.utcnow()
+
+    async_fire_mqtt_message(hass, "vcontrold/getTempA", "12.3")
+    async_fire_mqtt_message(hass, "vcontrold/getTempKist", "40")
+    await hass.async_block_till_done()
+    assert availability.is_available("getTempA")
+
+    # getTempKist is polled every minute, getTempA every five.
+    async_fire_time_changed(hass, now + timedelta(seconds=200))
+    await hass.async_block_till_done()
+    assert changes == ["getTempKist"]
+    assert not availability.is_available("getTempKist")
+    assert availability.is_available("getTempA")
+
+    async_fire_mqtt_message(hass, "vcontrold/getTempKist", "40")
+    await hass.async_block_till_done()
+    assert changes == ["getTempKist", "getTempKist"]
+    assert availability.is_available("getTempKist")
+
+    # The bridge's last will takes all datapoints down in one pass.
+    changes.clear()
+    async_fire_mqtt_message(hass, "vcontrold/status", "offline")
+    await hass.async_block_till_done()
+    assert sorted(changes) == ["getTempA", "getTempKist"]
+    assert not availability.is_available("getTempA")
+    async_fire_mqtt_message(hass, "vcontrold/status", "Online")
+    await hass.async_block_till_done()
+    assert availability.is_available("getTempA")
+    assert len(changes) == 4
+    coordinator.async_shutdown()
+
+
+async def test_state_converters(hass):
+    """Test converters are compiled once per entry and description."""
+    description = description_by_key(SENSORS, "getTempA")
+    dispatcher = async_get_dispatcher(hass)
+    coordinators = [
+        ViessmannCoordinator(
+            hass,
+            "vcontrold",
+            dispatcher,
+            extra_descriptions=(
+                dataclasses.replace(
+                    description, key="getTempScaled", value_fn=lambda v, f=factor: v * f
+                ),
+            ),
+        )
+        for factor in (10, 100)
+    ]
+    first, second = coordinators
+    convert = first.state_converter(description)
+    assert first.state_converter(description) is convert
+    assert convert(1.5) == 1.5
+    # Catalog descriptions of one key convert by their own entry's rules.
+    assert first.state_converter(first.extra_descriptions[0])(1.5) == 15
+    assert second.state_converter(second.extra_descriptions[0])(1.5) == 150
+    # Unloading forgets the converters with the descriptions.
+    first.async_shutdown()
+    assert not first._converters
@@ -0,0 +1,47 @@
+"""Test the shared MQTT dispatcher."""
+from pytest_homeassistant_custom_component.common import async_fire_mqtt_message
+
+from custom_components.viessmann.coordinator import ViessmannCoordinator
+from custom_components.viessmann.dispatcher import async_get_dispatcher
+
+
+async def test_dispatcher_routing(hass, mqtt_mock):
+    """Test messages of several roots reach only their own listeners."""
+    dispatcher = async_get_dispatcher(hass)
+    first = ViessmannCoordinator(hass, "vcontrold", dispatcher)
+    second = ViessmannCoordinator(hass, "heater2", dispatcher)
+    await first.async_setup()
+    await second.async_setup()
+    assert sorted(dispatcher.roots) == ["heater2", "vcontrold"]
+
+    received = []
+
+    def listener(name):
+        return lambda datapoint: received.append((name, datapoint.value))
+
+    remove_first_a = first.async_add_listener("getTempA", listener("first A"))
+    remove_other_a = first.async_add_listener("getTempA", listener("other A"))
+    second.async_add_listener("getTempA", listener("second A"))
+    async_fire_mqtt_message(hass, "vcontrold/getTempA", "1")
+    async_fire_mqtt_message(hass, "heater2/getTempA", "2")
+    await hass.async_block_till_done()
+    assert received == [("first A", 1.0), ("other A", 1.0), ("second A", 2.0)]
+
+    # Removing the last listener of a topic drops its route.
+    received.clear()
+    remove_first_a()
+    remove_other_a()
+    async_fire_mqtt_message(hass, "vcontrold/getTempA", "3")
+    async_fire_mqtt_message(hass, "heater2/getTempA", "4")
+    await hass.async_block_till_done()
+    assert received == [("second A", 4.0)]
+    assert "vcontrold/getTempA" not in dispatcher._callbacks
+
+    # Shutting down an entry drops its wildcard subscription only.
+    first.async_shutdown()
+    assert dispatcher.roots == ["heater2"]
+    async_fire_mqtt_message(hass, "heater2/getTempA", "5")
+    await hass.async_block_till_done()
+    assert received == [("second A", 4.0), ("second A", 5.0)]
+    second.async_shutdown()
+    assert dispatcher.roots == []
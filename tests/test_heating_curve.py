@@ -0,0 +1,78 @@
+"""Test the heating curve estimator."""
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    async_fire_mqtt_message,
+    async_fire_time_changed,
+)
+
+from custom_components.viessmann.coordinator import ViessmannCoordinator
+from custom_components.viessmann.dispatcher import async_get_dispatcher
+from custom_components.viessmann.heating_curve import (
+    ViessmannCurveFit,
+    ViessmannHeatingCurve,
+    curve_feature,
+)
+
+
+def flow_target(outside, slope, level, room=20.0):
+    """Return the flow temperature the controller targets."""
+    return room + level + slope * curve_feature(outside, room)
+
+
+def test_curve_fit():
+    """Test the fit recovers the curve and follows a changed one."""
+    fit = ViessmannCurveFit()
+    for outside in range(-10, 16):
+        fit.add(curve_feature(outside, 20.0), flow_target(outside, 1.4, 3.0) - 20.0)
+    assert fit.slope == pytest.approx(1.4)
+    assert fit.intercept == pytest.approx(3.0)
+    assert fit.r_squared == pytest.approx(1.0)
+
+    # With forgetting, a new slope takes over the old samples.
+    forget = 0.98
+    for _ in range(8):
+        for outside in range(-10, 16):
+            fit.add(
+                curve_feature(outside, 20.0),
+                flow_target(outside, 1.0, 0.0) - 20.0,
+                forget,
+            )
+    assert fit.slope == pytest.approx(1.0, abs=0.01)
+
+    # The sums are all that is needed to carry on.
+    assert ViessmannCurveFit(fit.sums).slope == fit.slope
+
+
+def test_curve_fit_undetermined():
+    """Test no estimate is given without spread of outside temperatures."""
+    fit = ViessmannCurveFit()
+    for _ in range(20):
+        fit.add(curve_feature(5.0, 20.0), 20.0)
+    assert fit.slope is None and fit.intercept is None and fit.r_squared is None
+
+
+async def test_heating_curve(hass, mqtt_mock, hass_storage):
+    """Test samples are taken from the stored values while heating."""
+    heating_curve = ViessmannHeatingCurve(hass, "entry", 0)
+    coordinator = ViessmannCoordinator(
+        hass, "vcontrold", async_get_dispatcher(hass), heating_curve=heating_curve
+    )
+    await coordinator.async_setup()
+    now = dt_util.utcnow()
+    for minutes, outside in enumerate((-5.0, 0.0, 5.0, 10.0, 15.0, 25.0)):
+        async_fire_mqtt_message(hass, "vcontrold/getTempA", str(outside))
+        async_fire_mqtt_message(
+            hass,
+            "vcontrold/getTempVLsollM1",
+            f"{max(flow_target(outside, 1.4, 3.0), 20.0):.1f}",
+        )
+        await hass.async_block_till_done()
+        async_fire_time_changed(hass, now + timedelta(minutes=5 * (minutes + 1)))
+        await hass.async_block_till_done()
+    # The summer sample does not heat; the actual flow was never received.
+    assert heating_curve.fits["target"].weight == 5
+    assert heating_curve.fits["actual"].weight == 0
+    coordinator.async_shutdown()
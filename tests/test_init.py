@@ -1,9 +1,62 @@
 """Test component setup."""
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_PORT, CONF_USERNAME
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.viessmann.const import DOMAIN
+from custom_components.viessmann import async_migrate_entry
+from custom_components.viessmann.const import DOMAIN, MQTT_ROOT_TOPIC
 
 
 async def test_async_setup(hass):
     """Test the component gets setup."""
     assert await async_setup_component(hass, DOMAIN, {}) is True
+
+
+async def test_migrate_entry(hass):
+    """Test an entry of the first config flow gets the root as unique id.
+
+    The placeholder host and credentials of the first flow are dropped.
+    """
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=1,
+        unique_id="vcontrold",
+        data={
+            CONF_HOST: "localhost",
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "secret",
+            MQTT_ROOT_TOPIC: "heater2/",
+        },
+    )
+    entry.add_to_hass(hass)
+    device_registry = dr.async_get(hass)
+    device = device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(DOMAIN, "vcontrold")}
+    )
+    entity_registry = er.async_get(hass)
+    sensor = entity_registry.async_get_or_create(
+        "sensor", DOMAIN, "vcontrold_tempa", config_entry=entry
+    )
+
+    assert await async_migrate_entry(hass, entry)
+    assert entry.version == 2
+    assert entry.unique_id == "heater2"
+    assert entry.data == {MQTT_ROOT_TOPIC: "heater2"}
+    assert device_registry.async_get(device.id).identifiers == {(DOMAIN, "heater2")}
+    assert entity_registry.async_get(sensor.entity_id).unique_id == "heater2_tempa"
+
+    # The vcontrold host of a transport entry is kept.
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=1,
+        unique_id="heater3",
+        data={
+            CONF_HOST: "vcontrold.local",
+            CONF_PORT: 3002,
+            MQTT_ROOT_TOPIC: "heater3",
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await async_migrate_entry(hass, entry)
+    assert entry.data[CONF_HOST] == "vcontrold.local"
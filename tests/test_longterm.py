@@ -0,0 +1,103 @@
+"""Test the long-term statistics buckets."""
+from homeassistant import loader
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_mqtt_message,
+)
+
+from custom_components.viessmann.const import CONF_LONG_TERM, DOMAIN, MQTT_ROOT_TOPIC
+from custom_components.viessmann.coordinator import ViessmannCoordinator
+from custom_components.viessmann.dispatcher import async_get_dispatcher
+from custom_components.viessmann.longterm import ViessmannBuckets
+
+# A full hour as a POSIX timestamp.
+HOUR = 1_700_002_800
+
+
+def test_buckets():
+    """Test samples are merged into five-minute buckets and their hours."""
+    buckets = ViessmannBuckets(HOUR)
+    for offset, value in ((0, 40.0), (60, 42.0), (299, 44.0), (300, 50.0)):
+        buckets.add(HOUR + offset, value)
+    # The first bucket was closed by the sample of the second one.
+    assert buckets.changed
+    (hour,) = buckets.take()
+    assert (hour.start, hour.count, hour.mean) == (HOUR, 3, 42.0)
+    assert not buckets.changed
+
+    # Closing on time merges the open bucket into the same hour.
+    buckets.close(HOUR + 599)
+    assert not buckets.changed
+    buckets.close(HOUR + 600)
+    (hour,) = buckets.take()
+    assert (hour.count, hour.minimum, hour.maximum) == (4, 40.0, 50.0)
+    assert hour.as_statistic()["mean"] == 44.0
+
+    # A new hour completes the previous one, which is taken once more.
+    buckets.add(HOUR + 3600, 30.0)
+    buckets.close(HOUR + 3900)
+    previous, current = buckets.take()
+    assert previous is hour
+    assert (current.start, current.mean) == (HOUR + 3600, 30.0)
+    assert buckets.take() == [current]
+
+
+def test_buckets_after_restart():
+    """Test the hour open when collecting started is never imported."""
+    buckets = ViessmannBuckets(HOUR + 1800)
+    buckets.add(HOUR + 1800, 40.0)
+    buckets.close(HOUR + 2100)
+    assert not buckets.changed
+    assert buckets.take() == []
+
+    # The next hour is complete.
+    buckets.add(HOUR + 3600, 30.0)
+    buckets.close(HOUR + 3900)
+    (hour,) = buckets.take()
+    assert (hour.start, hour.mean) == (HOUR + 3600, 30.0)
+
+
+async def test_long_term_samples(hass, mqtt_mock):
+    """Test only the chosen datapoints are collected."""
+    coordinator = ViessmannCoordinator(
+        hass, "vcontrold", async_get_dispatcher(hass), long_term=["getTempKist"]
+    )
+    await coordinator.async_setup()
+    for key in ("getTempKist", "getTempA"):
+        coordinator.async_add_listener(key, lambda datapoint: None)
+    async_fire_mqtt_message(
+        hass, "vcontrold/snapshot", '{"getTempKist": 40, "getTempA": 12.3}'
+    )
+    async_fire_mqtt_message(hass, "vcontrold/getTempKist", "40")
+    await hass.async_block_till_done()
+    assert list(coordinator.long_term.buckets) == ["getTempKist"]
+    assert coordinator.long_term.buckets["getTempKist"].bucket.count == 2
+    # Without the recorder, the collected hours are dropped on shutdown.
+    coordinator.async_shutdown()
+    assert not coordinator.long_term.buckets["getTempKist"].changed
+
+
+async def test_long_term_sensor(hass, mqtt_mock):
+    """Test a sensor with long-term statistics still follows its datapoint."""
+    # Load the integration from custom_components.
+    hass.data.pop(loader.DATA_CUSTOM_COMPONENTS)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={MQTT_ROOT_TOPIC: "vcontrold"},
+        options={CONF_LONG_TERM: ["getTempKist"]},
+        unique_id="vcontrold",
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    async_fire_mqtt_message(hass, "vcontrold/getTempKist", "40.5")
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.vcontrold_tempkist")
+    assert state.state == "40.5"
+    # The statistics are imported, the sensor compiles none of its own.
+    assert "state_class" not in state.attributes
+    # Further values are written at most every five minutes.
+    async_fire_mqtt_message(hass, "vcontrold/getTempKist", "45.0")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.vcontrold_tempkist").state == "40.5"
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,62 @@
+"""Test the rolling window statistics."""
+import statistics
+
+from pytest_homeassistant_custom_component.common import async_fire_mqtt_message
+
+from custom_components.viessmann.coordinator import ViessmannCoordinator
+from custom_components.viessmann.dispatcher import async_get_dispatcher
+from custom_components.viessmann.rolling import ViessmannRollingWindow
+
+
+def test_rolling_window():
+    """Test the statistics follow samples entering and leaving the window."""
+    window = ViessmannRollingWindow(60, size=4)
+    assert window.mean is None and window.minimum is None and window.stddev is None
+    samples = [(0, 5.0), (10, 3.0), (20, 8.0), (30, 4.0)]
+    for timestamp, value in samples:
+        window.add(timestamp, value)
+    assert window.mean == 5.0
+    assert (window.minimum, window.maximum) == (3.0, 8.0)
+    assert window.stddev == statistics.stdev([5.0, 3.0, 8.0, 4.0])
+
+    # A full ring drops its oldest sample.
+    window.add(40, 6.0)
+    assert len(window) == 4
+    assert window.mean == statistics.mean([3.0, 8.0, 4.0, 6.0])
+
+    # Samples older than the window leave it, the minimum first.
+    window.expire(85)
+    assert len(window) == 2
+    assert (window.minimum, window.maximum) == (4.0, 6.0)
+    window.expire(200)
+    assert len(window) == 0
+    assert window.maximum is None and window.mean is None
+
+
+def test_rolling_window_constant():
+    """Test constant samples have no spurious variance."""
+    window = ViessmannRollingWindow(3600)
+    for timestamp in range(1000):
+        window.add(timestamp, 40.1)
+    assert window.stddev == 0.0
+    assert window.mean == 40.1
+
+
+async def test_rolling_samples(hass, mqtt_mock):
+    """Test unchanged samples are added to the window too.
+
+    Windows only exist once a rolling sensor asked for them, even for a
+    datapoint already received.
+    """
+    coordinator = ViessmannCoordinator(hass, "vcontrold", async_get_dispatcher(hass))
+    await coordinator.async_setup()
+    coordinator.async_add_listener("getTempKist", lambda datapoint: None)
+    assert coordinator.rolling == {}
+    window = coordinator.rolling_window("getTempKist")
+    for payload in ("40", "40", "43"):
+        async_fire_mqtt_message(hass, "vcontrold/getTempKist", payload)
+    async_fire_mqtt_message(hass, "vcontrold/snapshot", '{"getTempKist": 43}')
+    await hass.async_block_till_done()
+    assert len(window) == 4
+    assert window.mean == 41.5
+    coordinator.async_shutdown()
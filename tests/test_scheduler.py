@@ -0,0 +1,75 @@
+"""Test the adaptive poll scheduler."""
+from datetime import timedelta
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.viessmann.scheduler import ViessmannPollScheduler
+
+
+async def test_adaptive_intervals(hass):
+    """Test intervals tighten on changes and back off while stable."""
+    reads = []
+
+    async def read(keys):
+        reads.append(keys)
+
+    scheduler = ViessmannPollScheduler(
+        hass, read, 1.0, {"getA": 60.0, "getB": 60.0, "getC": 600.0}
+    )
+    scheduler.async_start()
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert reads == [["getA", "getB", "getC"]]
+
+    scheduler.async_observe("getA", True)
+    scheduler.async_observe("getB", False)
+    for _ in range(10):
+        scheduler.async_observe("getC", False)
+    assert scheduler.intervals == {"getA": 30.0, "getB": 90.0, "getC": 4800.0}
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=31))
+    await hass.async_block_till_done()
+    assert reads[-1] == ["getA"]
+    scheduler.async_stop()
+
+
+async def test_read_budget(hass):
+    """Test reads over the budget are deferred, not dropped."""
+    reads = []
+
+    async def read(keys):
+        reads.append(keys)
+
+    scheduler = ViessmannPollScheduler(
+        hass, read, 0.5, {"getA": 60.0, "getB": 60.0, "getC": 60.0}
+    )
+    scheduler.async_start()
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert reads == [["getA", "getB"]]
+    assert scheduler.stats.deferred == 1
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert reads == [["getA", "getB"], ["getC"]]
+    scheduler.async_stop()
+
+
+async def test_failed_read(hass):
+    """Test a failed read is logged and requested again when due."""
+    reads = []
+
+    async def read(keys):
+        reads.append(keys)
+        raise HomeAssistantError("not connected")
+
+    scheduler = ViessmannPollScheduler(hass, read, 1.0, {"getA": 60.0})
+    scheduler.async_start()
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=61))
+    await hass.async_block_till_done()
+    assert reads == [["getA"], ["getA"]]
+    scheduler.async_stop()
@@ -0,0 +1,117 @@
+"""Test the Viessmann sensors."""
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_fire_mqtt_message,
+    async_fire_time_changed,
+)
+
+from custom_components.viessmann.const import SENSORS
+from custom_components.viessmann.coordinator import ViessmannCoordinator
+from custom_components.viessmann.dispatcher import async_get_dispatcher
+from custom_components.viessmann.sensor import ViessmannAggregateSensor
+
+
+async def test_write_policy(hass, mqtt_mock, add_test_sensor):
+    """Test unchanged values and changes within the deadband are not written."""
+    coordinator, sensor = await add_test_sensor(
+        deadband=0.5,
+        value_fn=lambda value: None if value == "n/a" else float(value),
+    )
+    stats = coordinator.write_stats
+
+    def publish(payload):
+        async_fire_mqtt_message(hass, "vcontrold/getTempTest", payload)
+
+    publish("20.0")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.vcontrold_temptest").state == "20.0"
+    assert stats.written == 1
+
+    # Within the deadband of the written state, even after several steps.
+    publish("20.3")
+    publish("20.4")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.vcontrold_temptest").state == "20.0"
+    assert (stats.written, stats.suppressed_deadband) == (1, 2)
+
+    publish("20.6")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.vcontrold_temptest").state == "20.6"
+    assert stats.written == 2
+
+    # A republished, unchanged value is not written again.
+    publish("20.6")
+    await hass.async_block_till_done()
+    assert (stats.written, stats.suppressed_unchanged) == (2, 1)
+
+    # Turning unknown and back is always written.
+    publish("n/a")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.vcontrold_temptest").state == "unknown"
+    publish("20.7")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.vcontrold_temptest").state == "20.7"
+    assert stats.written == 4
+
+    # So is turning unavailable and back.
+    coordinator.availability.async_set_bridge(False)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.vcontrold_temptest").state == "unavailable"
+    coordinator.availability.async_set_bridge(True)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.vcontrold_temptest").state == "20.7"
+    await sensor.async_remove()
+    coordinator.async_shutdown()
+
+
+async def test_write_every_value(hass, mqtt_mock, add_test_sensor):
+    """Test every value is written without write_on_change."""
+    coordinator, sensor = await add_test_sensor(write_on_change=False, deadband=0.5)
+    for payload in ("20.0", "20.0", "20.1"):
+        async_fire_mqtt_message(hass, "vcontrold/getTempTest", payload)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.vcontrold_temptest").state == "20.1"
+    assert coordinator.write_stats.written == 3
+    assert coordinator.write_stats.suppressed == 0
+    await sensor.async_remove()
+    coordinator.async_shutdown()
+
+
+async def test_aggregate_sensor(hass, mqtt_mock):
+    """Test the changes of a poll cycle are written in one state update."""
+    coordinator = ViessmannCoordinator(hass, "vcontrold", async_get_dispatcher(hass))
+    await coordinator.async_setup()
+    keys = ("getTempRL17A", "getTempSpu", "getPumpeDrehzahlIntern")
+    sensor = ViessmannAggregateSensor(
+        "vcontrold",
+        coordinator,
+        [description for description in SENSORS if description.key in keys],
+    )
+    sensor.hass = hass
+    await sensor.async_added_to_hass()
+    writes = []
+    hass.bus.async_listen("state_changed", writes.append)
+
+    for key, payload in zip(keys, ("35.04", "48.0", "40")):
+        async_fire_mqtt_message(hass, f"vcontrold/{key}", payload)
+    await hass.async_block_till_done()
+    assert writes == []
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert len(writes) == 1
+    state = hass.states.get("sensor.vcontrold_diagnostics")
+    assert state.attributes["TempRL17A"] == 35.0
+    assert state.attributes["TempSpu"] == 48.0
+    assert state.attributes["PumpeDrehzahlIntern"] == 40.0
+
+    # Unchanged values are not written again.
+    async_fire_mqtt_message(hass, "vcontrold/getTempSpu", "48.0")
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=4))
+    await hass.async_block_till_done()
+    assert len(writes) == 1
+    await sensor.async_remove()
+    coordinator.async_shutdown()
@@ -0,0 +1,64 @@
+"""Test the state write rate limiter."""
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_fire_mqtt_message,
+    async_fire_time_changed,
+)
+
+
+async def test_trailing_flush(hass, mqtt_mock, add_test_sensor):
+    """Test a burst writes its first value at once and its last one later."""
+    coordinator, sensor = await add_test_sensor(
+        min_update_interval=timedelta(seconds=10)
+    )
+    writes = []
+    hass.bus.async_listen("state_changed", writes.append)
+    for payload in ("10", "20", "30"):
+        async_fire_mqtt_message(hass, "vcontrold/getTempTest", payload)
+    await hass.async_block_till_done()
+    assert [write.data["new_state"].state for write in writes] == ["10.0"]
+    assert coordinator.write_stats.throttled == 2
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=5))
+    await hass.async_block_till_done()
+    assert len(writes) == 1
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert [write.data["new_state"].state for write in writes] == ["10.0", "30.0"]
+
+    # Nothing is held back, so no further write follows.
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=30))
+    await hass.async_block_till_done()
+    assert len(writes) == 2
+    assert coordinator.write_stats.written == 2
+
+    # Republishing the written value is counted once, when it comes in.
+    async_fire_mqtt_message(hass, "vcontrold/getTempTest", "30")
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=45))
+    await hass.async_block_till_done()
+    assert coordinator.write_stats.suppressed_unchanged == 1
+    assert len(writes) == 2
+    await sensor.async_remove()
+    coordinator.async_shutdown()
+
+
+async def test_flush_cancelled_on_remove(hass, mqtt_mock, add_test_sensor):
+    """Test a removed entity is not written by a pending flush."""
+    coordinator, sensor = await add_test_sensor(
+        min_update_interval=timedelta(seconds=10)
+    )
+    for payload in ("10", "20"):
+        async_fire_mqtt_message(hass, "vcontrold/getTempTest", payload)
+    await hass.async_block_till_done()
+    assert coordinator.write_stats.throttled == 1
+
+    await sensor.async_remove()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert coordinator.write_stats.written == 1
+    assert hass.states.get("sensor.vcontrold_temptest") is None
+    coordinator.async_shutdown()
@@ -0,0 +1,109 @@
+"""Test the memory-mapped time series."""
+from unittest.mock import Mock
+
+from pytest_homeassistant_custom_component.common import async_fire_mqtt_message
+
+from custom_components.viessmann.const import DOMAIN
+from custom_components.viessmann.coordinator import ViessmannCoordinator
+from custom_components.viessmann.dispatcher import async_get_dispatcher
+from custom_components.viessmann.timeseries import ViessmannTimeSeries, downsample
+from custom_components.viessmann.websocket import websocket_timeseries
+
+
+def test_timeseries_ring(tmp_path):
+    """Test samples wrap around the ring and survive reopening."""
+    path = tmp_path / "viessmann" / "getTempA.bin"
+    series = ViessmannTimeSeries(path, capacity=8)
+    series.open()
+    assert path.stat().st_size == 16 + 8 * 16
+    for second in range(12):
+        series.append(1000.0 + second, float(second))
+    assert len(series) == 8
+    # The oldest four samples were overwritten, a range crossing the end
+    # of the ring comes as two views.
+    assert series.segments(0, 2000)[0].tolist()[:2] == [1004.0, 4.0]
+    assert len(series.segments(1005, 1010)) == 2
+    assert series.query(1005, 1010) == [(1000.0 + i, float(i)) for i in range(5, 11)]
+    assert series.query(1011.5, 2000) == []
+    # Averaged down, the remainder forms a last, smaller group.
+    assert series.query(0, 2000, points=3) == [
+        (1005.0, 5.0),
+        (1008.0, 8.0),
+        (1010.5, 10.5),
+    ]
+    series.close()
+
+    series = ViessmannTimeSeries(path, capacity=8)
+    series.open()
+    assert series.query(1010, 1011) == [(1010.0, 10.0), (1011.0, 11.0)]
+    # A snapshot is unaffected by later samples and outlives the mapping.
+    snapshot = series.snapshot(1004, 1011)
+    for second in range(12, 16):
+        series.append(1000.0 + second, float(second))
+    series.close()
+    assert downsample(snapshot, points=2) == [(1005.5, 5.5), (1009.5, 9.5)]
+
+    # Another capacity starts over.
+    series = ViessmannTimeSeries(path, capacity=4)
+    series.open()
+    assert len(series) == 0
+    assert path.stat().st_size == 16 + 4 * 16
+    series.close()
+
+
+async def test_timeseries_samples(hass, mqtt_mock, tmp_path):
+    """Test the chosen datapoints append every sample."""
+    hass.config.config_dir = str(tmp_path)
+    coordinator = ViessmannCoordinator(
+        hass, "vcontrold", async_get_dispatcher(hass), timeseries=["getTempKist"]
+    )
+    await coordinator.async_setup()
+    for key in ("getTempKist", "getTempA"):
+        coordinator.async_add_listener(key, lambda datapoint: None)
+    for payload in ("40", "40", "41.5"):
+        async_fire_mqtt_message(hass, "vcontrold/getTempKist", payload)
+    async_fire_mqtt_message(hass, "vcontrold/getTempA", "12.3")
+    await hass.async_block_till_done()
+    series = coordinator.timeseries["getTempKist"]
+    assert list(coordinator.timeseries) == ["getTempKist"]
+    assert [value for _, value in series.query(0, 1e10)] == [40.0, 40.0, 41.5]
+    assert (tmp_path / "viessmann" / "vcontrold" / "getTempKist.bin").exists()
+    coordinator.async_shutdown()
+    await hass.async_block_till_done()
+    assert coordinator.timeseries == {}
+
+
+async def test_websocket_timeseries(hass, mqtt_mock, tmp_path):
+    """Test a time range of a series is sent over the websocket API."""
+    hass.config.config_dir = str(tmp_path)
+    coordinator = ViessmannCoordinator(
+        hass, "vcontrold", async_get_dispatcher(hass), timeseries=["getTempKist"]
+    )
+    await coordinator.async_setup()
+    coordinator.async_add_listener("getTempKist", lambda datapoint: None)
+    for payload in ("40", "42", "44"):
+        async_fire_mqtt_message(hass, "vcontrold/getTempKist", payload)
+    await hass.async_block_till_done()
+    hass.data[DOMAIN] = {"entry": coordinator}
+
+    connection = Mock()
+    msg = {
+        "id": 1,
+        "type": "viessmann/timeseries",
+        "entry_id": "entry",
+        "key": "getTempKist",
+        "start_time": "2000-01-01T00:00:00+00:00",
+        "points": 1,
+    }
+    websocket_timeseries(hass, connection, msg)
+    await hass.async_block_till_done()
+    msg_id, result = connection.send_result.call_args.args
+    assert msg_id == 1
+    ((_, value),) = result["samples"]
+    assert value == 42.0
+
+    websocket_timeseries(hass, connection, {**msg, "id": 2, "key": "getTempA"})
+    await hass.async_block_till_done()
+    assert connection.send_error.call_args.args[:2] == (2, "not_found")
+    coordinator.async_shutdown()
+    await hass.async_block_till_done()
@@ -0,0 +1,105 @@
+"""Test the direct vcontrold transport against the fake daemon."""
+import pytest
+
+from custom_components.viessmann.coordinator import ViessmannCoordinator
+from custom_components.viessmann.dispatcher import async_get_dispatcher
+from custom_components.viessmann.transport import (
+    VcontroldError,
+    ViessmannTransport,
+    parse_response,
+)
+
+from .fake_vcontrold import FakeVcontrold
+
+VALUES = {
+    "getTempA": "12.300000 Grad Celsius",
+    "getTempRaumNorSollM1": "21.000000 Grad Celsius",
+    "getBetriebArtM1": "H+WW",
+}
+
+
+@pytest.fixture
+async def vcontrold(socket_enabled):
+    """Run a fake vcontrold daemon."""
+    daemon = FakeVcontrold(VALUES)
+    await daemon.start()
+    yield daemon
+    await daemon.stop()
+
+
+def test_parse_response():
+    """Test units are stripped and errors are dropped."""
+    assert parse_response(b"12.300000 Grad Celsius\n") == b"12.300000"
+    assert parse_response(b"H+WW\n") == b"H+WW"
+    assert parse_response(b"ERR: command unknown\n") is None
+
+
+async def test_pipelined_read(vcontrold):
+    """Test a batch of reads uses one connection and one round trip."""
+    transport = ViessmannTransport("127.0.0.1", vcontrold.port)
+    values = await transport.async_read(["getTempA", "getBetriebArtM1", "getFoo"])
+    assert values == {
+        "getTempA": b"12.300000",
+        "getBetriebArtM1": b"H+WW",
+        "getFoo": None,
+    }
+    await transport.async_read(["getTempA"])
+    assert vcontrold.connections == 1
+    assert transport.stats.batches == 2
+    assert transport.stats.commands == 4
+    await transport.async_close()
+
+
+async def test_write_and_reconnect(vcontrold):
+    """Test set commands and reconnecting after the daemon dropped us."""
+    transport = ViessmannTransport("127.0.0.1", vcontrold.port)
+    await transport.async_write("setTempRaumNorSollM1", "22.0")
+    assert (await transport.async_read(["getTempRaumNorSollM1"])) == {
+        "getTempRaumNorSollM1": b"22.0"
+    }
+
+    vcontrold.drop_connections()
+    with pytest.raises(VcontroldError):
+        await transport.async_read(["getTempA"])
+    assert not transport.connected
+    assert (await transport.async_read(["getTempA"]))["getTempA"] == b"12.300000"
+    assert vcontrold.connections == 2
+    await transport.async_close()
+
+
+async def test_coordinator_with_transport(hass, vcontrold):
+    """Test the value store is fed by the transport instead of MQTT."""
+    coordinator = ViessmannCoordinator(
+        hass,
+        "vcontrold",
+        async_get_dispatcher(hass),
+        command_debounce=0,
+        transport=ViessmannTransport("127.0.0.1", vcontrold.port),
+    )
+    await coordinator.async_setup()
+    updates = []
+    coordinator.async_add_listener("vcontrold/getTempA", updates.append)
+    coordinator.async_add_listener("vcontrold/getTempRaumNorSollM1", updates.append)
+
+    await coordinator.async_refresh()
+    assert coordinator.data["getTempA"].value == 12.3
+    assert coordinator.data["getTempRaumNorSollM1"].value == 21.0
+    assert updates
+
+    # Commands are written to vcontrold and confirmed by reading back.
+    await coordinator.commands.async_send(
+        "vcontrold/setTempRaumNorSollM1", 22.0, "getTempRaumNorSollM1"
+    )
+    assert "setTempRaumNorSollM1 22.0" in vcontrold.commands
+    assert coordinator.data["getTempRaumNorSollM1"].value == 22.0
+    assert coordinator.tracker.stats.confirmed == 1
+
+    # A failed poll marks the bridge offline until vcontrold answers again.
+    vcontrold.drop_connections()
+    await coordinator.async_request_read(["getTempA"])
+    assert not coordinator.availability.bridge_online
+    await coordinator.async_request_read(["getTempA"])
+    assert coordinator.availability.bridge_online
+
+    coordinator.async_shutdown()
+    await hass.async_block_till_done()
@@ -0,0 +1,67 @@
+"""Test the websocket subscription of decoded values."""
+from datetime import timedelta
+from unittest.mock import Mock
+
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_fire_mqtt_message,
+    async_fire_time_changed,
+)
+
+from custom_components.viessmann.const import DOMAIN
+from custom_components.viessmann.coordinator import ViessmannCoordinator
+from custom_components.viessmann.dispatcher import async_get_dispatcher
+from custom_components.viessmann.websocket import websocket_subscribe
+
+
+async def test_websocket_subscribe(hass, mqtt_mock):
+    """Test a snapshot is followed by coalesced deltas."""
+    coordinator = ViessmannCoordinator(hass, "vcontrold", async_get_dispatcher(hass))
+    await coordinator.async_setup()
+    for key in ("getTempA", "getTempKist"):
+        coordinator.async_add_listener(key, lambda datapoint: None)
+    async_fire_mqtt_message(hass, "vcontrold/getTempA", "12.3")
+    await hass.async_block_till_done()
+    hass.data[DOMAIN] = {"entry": coordinator}
+
+    connection = Mock(subscriptions={})
+    websocket_subscribe(
+        hass, connection, {"id": 5, "entry_id": "entry", "interval": 1.0}
+    )
+    connection.send_result.assert_called_once_with(5)
+    ((snapshot,),) = [call.args for call in connection.send_message.call_args_list]
+    assert snapshot["event"] == {"values": {"getTempA": 12.3}}
+
+    # Changes within the interval go out together, each with its last value.
+    for topic, payload in (
+        ("vcontrold/getTempA", "12.5"),
+        ("vcontrold/getTempKist", "40"),
+        ("vcontrold/getTempA", "12.8"),
+    ):
+        async_fire_mqtt_message(hass, topic, payload)
+    await hass.async_block_till_done()
+    assert connection.send_message.call_count == 1
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert connection.send_message.call_count == 2
+    delta = connection.send_message.call_args.args[0]
+    assert delta["event"] == {"values": {"getTempA": 12.8, "getTempKist": 40.0}}
+
+    # Republished, unchanged values are not sent.
+    async_fire_mqtt_message(hass, "vcontrold/getTempA", "12.8")
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=4))
+    await hass.async_block_till_done()
+    assert connection.send_message.call_count == 2
+
+    # Nothing is sent once unsubscribed.
+    async_fire_mqtt_message(hass, "vcontrold/getTempA", "13.0")
+    await hass.async_block_till_done()
+    connection.subscriptions.pop(5)()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=6))
+    await hass.async_block_till_done()
+    assert connection.send_message.call_count == 2
+
+    websocket_subscribe(hass, connection, {"id": 6, "entry_id": "x", "interval": 1.0})
+    assert connection.send_error.call_args.args[:2] == (6, "not_found")
+    coordinator.async_shutdown()